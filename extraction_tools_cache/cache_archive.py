@@ -0,0 +1,274 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import json
+import mmap
+import zlib
+import struct
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+from typing import Iterable
+from typing import Optional
+from typing import Generator
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from extraction_tools_cache.content_hash import CONTENT_HASH_SIZE
+from extraction_tools_cache.content_hash import content_hash
+
+# The first bytes of a cache archive file
+ARCHIVE_MAGIC = b"OSRSBOXC"
+ARCHIVE_VERSION = 2
+
+# The file name suffix of a cache archive file, instead of .json
+ARCHIVE_SUFFIX = ".osrscache"
+
+# Header: magic, version, codec, flags, record count, index offset, dictionary offset, dictionary length
+ARCHIVE_HEADER = struct.Struct("<8sHBBIQQI")
+
+# Index entry: ID number, record offset, record length, record content hash
+ARCHIVE_INDEX_ENTRY = struct.Struct(f"<IQI{CONTENT_HASH_SIZE}s")
+
+# The index entry of each archive version, version 1 has no content hashes
+ARCHIVE_INDEX_ENTRIES = {
+    1: struct.Struct("<IQI"),
+    2: ARCHIVE_INDEX_ENTRY
+}
+
+# The compression codecs, and the codec number saved in the header
+ARCHIVE_CODECS = {
+    "zlib": 0,
+    "zstd": 1
+}
+
+# Header flag, set when the records are compressed with a shared dictionary
+FLAG_DICTIONARY = 1
+
+# The size of a shared dictionary, the zlib window size
+DICTIONARY_SIZE = 32 * 1024
+
+
+def is_cache_archive(path_to_file: Union[Path, str]) -> bool:
+    """Return if a file is a cache archive, rather than a compressed JSON file.
+
+    :param path_to_file: The path to a compressed cache file.
+    :return: True if the file starts with the cache archive magic bytes.
+    """
+    try:
+        with open(path_to_file, "rb") as f:
+            return f.read(len(ARCHIVE_MAGIC)) == ARCHIVE_MAGIC
+    except IOError:
+        return False
+
+
+def _check_codec(codec: str):
+    """Check that a compression codec is known and available.
+
+    :param codec: The compression codec name, zlib or zstd.
+    :raises ValueError: The codec is unknown, or zstd is not installed.
+    """
+    if codec not in ARCHIVE_CODECS:
+        raise ValueError(f"Error: Unknown cache archive codec: {codec}. Exiting.")
+    if codec == "zstd" and zstandard is None:
+        raise ValueError("Error: The zstandard package is required for the zstd codec. Exiting.")
+
+
+def build_dictionary(records: List[bytes], codec: str) -> bytes:
+    """Build a shared compression dictionary from a sample of records.
+
+    Each record is compressed on its own, so a dictionary of content common to many
+    records (property names and default values) improves the compression of small records.
+
+    :param records: A list of uncompressed records.
+    :param codec: The compression codec name, zlib or zstd.
+    :return: The dictionary bytes.
+    """
+    _check_codec(codec)
+    if not records:
+        return b""
+
+    if codec == "zstd":
+        try:
+            return zstandard.train_dictionary(DICTIONARY_SIZE, records).as_bytes()
+        except zstandard.ZstdError:
+            # Too few records to train a dictionary
+            pass
+
+    # Use records spread evenly across all records, up to the dictionary size
+    sample = list()
+    sample_size = 0
+    step = max(1, len(records) // 64)
+    for record in records[::step]:
+        if sample_size + len(record) > DICTIONARY_SIZE:
+            break
+        sample.append(record)
+        sample_size += len(record)
+    return b"".join(sample)
+
+
+def write_cache_archive(records: Iterable[Tuple], output_file: Union[Path, str],
+                        codec: str = "zlib", use_dictionary: bool = True):
+    """Write a cache archive of definition records.
+
+    The archive has a fixed size header, an optional shared compression dictionary,
+    the compressed records (one zlib or zstd frame per record), and an index of ID
+    number to record offset, length and content hash, sorted by ID number.
+
+    :param records: An iterable of (ID number, uncompressed JSON bytes) tuples, or
+        (ID number, uncompressed JSON bytes, content hash) tuples.
+    :param output_file: The file name for the cache archive.
+    :param codec: The compression codec name, zlib or zstd.
+    :param use_dictionary: Compress the records with a shared dictionary.
+    """
+    _check_codec(codec)
+    records = sorted(records, key=lambda record: int(record[0]))
+    dictionary = build_dictionary([record[1] for record in records], codec) if use_dictionary else b""
+
+    if codec == "zstd":
+        if dictionary:
+            compressor = zstandard.ZstdCompressor(level=19, dict_data=zstandard.ZstdCompressionDict(dictionary))
+        else:
+            compressor = zstandard.ZstdCompressor(level=19)
+        compress = compressor.compress
+    else:
+        def compress(data: bytes) -> bytes:
+            if dictionary:
+                compressobj = zlib.compressobj(level=9, zdict=dictionary)
+            else:
+                compressobj = zlib.compressobj(level=9)
+            return compressobj.compress(data) + compressobj.flush()
+
+    with open(output_file, "wb") as f:
+        f.write(b"\0" * ARCHIVE_HEADER.size)
+        dictionary_offset = f.tell()
+        f.write(dictionary)
+
+        index = list()
+        for id_number, record, *record_hash in records:
+            record_hash = record_hash[0] if record_hash else content_hash(json.loads(record))
+            frame = compress(record)
+            index.append(ARCHIVE_INDEX_ENTRY.pack(int(id_number), f.tell(), len(frame), bytes.fromhex(record_hash)))
+            f.write(frame)
+
+        index_offset = f.tell()
+        f.write(b"".join(index))
+
+        flags = FLAG_DICTIONARY if dictionary else 0
+        f.seek(0)
+        f.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, ARCHIVE_CODECS[codec], flags, len(records),
+                                    index_offset, dictionary_offset, len(dictionary)))
+
+
+class CacheArchive:
+    """Random access to the records of a cache archive, using a memory-mapped file.
+
+    The index is read when the archive is opened, then reading a record is a dictionary
+    lookup and the decompression of a single frame. The content hash of each record is
+    read from the index, without decompressing the record.
+
+    :param path_to_archive: The path to the cache archive file.
+    :raises ValueError: The file is not a supported cache archive.
+    """
+    def __init__(self, path_to_archive: Union[Path, str]):
+        self.path_to_archive = path_to_archive
+        with open(path_to_archive, "rb") as f:
+            if os.fstat(f.fileno()).st_size < ARCHIVE_HEADER.size:
+                raise ValueError(f"Error: Not a cache archive: {path_to_archive}. Exiting.")
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, codec_number, flags, count,
+         index_offset, dictionary_offset, dictionary_length) = ARCHIVE_HEADER.unpack_from(self.data)
+        if magic != ARCHIVE_MAGIC or version not in ARCHIVE_INDEX_ENTRIES:
+            raise ValueError(f"Error: Not a supported cache archive: {path_to_archive}. Exiting.")
+
+        self.codec = {number: codec for codec, number in ARCHIVE_CODECS.items()}[codec_number]
+        _check_codec(self.codec)
+        self.dictionary = b""
+        if flags & FLAG_DICTIONARY:
+            self.dictionary = self.data[dictionary_offset:dictionary_offset + dictionary_length]
+
+        index_entry = ARCHIVE_INDEX_ENTRIES[version]
+        index_data = self.data[index_offset:index_offset + count * index_entry.size]
+        self.index: Dict[str, Tuple[int, int]] = dict()
+        self.hashes: Dict[str, str] = dict()
+        for id_number, offset, length, *record_hash in index_entry.iter_unpack(index_data):
+            self.index[str(id_number)] = (offset, length)
+            if record_hash:
+                self.hashes[str(id_number)] = record_hash[0].hex()
+
+        self.zstd_decompressor = None
+        if self.codec == "zstd":
+            if self.dictionary:
+                self.zstd_decompressor = zstandard.ZstdDecompressor(dict_data=zstandard.ZstdCompressionDict(self.dictionary))
+            else:
+                self.zstd_decompressor = zstandard.ZstdDecompressor()
+
+    def __contains__(self, id_number: str) -> bool:
+        """Return if an ID number is in the archive."""
+        return id_number in self.index
+
+    def __len__(self) -> int:
+        """Return the number of records in the archive."""
+        return len(self.index)
+
+    def __iter__(self) -> Generator[str, None, None]:
+        """Iterate (loop) over the ID numbers in the archive, in ascending order."""
+        for id_number in self.index:
+            yield id_number
+
+    def read(self, id_number: str) -> bytes:
+        """Read and decompress a single record.
+
+        :param id_number: The item, npc or object definition ID number.
+        :return: The uncompressed JSON bytes of the record.
+        :raises KeyError: The ID number is not in the archive.
+        """
+        offset, length = self.index[id_number]
+        frame = self.data[offset:offset + length]
+        if self.zstd_decompressor is not None:
+            return self.zstd_decompressor.decompress(frame)
+        if self.dictionary:
+            decompressobj = zlib.decompressobj(zdict=self.dictionary)
+        else:
+            decompressobj = zlib.decompressobj()
+        return decompressobj.decompress(frame) + decompressobj.flush()
+
+    def content_hash(self, id_number: str) -> Optional[str]:
+        """Return the content hash of a record, from the index.
+
+        :param id_number: The item, npc or object definition ID number.
+        :return: The content hash hex digest, or None for an archive without content hashes.
+        :raises KeyError: The ID number is not in the archive.
+        """
+        if id_number not in self.index:
+            raise KeyError(id_number)
+        return self.hashes.get(id_number)
+
+    def close(self):
+        """Close the memory-mapped file."""
+        self.data.close()
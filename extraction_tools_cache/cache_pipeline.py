@@ -0,0 +1,128 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+from typing import Optional
+
+from extraction_tools_cache import osrs_cache_constants
+from extraction_tools_cache.cache_archive import ARCHIVE_SUFFIX
+from extraction_tools_cache.osrs_cache_data import CacheDefinitionFiles
+
+
+class CacheExtractor:
+    """The interface of an extractor that visits every definition of one or more cache types.
+
+    Subclasses set the cache types they visit, and the definition properties they need
+    (None for all properties), and implement `visit`. The definitions are shared between
+    all the extractors of a pipeline, so must not be modified.
+    """
+    cache_types: Tuple[str, ...] = tuple(osrs_cache_constants.CACHE_DUMP_TYPES)
+    fields: Optional[Tuple[str, ...]] = None
+
+    def visit(self, cache_type: str, id_number: str, definition: Dict):
+        """Process a single cache definition.
+
+        :param cache_type: The cache type (items, npcs or objects).
+        :param id_number: The item, npc or object definition ID number.
+        :param definition: The decompressed definition, with at least the requested properties.
+        """
+        raise NotImplementedError
+
+    def finish(self):
+        """Process the visited definitions, after every cache type has been visited."""
+        pass
+
+
+def cache_files(path_to_cache_definitions: Union[Path, str]) -> Dict[str, Path]:
+    """Return the compressed cache file of each cache type in a directory.
+
+    A cache archive file is used if present, otherwise the compressed JSON file.
+
+    :param path_to_cache_definitions: File system location of compressed cache definition files.
+    :return: A dictionary of cache type to compressed cache file path.
+    """
+    compressed_cache_files = dict()
+    for cache_type in osrs_cache_constants.CACHE_DUMP_TYPES:
+        compressed_cache_file = Path(path_to_cache_definitions) / f"{cache_type}{ARCHIVE_SUFFIX}"
+        if not compressed_cache_file.is_file():
+            compressed_cache_file = Path(path_to_cache_definitions) / f"{cache_type}.json"
+        compressed_cache_files[cache_type] = compressed_cache_file
+    return compressed_cache_files
+
+
+class CachePipeline:
+    """A single streaming pass over the compressed cache files, shared by multiple extractors.
+
+    Each compressed cache file is decompressed once, and every definition is passed
+    to all of the registered extractors that visit that cache type. Cache types that
+    no extractor visits are not read.
+
+    :param extractors: The extractors to register.
+    """
+    def __init__(self, extractors: Optional[List[CacheExtractor]] = None):
+        self.extractors: List[CacheExtractor] = list()
+        for extractor in extractors or list():
+            self.register(extractor)
+
+    def register(self, extractor: CacheExtractor) -> CacheExtractor:
+        """Register an extractor to visit the cache definitions.
+
+        :param extractor: The extractor to register.
+        :return: The registered extractor.
+        """
+        self.extractors.append(extractor)
+        return extractor
+
+    def run(self, compressed_cache_files: Dict[str, Union[Path, str]]):
+        """Stream every cache type to the registered extractors, then finish each extractor.
+
+        :param compressed_cache_files: A dictionary of cache type to compressed cache file path.
+        """
+        for cache_type, compressed_cache_file in compressed_cache_files.items():
+            extractors = [extractor for extractor in self.extractors if cache_type in extractor.cache_types]
+            if not extractors:
+                continue
+
+            definitions = CacheDefinitionFiles(compressed_cache_file)
+            for id_number, definition in definitions.iter_definitions(fields=self._fields(extractors)):
+                for extractor in extractors:
+                    extractor.visit(cache_type, id_number, definition)
+
+        for extractor in self.extractors:
+            extractor.finish()
+
+    @staticmethod
+    def _fields(extractors: List[CacheExtractor]) -> Optional[List[str]]:
+        """Return the definition properties needed by any of the extractors, or None for all properties.
+
+        :param extractors: The extractors visiting a cache type.
+        :return: A list of definition properties, or None.
+        """
+        fields = list()
+        for extractor in extractors:
+            if extractor.fields is None:
+                return None
+            fields.extend(field for field in extractor.fields if field not in fields)
+        return fields
@@ -0,0 +1,45 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+import hashlib
+from typing import Dict
+
+# The size of a content hash, in bytes
+CONTENT_HASH_SIZE = 16
+
+# The property name of the content hash in a record that carries its own hash
+CONTENT_HASH_KEY = "content_hash"
+
+
+def content_hash(json_data: Dict) -> str:
+    """Return a stable hash of a JSON record, that only changes when the record content changes.
+
+    The record is serialized as canonical JSON (sorted keys, no whitespace) and hashed
+    with BLAKE2b. A content hash property in the record is not part of the hash.
+
+    :param json_data: A JSON record, for example a cache definition or an items-cache-data entry.
+    :return: A hex digest string.
+    """
+    if CONTENT_HASH_KEY in json_data:
+        json_data = {key: value for key, value in json_data.items() if key != CONTENT_HASH_KEY}
+    canonical_json = json.dumps(json_data, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return hashlib.blake2b(canonical_json.encode("utf-8"), digest_size=CONTENT_HASH_SIZE).hexdigest()
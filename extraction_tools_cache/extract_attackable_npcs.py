@@ -27,37 +27,42 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import json
 from pathlib import Path
+from typing import Dict
 from typing import Union
 
 import config
-from extraction_tools_cache import osrs_cache_data
+from extraction_tools_cache.cache_pipeline import CacheExtractor
+from extraction_tools_cache.cache_pipeline import CachePipeline
 
 
-def extract_attackable_npcs(compressed_json_file_path: Union[Path, str]):
-    """Main function to extract attackble NPC definition files
-
-    :param compressed_json_file_path: Compressed cache file
-    """
-    attackable_npcs = {}
+class AttackableNpcsExtractor(CacheExtractor):
+    """Extract the attackable NPC definitions."""
+    cache_types = ("npcs",)
 
-    # Load and decompress the compressed definition file
-    definitions = osrs_cache_data.CacheDefinitionFiles(compressed_json_file_path)
-    definitions.decompress_cache_file()
+    def __init__(self):
+        self.attackable_npcs = {}
 
-    # Loop all entries in the decompressed and loaded definition file
-    for id_number in definitions:
-        json_data = definitions[id_number]
+    def visit(self, cache_type: str, id_number: str, json_data: Dict):
         if "Attack" in json_data["options"]:
             # Skip entries with variable menu list color in name
             if "<col" in json_data["name"]:
-                continue
+                return
             # Save the attackable NPC
-            attackable_npcs[id_number] = json_data
+            self.attackable_npcs[id_number] = json_data
+
+    def finish(self):
+        # Save all extracted attackable NPCs to JSON file
+        out_fi = Path(config.DATA_PATH / "attackable-npcs.json")
+        with open(out_fi, "w") as f:
+            json.dump(self.attackable_npcs, f)
 
-    # Save all extracted attackable NPCs to JSON file
-    out_fi = Path(config.DATA_PATH / "attackable-npcs.json")
-    with open(out_fi, "w") as f:
-        json.dump(attackable_npcs, f)
+
+def extract_attackable_npcs(compressed_json_file_path: Union[Path, str]):
+    """Main function to extract attackble NPC definition files
+
+    :param compressed_json_file_path: Compressed cache file
+    """
+    CachePipeline([AttackableNpcsExtractor()]).run({"npcs": compressed_json_file_path})
 
 
 if __name__ == "__main__":
@@ -28,10 +28,32 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import collections
 from pathlib import Path
+from typing import Dict
 from typing import Union
 
 import config
-from extraction_tools_cache import osrs_cache_data
+from extraction_tools_cache.cache_pipeline import CacheExtractor
+from extraction_tools_cache.cache_pipeline import CachePipeline
+
+
+class InventoryActionsExtractor(CacheExtractor):
+    """Count the item inventory actions, and print them by frequency."""
+    cache_types = ("items",)
+    fields = ("interfaceOptions",)
+
+    def __init__(self):
+        self.inventory_actions = collections.defaultdict(int)
+
+    def visit(self, cache_type: str, id_number: str, json_data: Dict):
+        for option in json_data["interfaceOptions"]:
+            self.inventory_actions[option] += 1
+
+    def finish(self):
+        inventory_actions = sorted(self.inventory_actions.items(), key=lambda x: int(x[1]), reverse=True)
+        for action, count in inventory_actions:
+            if not action:
+                action = "None"
+            print(f"{action:<24} {count}")
 
 
 def extract_item_inventory_actions(compressed_json_file_path: Union[Path, str]):
@@ -39,23 +61,7 @@ def extract_item_inventory_actions(compressed_json_file_path: Union[Path, str]):
 
     :param compressed_json_file_path: File system location of compressed cache definition files.
     """
-    inventory_actions = collections.defaultdict(int)
-
-    # Load and decompress the compressed definition file
-    definitions = osrs_cache_data.CacheDefinitionFiles(compressed_json_file_path)
-    definitions.decompress_cache_file()
-
-    # Loop all entries in the decompressed and loaded definition file
-    for id_number in definitions:
-        json_data = definitions[id_number]
-        for option in json_data["interfaceOptions"]:
-            inventory_actions[option] += 1
-
-    inventory_actions = sorted(inventory_actions.items(), key=lambda x: int(x[1]), reverse=True)
-    for action, count in inventory_actions:
-        if not action:
-            action = "None"
-        print(f"{action:<24} {count}")
+    CachePipeline([InventoryActionsExtractor()]).run({"items": compressed_json_file_path})
 
 
 if __name__ == "__main__":
@@ -31,10 +31,28 @@ from typing import Dict
 from typing import Union
 
 import config
-from extraction_tools_cache.osrs_cache_data import CacheDefinitionFiles
-
-
-def parse_item_definition(item_data: Dict, definitions: CacheDefinitionFiles, id_number: str) -> Dict:
+from extraction_tools_cache.cache_pipeline import CacheExtractor
+from extraction_tools_cache.cache_pipeline import CachePipeline
+from extraction_tools_cache.content_hash import CONTENT_HASH_KEY
+from extraction_tools_cache.content_hash import content_hash
+
+# The ItemDefinition properties used to generate the items cache data
+ITEM_DEFINITION_FIELDS = ("id",
+                          "name",
+                          "isTradeable",
+                          "members",
+                          "notedID",
+                          "notedTemplate",
+                          "stackable",
+                          "interfaceOptions",
+                          "cost",
+                          "placeholderId",
+                          "placeholderTemplateId",
+                          "boughtId",
+                          "boughtTemplateId")
+
+
+def parse_item_definition(item_data: Dict, definitions: Dict, id_number: str) -> Dict:
     """Parse the raw cache ItemDefinition data to a Python dictionary.
 
     :param item_data: A dictionary holding item properties.
@@ -101,7 +119,7 @@ def parse_item_definition(item_data: Dict, definitions: CacheDefinitionFiles, id
     return item_data
 
 
-def parse_item_definition_fix_noted_item(item_data: Dict, definitions: CacheDefinitionFiles, id_number: str) -> Dict:
+def parse_item_definition_fix_noted_item(item_data: Dict, definitions: Dict, id_number: str) -> Dict:
     """Parse the raw cache ItemDefinition data to a Python dictionary.
 
     This function tries to fix any item that is linked, by looking up properties
@@ -121,19 +139,42 @@ def parse_item_definition_fix_noted_item(item_data: Dict, definitions: CacheDefi
     return item_data
 
 
+class ItemsCacheDataExtractor(CacheExtractor):
+    """Collect the item definitions, then generate the items cache data.
+
+    Items are linked to other items (noted, placeholder and bought items), so the
+    used properties of every item definition are kept until all items are visited.
+    """
+    cache_types = ("items",)
+    fields = ITEM_DEFINITION_FIELDS
+
+    def __init__(self):
+        self.definitions = dict()
+
+    def visit(self, cache_type: str, id_number: str, item_definition: Dict):
+        self.definitions[id_number] = item_definition
+
+    def finish(self):
+        export_items_cache_data(self.definitions)
+
+
 def extract_items_cache_data(compressed_json_file_path: Union[Path, str]):
     """The main function for generating the `data/items-cache-data.json` file.
 
     :param compressed_json_file_path: The path to the compressed items.json file.
     """
+    CachePipeline([ItemsCacheDataExtractor()]).run({"items": compressed_json_file_path})
+
+
+def export_items_cache_data(definitions: Dict):
+    """Generate the `items-cache-data.json` and `items-summary.json` files from the item definitions.
+
+    :param definitions: A dictionary of item ID number to ItemDefinition data.
+    """
     all_items = dict()
     all_items_summary = dict()
 
-    # Initialize the CacheDefinitionFiles object, and decompress
-    definitions = CacheDefinitionFiles(compressed_json_file_path)
-    definitions.decompress_cache_file()
-
-    # Use the class generator to loop the definition file IDs
+    # Loop the definition file IDs
     for id_number in definitions:
         # Initialize the dictionary to store each item properties
         item_data = dict()
@@ -172,6 +213,9 @@ def extract_items_cache_data(compressed_json_file_path: Union[Path, str]):
             # Skip this item, it is not useful
             continue
 
+        # Add a content hash, so changed items are found without comparing every property
+        item_data[CONTENT_HASH_KEY] = content_hash(item_data)
+
         all_items[str(item_data["id"])] = item_data
 
     # Finally, dump the extracted data to the items-cache-data.json file
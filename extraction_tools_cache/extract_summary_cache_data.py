@@ -28,50 +28,60 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import json
 from pathlib import Path
+from typing import Dict
 from typing import Union
 
 import config
-from extraction_tools_cache import osrs_cache_data
 from extraction_tools_cache import osrs_cache_constants
+from extraction_tools_cache.cache_pipeline import CacheExtractor
+from extraction_tools_cache.cache_pipeline import CachePipeline
 
 
-def extract_summary_file(compressed_json_file_path: Union[Path, str], cache_name: str):
-    """Main function to extract item/npc/object summary information (ID and name).
+class SummaryExtractor(CacheExtractor):
+    """Extract item/npc/object summary information (ID and name) for a single cache type.
 
-    :param compressed_json_file_path: Compressed cache file.
     :param cache_name: The name of the cache (items, npcs or objects).
     """
-    summary_data = {}
+    fields = ("id", "name")
 
-    # Load and decompress the compressed definition file
-    definitions = osrs_cache_data.CacheDefinitionFiles(compressed_json_file_path)
-    definitions.decompress_cache_file()
+    def __init__(self, cache_name: str):
+        self.cache_name = cache_name
+        self.cache_types = (cache_name,)
+        self.summary_data = {}
 
-    # Loop all entries in the decompressed and loaded definition file
-    for id_number in definitions:
-        json_data = definitions[id_number]
+    def visit(self, cache_type: str, id_number: str, json_data: Dict):
         id = json_data["id"]
         name = json_data["name"]
         # Check if there is a non-valid name
         if "<col" in json_data["name"]:
-            continue
+            return
         if "null" in json_data["name"].lower():
-            continue
-        summary_data[id] = {
+            return
+        self.summary_data[id] = {
             "id": id,
             "name": name
         }
 
-    # Save all extracted entries to a JSON file
-    if cache_name == "npcs":
-        out_fi = Path(config.DOCS_PATH / "npcs-summary.json")
-    elif cache_name == "objects":
-        out_fi = Path(config.DOCS_PATH / "objects-summary.json")
-    elif cache_name == "items":
-        return  # Skip items, this is generated by extract_items_cache_data.py
+    def finish(self):
+        # Save all extracted entries to a JSON file
+        if self.cache_name == "npcs":
+            out_fi = Path(config.DOCS_PATH / "npcs-summary.json")
+        elif self.cache_name == "objects":
+            out_fi = Path(config.DOCS_PATH / "objects-summary.json")
+        elif self.cache_name == "items":
+            return  # Skip items, this is generated by extract_items_cache_data.py
+
+        with open(out_fi, "w") as f:
+            json.dump(self.summary_data, f)
+
 
-    with open(out_fi, "w") as f:
-        json.dump(summary_data, f)
+def extract_summary_file(compressed_json_file_path: Union[Path, str], cache_name: str):
+    """Main function to extract item/npc/object summary information (ID and name).
+
+    :param compressed_json_file_path: Compressed cache file.
+    :param cache_name: The name of the cache (items, npcs or objects).
+    """
+    CachePipeline([SummaryExtractor(cache_name)]).run({cache_name: compressed_json_file_path})
 
 
 if __name__ == "__main__":
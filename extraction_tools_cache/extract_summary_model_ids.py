@@ -31,13 +31,13 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import json
 from pathlib import Path
-from pathlib import PurePath
 from typing import List
 from typing import Dict
 
 import config
-from extraction_tools_cache import osrs_cache_data
-from extraction_tools_cache import osrs_cache_constants
+from extraction_tools_cache.cache_pipeline import CacheExtractor
+from extraction_tools_cache.cache_pipeline import CachePipeline
+from extraction_tools_cache.cache_pipeline import cache_files
 
 SKIP_EMPTY_NAMES = ("null", "Null", "")
 TYPE_NAME_TO_JSON_KEY = {
@@ -88,42 +88,38 @@ def extract_model_ids(json_data: Dict, type_name: str) -> List[Dict]:
     return all_models
 
 
+class ModelIdsExtractor(CacheExtractor):
+    """Extract the model ID numbers of every item, npc and object."""
+    fields = ("id", "name") + tuple(TYPE_NAME_TO_JSON_KEY.values())
+
+    def __init__(self):
+        self.models_dict = {}
+
+    def visit(self, cache_type: str, id_number: str, json_data: Dict):
+        # Extract model ID numbers
+        model_list = extract_model_ids(json_data, cache_type)
+
+        # Loop the extracted model IDs
+        for model in model_list:
+            # Generate a unique key (e.g., items_10_2361, an item with ID of 10 and model ID of 2361)
+            key = f"{model['type']}_{model['type_id']}_{model['model_id']}"
+            # Add to the dict for outputting
+            self.models_dict[key] = model
+
+    def finish(self):
+        # Save all extracted models ID numbers to JSON file
+        out_fi = Path(config.DOCS_PATH / "models-summary.json")
+        with open(out_fi, "w") as f:
+            json.dump(self.models_dict, f, indent=4)
+
+
 def main(path_to_cache_definitions: Path):
     """Main function for extracting OSRS model ID numbers.
 
     :param path_to_cache_definitions: File system location of compressed cache definition files.
     """
-    models_dict = {}
-
     # Loop the three cache dump files (items, npcs, objects)
-    for cache_file in osrs_cache_constants.CACHE_DUMP_FILES:
-        # Set the path to the compressed JSON files
-        compressed_json_file = Path(path_to_cache_definitions / cache_file)
-
-        # Set the current cache dump type
-        cache_type = PurePath(cache_file)
-        cache_type = str(cache_type.with_suffix(""))
-
-        # Load and decompress the compressed definition file
-        definitions = osrs_cache_data.CacheDefinitionFiles(compressed_json_file)
-        definitions.decompress_cache_file()
-
-        # Loop all entries in the decompressed and loaded definition file
-        for id_number in definitions:
-            # Extract model ID numbers
-            model_list = extract_model_ids(definitions[id_number], cache_type)
-
-            # Loop the extracted model IDs
-            for model in model_list:
-                # Generate a unique key (e.g., items_10_2361, an item with ID of 10 and model ID of 2361)
-                key = f"{model['type']}_{model['type_id']}_{model['model_id']}"
-                # Add to the dict for outputting
-                models_dict[key] = model
-
-    # Save all extracted models ID numbers to JSON file
-    out_fi = Path(config.DOCS_PATH / "models-summary.json")
-    with open(out_fi, "w") as f:
-        json.dump(models_dict, f, indent=4)
+    CachePipeline([ModelIdsExtractor()]).run(cache_files(path_to_cache_definitions))
 
 
 if __name__ == "__main__":
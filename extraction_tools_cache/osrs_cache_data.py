@@ -30,17 +30,39 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
 
+import re
 import zlib
 import json
 import binascii
 from pathlib import Path
+from collections import OrderedDict
 from typing import Dict
+from typing import List
 from typing import Union
 from typing import Tuple
+from typing import Iterable
+from typing import Optional
+from typing import Iterator
 from typing import Generator
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
 from base64 import b64encode, b64decode
 
 from extraction_tools_cache import osrs_cache_constants
+from extraction_tools_cache.cache_archive import ARCHIVE_SUFFIX
+from extraction_tools_cache.cache_archive import CacheArchive
+from extraction_tools_cache.cache_archive import is_cache_archive
+from extraction_tools_cache.cache_archive import write_cache_archive
+from extraction_tools_cache.content_hash import content_hash
+
+# A single "<ID number>": "<compressed definition>" entry in a compressed cache file
+COMPRESSED_ENTRY_PATTERN = re.compile(r'"(\d+)"\s*:\s*"([A-Za-z0-9+/=]*)"')
+
+# The number of characters read from a compressed cache file at a time, when streaming
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# The number of definition files sent to a worker process at a time, when compressing in parallel
+COMPRESS_CHUNK_SIZE = 256
 
 
 class CacheDefinitionFiles:
@@ -49,42 +71,82 @@ class CacheDefinitionFiles:
     The OSRS cache has a wealth of information provided in the cache definition files.
     The osrsbox-db repo provides all item, npc and object definition files in compressed
     JSON files. This class provides a simple wrapper to access the compressed definition
-    file data on-the-fly by decompressing them and providing some easy accessors.
+    file data on-the-fly by decompressing them and providing some easy accessors. Cache
+    archive files (see `cache_archive`) are also supported, and read using a memory map.
+
+    Each definition is decompressed when it is first accessed, and the most recently
+    used definitions are kept, so a point lookup only decompresses a single definition.
 
     :param compressed_cache_file: A compressed cache file for items, npcs or objects.
+    :param cache_size: The maximum number of decompressed definitions to keep.
     """
-    def __init__(self, compressed_cache_file: str):
+    def __init__(self, compressed_cache_file: str, cache_size: int = 4096):
         self.compressed_cache_file = compressed_cache_file
-        self.definitions: Dict[str, str] = dict()
+        self.cache_size = cache_size
+        self.compressed_definitions: Dict[str, str] = dict()
+        self.archive: Optional[CacheArchive] = None
+        self.definitions: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
 
     def __len__(self) -> int:
         """Return the number of cache definitions.
 
         :return: The number of cache definitions available.
         """
-        return len(self.definitions)
+        if self.archive is not None:
+            return len(self.archive)
+        return len(self.compressed_definitions)
 
-    def __getitem__(self, id_number: str) -> str:
+    def __getitem__(self, id_number: str) -> Dict:
         """Return the decompressed definition for an item, npc or object using the ID number.
 
         :param id_number: The item, npc or object definition ID number.
         :return: The JSON data linked to the specified item, npc or object ID number.
+        :raises KeyError: The ID number is not in the cache file.
         """
-        return self.definitions[id_number]
+        try:
+            definition_data = self.definitions[id_number]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            self.definitions.move_to_end(id_number)
+            return definition_data
+
+        if self.archive is not None:
+            definition_data = json.loads(self.archive.read(id_number))
+        else:
+            definition_data = json.loads(zlib.decompress(b64decode(self.compressed_definitions[id_number])))
+        self.misses += 1
+        self.definitions[id_number] = definition_data
+        if len(self.definitions) > self.cache_size:
+            self.definitions.popitem(last=False)
+        return definition_data
 
     def __iter__(self) -> Generator[str, None, None]:
         """Iterate (loop) over all of the OSRS cache definitions.
 
         :return: An OSRS cache definition ID number.
         """
-        for id_number in self.definitions:
+        if self.archive is not None:
+            yield from self.archive
+            return
+        for id_number in self.compressed_definitions:
             yield id_number
 
     def decompress_cache_file(self):
         """Internal method to automatically decompress a compressed JSON file.
 
+        Only the compressed definitions are loaded, each definition is decompressed
+        when accessed. A cache archive file is memory-mapped, and only the index is read.
+
         :raises SystemExit:
         """
+        if is_cache_archive(self.compressed_cache_file):
+            self.archive = self._open_archive()
+            self.definitions.clear()
+            return
 
         try:
             # Open the file and try loading the JSON content
@@ -101,10 +163,105 @@ class CacheDefinitionFiles:
         if not self._check_decompress_definition_data(compressed_json_data):
             raise SystemExit(">>> ERROR: The file does not have compressed JSON data! Exiting.")
 
-        for id_number, compressed_json_data in json_data.items():
-            decompressed_data = zlib.decompress(b64decode(compressed_json_data))
-            definition_data = json.loads(decompressed_data)
-            self.definitions[id_number] = definition_data
+        self.compressed_definitions = json_data
+        self.definitions.clear()
+
+    def iter_definitions(self, fields: Optional[Iterable[str]] = None,
+                         chunk_size: int = STREAM_CHUNK_SIZE) -> Generator[Tuple[str, Dict], None, None]:
+        """Stream the definitions of a compressed JSON file, decompressing one definition at a time.
+
+        Unlike `decompress_cache_file`, the compressed file is read in chunks and no
+        definitions are kept, so a single pass over the definitions uses bounded memory.
+
+        :param fields: The definition properties to keep, or None to keep all properties.
+        :param chunk_size: The number of characters to read from the file at a time.
+        :return: A tuple of the ID number and the (projected) definition.
+        :raises SystemExit:
+        """
+        if fields is not None:
+            fields = tuple(fields)
+
+        if is_cache_archive(self.compressed_cache_file):
+            archive = self._open_archive()
+            try:
+                for id_number in archive:
+                    definition_data = json.loads(archive.read(id_number))
+                    if fields is not None:
+                        definition_data = {field: definition_data[field] for field in fields if field in definition_data}
+                    yield id_number, definition_data
+            finally:
+                archive.close()
+            return
+
+        try:
+            compressed_file = open(self.compressed_cache_file)
+        except IOError:
+            raise SystemExit(">>> ERROR: Could not open file.")
+
+        checked = False
+        buffer = ""
+        with compressed_file:
+            while True:
+                chunk = compressed_file.read(chunk_size)
+                buffer += chunk
+
+                # Decompress every complete entry in the buffer, and keep the remainder for the next chunk
+                end = 0
+                for match in COMPRESSED_ENTRY_PATTERN.finditer(buffer):
+                    id_number, compressed_json_data = match.groups()
+                    end = match.end()
+
+                    # Try to decompress the first entry to ensure correct file is provided
+                    if not checked:
+                        if not self._check_decompress_definition_data(compressed_json_data):
+                            raise SystemExit(">>> ERROR: The file does not have compressed JSON data! Exiting.")
+                        checked = True
+
+                    definition_data = json.loads(zlib.decompress(b64decode(compressed_json_data)))
+                    if fields is not None:
+                        definition_data = {field: definition_data[field] for field in fields if field in definition_data}
+                    yield id_number, definition_data
+
+                buffer = buffer[end:]
+                if not chunk:
+                    break
+
+        if not checked:
+            raise SystemExit(">>> ERROR: The file does not have compressed JSON data! Exiting.")
+
+    def content_hashes(self) -> Dict[str, str]:
+        """Return the content hash of every definition, to detect changed definitions without comparing them.
+
+        The hashes are read from the archive index, or the content hashes file saved with
+        a compressed JSON file. Otherwise, every definition is decompressed and hashed.
+
+        :return: A dictionary of ID number to content hash.
+        """
+        if is_cache_archive(self.compressed_cache_file):
+            archive = self._open_archive()
+            try:
+                if len(archive.hashes) == len(archive):
+                    return dict(archive.hashes)
+            finally:
+                archive.close()
+
+        path_to_hashes = content_hashes_file_path(self.compressed_cache_file)
+        if path_to_hashes.is_file():
+            with open(path_to_hashes) as f:
+                return json.load(f)
+
+        return {id_number: content_hash(definition_data) for id_number, definition_data in self.iter_definitions()}
+
+    def _open_archive(self) -> CacheArchive:
+        """Internal method to open a cache archive file.
+
+        :return: The opened cache archive.
+        :raises SystemExit:
+        """
+        try:
+            return CacheArchive(self.compressed_cache_file)
+        except ValueError as e:
+            raise SystemExit(f">>> ERROR: {e}") from e
 
     @staticmethod
     def _check_decompress_definition_data(compressed_json_data: str) -> bool:
@@ -150,50 +307,161 @@ def compress_definition_file(json_data: Dict) -> Tuple[str, str]:
     return id_number, json_out
 
 
-def compress_single_cache_type(path_to_definition_files: Union[Path, str], output_json_file: Union[Path, str]):
-    """Compress a directory of OSRS cache definition files.
+def compress_definition_file_path(definition_file: Union[Path, str]) -> Tuple[str, str, str]:
+    """Read and compress a single cache definition file.
 
-    :param path_to_definition_files: The path to the directory of cache definition files.
-    :param output_json_file: The file name for the compressed JSON file.
+    :param definition_file: The path to the cache definition file.
+    :return id_number: The ID number of the cache definition file.
+    :return json_out: A compressed representation of the cache definition file data.
+    :return json_hash: The content hash of the cache definition file data.
     """
-    print(f"  > Compressing cache definitions in: {path_to_definition_files}")
-    # Setup dictionary for JSON export
-    all_definitions = {}
+    # Open the definition file for processing and dump the JSON content
+    with open(str(definition_file)) as input_json_file:
+        json_data = json.loads(input_json_file.read())
+    id_number, json_out = compress_definition_file(json_data)
+    return id_number, json_out, content_hash(json_data)
+
+
+def read_definition_file_path(definition_file: Union[Path, str]) -> Tuple[str, bytes, str]:
+    """Read a single cache definition file, as the uncompressed record of a cache archive.
 
+    :param definition_file: The path to the cache definition file.
+    :return id_number: The ID number of the cache definition file.
+    :return json_bytes: The JSON bytes of the cache definition file data.
+    :return json_hash: The content hash of the cache definition file data.
+    """
+    with open(str(definition_file)) as input_json_file:
+        json_data = json.loads(input_json_file.read())
+    return json_data["id"], json.dumps(json_data).encode("utf-8"), content_hash(json_data)
+
+
+def content_hashes_file_path(compressed_cache_file: Union[Path, str]) -> Path:
+    """Return the path of the content hashes file of a compressed JSON file (for example, `items.hashes.json`).
+
+    :param compressed_cache_file: A compressed cache file for items, npcs or objects.
+    :return: The path to the content hashes JSON file.
+    """
+    return Path(compressed_cache_file).with_suffix(".hashes.json")
+
+
+def list_definition_files(path_to_definition_files: Union[Path, str]) -> List[Path]:
+    """List the cache definition files in a directory, sorted numerically.
+
+    :param path_to_definition_files: The path to the directory of cache definition files.
+    :return: A list of paths to cache definition files.
+    """
     # Get all files in cache dump directory, and sort numerically
     definition_files = Path(path_to_definition_files).glob("*.json")
     definition_files = sorted((fi for fi in definition_files), key=lambda fi: int(fi.stem))
 
-    for definition_file in definition_files:
-        # Skip any generated Java class files used by RuneLite
-        if definition_file.stem in osrs_cache_constants.JAVA_CLASS_FILES:
-            continue
+    # Skip any generated Java class files used by RuneLite
+    return [fi for fi in definition_files if fi.stem not in osrs_cache_constants.JAVA_CLASS_FILES]
+
 
-        # Open each definition file for processing and dump the JSON content
-        with open(str(definition_file)) as input_json_file:
-            json_data = json.loads(input_json_file.read())
-            id_number, json_out = compress_definition_file(json_data)
-            all_definitions[id_number] = json_out
+def _map_definition_files(definition_files: List[Path], executor: Optional[Executor],
+                          archive_codec: Optional[str] = None) -> Iterator[Tuple]:
+    """Compress cache definition files, in a process pool if provided, returning the results in file order.
+
+    With an executor, every file is submitted immediately, so multiple calls overlap.
+
+    :param definition_files: A list of paths to cache definition files.
+    :param executor: A process pool executor, or None to compress in this process.
+    :param archive_codec: The cache archive codec, or None for a compressed JSON file.
+    :return: An iterator of (ID number, compressed definition, content hash) tuples, or
+        (ID number, JSON bytes, content hash) tuples for an archive.
+    """
+    function = compress_definition_file_path if archive_codec is None else read_definition_file_path
+    if executor is None:
+        return map(function, definition_files)
+    return executor.map(function, definition_files, chunksize=COMPRESS_CHUNK_SIZE)
+
+
+def _write_compressed_definitions(compressed_definitions: Iterable[Tuple], output_json_file: Union[Path, str],
+                                  archive_codec: Optional[str] = None):
+    """Write compressed cache definitions to a compressed JSON file and content hashes file, or a cache archive.
+
+    :param compressed_definitions: An iterable of (ID number, compressed definition, content hash) tuples,
+        in file order, or (ID number, JSON bytes, content hash) tuples for an archive.
+    :param output_json_file: The file name for the compressed JSON file.
+    :param archive_codec: The cache archive codec, or None for a compressed JSON file.
+    """
+    if archive_codec is not None:
+        write_cache_archive(compressed_definitions, output_json_file, archive_codec)
+        return
+
+    # Setup dictionary for JSON export
+    all_definitions = {}
+    all_hashes = {}
+    for id_number, json_out, json_hash in compressed_definitions:
+        all_definitions[id_number] = json_out
+        all_hashes[id_number] = json_hash
 
     with open(output_json_file, "w") as json_file:
         json.dump(all_definitions, json_file)
+    with open(content_hashes_file_path(output_json_file), "w") as json_file:
+        json.dump(all_hashes, json_file)
 
 
-def compress_all_cache_types(cache_dump_path: Union[Path, str]):
-    """Compress all OSRS cache definition files for items, npcs and objects."""
-    print(f">>> Processing cache dump in the following root path: {cache_dump_path}")
-    for cache_dump_type in osrs_cache_constants.CACHE_DUMP_TYPES:
-        cache_dump_full_path = Path(cache_dump_path) / cache_dump_type / ""
-        output_json_file_name = f"{cache_dump_type}.json"
-        output_json_file_path = Path(cache_dump_path) / output_json_file_name
-        compress_single_cache_type(cache_dump_full_path, output_json_file_path)
+def compress_single_cache_type(path_to_definition_files: Union[Path, str], output_json_file: Union[Path, str],
+                               workers: Optional[int] = 1, archive_codec: Optional[str] = None):
+    """Compress a directory of OSRS cache definition files.
+
+    :param path_to_definition_files: The path to the directory of cache definition files.
+    :param output_json_file: The file name for the compressed JSON file.
+    :param workers: The number of worker processes, 1 to compress in this process, or None for one per CPU.
+    :param archive_codec: Write a cache archive with this codec (zlib or zstd), or None for a compressed JSON file.
+    """
+    print(f"  > Compressing cache definitions in: {path_to_definition_files}")
+    definition_files = list_definition_files(path_to_definition_files)
+
+    if workers == 1:
+        _write_compressed_definitions(_map_definition_files(definition_files, None, archive_codec), output_json_file, archive_codec)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        _write_compressed_definitions(_map_definition_files(definition_files, executor, archive_codec), output_json_file, archive_codec)
 
 
-def main(cache_dump_path: Union[str, Path], process_all: bool):
+def compress_all_cache_types(cache_dump_path: Union[Path, str], workers: Optional[int] = 1, archive_codec: Optional[str] = None):
+    """Compress all OSRS cache definition files for items, npcs and objects.
+
+    With multiple workers, the files of all three cache types are compressed in a single process pool.
+
+    :param cache_dump_path: The location of the cache directories exported by RuneLite.
+    :param workers: The number of worker processes, 1 to compress in this process, or None for one per CPU.
+    :param archive_codec: Write cache archives with this codec (zlib or zstd), or None for compressed JSON files.
+    """
+    print(f">>> Processing cache dump in the following root path: {cache_dump_path}")
+    executor = None
+    if workers != 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+    try:
+        # Submit every cache type before writing any, so the cache types are compressed in parallel
+        compressed_cache_types = list()
+        for cache_dump_type in osrs_cache_constants.CACHE_DUMP_TYPES:
+            cache_dump_full_path = Path(cache_dump_path) / cache_dump_type / ""
+            output_json_file_name = f"{cache_dump_type}.json" if archive_codec is None else f"{cache_dump_type}{ARCHIVE_SUFFIX}"
+            output_json_file_path = Path(cache_dump_path) / output_json_file_name
+            print(f"  > Compressing cache definitions in: {cache_dump_full_path}")
+            definition_files = list_definition_files(cache_dump_full_path)
+            compressed_cache_types.append((_map_definition_files(definition_files, executor, archive_codec), output_json_file_path))
+
+        for compressed_definitions, output_json_file_path in compressed_cache_types:
+            _write_compressed_definitions(compressed_definitions, output_json_file_path, archive_codec)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def main(cache_dump_path: Union[str, Path], process_all: bool, workers: Optional[int] = None,
+         archive_codec: Optional[str] = None):
     """Main function for compressing OSRS cache data
 
     :param cache_dump_path: The location of the cache directories exported by RuneLite
     :param process_all: Boolean to toggle processing of all cache dumps (items, npcs, objects)
+    :param workers: The number of worker processes, 1 to compress in this process, or None for one per CPU
+    :param archive_codec: Write cache archives with this codec (zlib or zstd), or None for compressed JSON files
     """
     # Check if a str is supplied, if so, convert to Path object
     if isinstance(cache_dump_path, str):
@@ -201,11 +469,11 @@ def main(cache_dump_path: Union[str, Path], process_all: bool):
 
     if process_all:
         # Compress all cache definition files (for items, npcs and objects folders)
-        compress_all_cache_types(cache_dump_path)
+        compress_all_cache_types(cache_dump_path, workers, archive_codec)
     else:
         # Compress a single cache definition type
-        out_file_name = f"{cache_dump_path}.json"
-        compress_single_cache_type(cache_dump_path, out_file_name)
+        out_file_name = f"{cache_dump_path}.json" if archive_codec is None else f"{cache_dump_path}{ARCHIVE_SUFFIX}"
+        compress_single_cache_type(cache_dump_path, out_file_name, workers, archive_codec)
 
 
 if __name__ == "__main__":
@@ -218,6 +486,15 @@ if __name__ == "__main__":
     ap.add_argument("-a",
                     action="store_true",
                     default=False)
+    ap.add_argument("-w",
+                    "--workers",
+                    type=int,
+                    default=None,
+                    help="Number of worker processes (default: one per CPU, 1 to compress in a single process)")
+    ap.add_argument("--archive",
+                    choices=["zlib", "zstd"],
+                    default=None,
+                    help="Write a binary cache archive with the codec, instead of a compressed JSON file")
     args = vars(ap.parse_args())
 
     # Set path as provided by the user
@@ -225,4 +502,4 @@ if __name__ == "__main__":
     # Determine if the user wants to compress all, or one, dump
     process_mode = args["a"]
 
-    main(cache_path, process_mode)
+    main(cache_path, process_mode, args["workers"], args["archive"])
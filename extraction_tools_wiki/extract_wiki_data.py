@@ -26,25 +26,31 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
 import sys
-import json
 import datetime
-import itertools
 from pathlib import Path
 from typing import List
 
 import config
 from extraction_tools_wiki.wiki_page_titles import WikiPageTitles
-from extraction_tools_wiki.wiki_page_text import WikiPageText
+from extraction_tools_wiki.wiki_extraction_engine import WikiExtractionEngine
+from extraction_tools_wiki.wiki_text_store import WikiTextStore
 
 
 OSRS_WIKI_API_URL = "https://oldschool.runescape.wiki/api.php"
 
 
-def extract_wiki_data(categories: List, last_extraction_date: str):
+def extract_wiki_data(categories: List, last_extraction_date: str, api_url: str = OSRS_WIKI_API_URL,
+                      max_in_flight: int = 4, requests_per_second: float = 5.0):
     """The main function for extracting OSRS Wiki category page titles and page wiki text.
 
+    The wiki text is saved as it is extracted, so an interrupted extraction resumes
+    where it stopped when run again.
+
     :param categories: A List containing categories.
     :param last_extraction_date: The date (as a string) of the last extraciton.
+    :param api_url: The OSRS Wiki API URL, or the URL of a stand-in server.
+    :param max_in_flight: The maximum number of concurrent wiki text requests.
+    :param requests_per_second: The maximum wiki text request rate.
     """
     # The first category argument, used to build the output file name
     primary_category = categories[0].lower()
@@ -53,8 +59,8 @@ def extract_wiki_data(categories: List, last_extraction_date: str):
     titles_file_path = f"extract_page_titles_{primary_category}.json"
     titles_file_path = Path(config.EXTRACTION_WIKI_PATH / titles_file_path)
 
-    # Specify the name for the wiki text output JSON file
-    text_file_path = f"extract_page_text_{primary_category}.json"
+    # Specify the name for the wiki text output JSON lines file
+    text_file_path = f"extract_page_text_{primary_category}.jsonl"
     text_file_path = Path(config.EXTRACTION_WIKI_PATH / text_file_path)
 
     # STAGE ZERO: SET SCRIPT CONFIGURATION
@@ -74,7 +80,7 @@ def extract_wiki_data(categories: List, last_extraction_date: str):
 
     print(">>> Starting wiki page titles extraction...")
     # Create object to handle page titles extraction
-    wiki_page_titles = WikiPageTitles(OSRS_WIKI_API_URL,
+    wiki_page_titles = WikiPageTitles(api_url,
                                       categories,
                                       user_agent,
                                       user_email)
@@ -87,15 +93,8 @@ def extract_wiki_data(categories: List, last_extraction_date: str):
     else:
         # Extract page titles using supplied categories
         wiki_page_titles.extract_page_titles()
-        # Extract page revision date
-        # Loop 50 page titles at a time, the max number for a revisions request using page titles
-        for page_title_list in itertools.zip_longest(*[iter(wiki_page_titles.page_titles)] * 50):
-            # Remove None entries from the list of page titles
-            page_title_list = filter(None, page_title_list)
-            # Join the page titles list using the pipe (|) separator
-            page_titles_string = "|".join(page_title_list)
-            # Extract the page revision date
-            wiki_page_titles.extract_last_revision_timestamp(page_titles_string)
+        # Extract page revision ID and date, 50 page titles per request, using concurrent requests
+        wiki_page_titles.extract_page_revisions()
         # Save all page titles and
         wiki_page_titles.export_page_titles_in_json(titles_file_path)
 
@@ -105,38 +104,54 @@ def extract_wiki_data(categories: List, last_extraction_date: str):
 
     # STAGE TWO: EXTRACT WIKI USING PAGE TITLES
 
-    # Open page title JSON file, to check if page needs to have wiki text extracted
-    json_data = dict()
-    if os.path.isfile(text_file_path):
-        with open(text_file_path, mode='r') as existing_out_file:
-            json_data = json.load(existing_out_file)
-
-    page_titles_count = 1
-    print(">>> Starting wiki text extraction for extracted page titles...")
-    for page_title, page_revision_date in wiki_page_titles.page_titles.items():
-        print(f"  > Progress: {page_titles_count:4d} of {page_titles_total:4d} - Processing: {page_title}")
+    # Open the wiki text store, to check if page needs to have wiki text extracted
+    wiki_text_store = WikiTextStore(text_file_path)
 
-        # Convert revision date to datetime object
-        last_revision_date = datetime.datetime.strptime(wiki_page_titles[page_title],
-                                                        '%Y-%m-%dT%H:%M:%SZ')
+    # Import a wiki text JSON file from a previous extraction, if the store is new
+    legacy_text_file_path = text_file_path.with_suffix(".json")
+    if not len(wiki_text_store) and os.path.isfile(legacy_text_file_path):
+        wiki_text_store.import_json(legacy_text_file_path)
 
-        # Check if page title is already present in JSON output file, also check revision date
-        if page_title in json_data and last_revision_date < last_extraction_date:
-            # If the last revision was before last extract, skip
-            page_titles_count += 1
+    # Determine the page titles that need to have wiki text extracted
+    extract_page_titles = list()
+    for page_title in wiki_page_titles.page_titles:
+        # Skip missing pages, that have no revision
+        if wiki_page_titles[page_title] is None:
             continue
 
-        # Create object to extract page wiki text
-        wiki_page_text = WikiPageText(OSRS_WIKI_API_URL,
-                                      page_title,
-                                      user_agent,
-                                      user_email)
+        # Check if page title is already present in the store, also check revision
+        if page_title in wiki_text_store:
+            revision_id = wiki_page_titles.revision_ids.get(page_title)
+            stored_revision_id = wiki_text_store.revision_id(page_title)
+            if revision_id is not None and stored_revision_id is not None:
+                # If the store has the current revision (saved by an earlier or interrupted run), skip
+                if stored_revision_id == revision_id:
+                    continue
+            else:
+                # Without revision IDs, fall back to the revision date
+                if wiki_text_store.timestamp(page_title) == wiki_page_titles[page_title]:
+                    continue
+                # Convert revision date to datetime object
+                last_revision_date = datetime.datetime.strptime(wiki_page_titles[page_title],
+                                                                '%Y-%m-%dT%H:%M:%SZ')
+                # If the last revision was before last extract, skip
+                if last_revision_date < last_extraction_date:
+                    continue
+        extract_page_titles.append(page_title)
 
-        # If the page title has not been extracted, extract wiki text and save to JSON file
-        wiki_page_text.extract_page_wiki_text()
-        wiki_page_text.export_wiki_text_to_json(text_file_path)
+    print(">>> Starting wiki text extraction for extracted page titles...")
+    print(f">>> Number of wiki pages to extract: {len(extract_page_titles)}")
+    engine = WikiExtractionEngine(api_url,
+                                  user_agent,
+                                  user_email,
+                                  max_in_flight=max_in_flight,
+                                  requests_per_second=requests_per_second)
+    failed_page_titles = engine.extract_pages_wiki_text(extract_page_titles, wiki_text_store, verbose=True)
+    if failed_page_titles:
+        sys.exit(f">>> ERROR: Wiki text extraction failed for {len(failed_page_titles)} pages, run again to resume. Exiting.")
 
-        page_titles_count += 1
+    # Remove the superseded wiki text of updated pages
+    wiki_text_store.compact()
 
 
 if __name__ == "__main__":
@@ -147,8 +162,20 @@ if __name__ == "__main__":
                     nargs="+",
                     help="<Required> List of OSRS Wiki categories to extract",
                     required=True)
+    ap.add_argument("--api-url",
+                    default=OSRS_WIKI_API_URL,
+                    help="The OSRS Wiki API URL, for example a local stand-in server")
+    ap.add_argument("--max-in-flight",
+                    type=int,
+                    default=4,
+                    help="The maximum number of concurrent wiki text requests")
+    ap.add_argument("--requests-per-second",
+                    type=float,
+                    default=5.0,
+                    help="The maximum wiki text request rate")
     args = vars(ap.parse_args())
 
     # List of categories to process from the OSRS Wiki
     target_categories = args["categories"]
-    extract_wiki_data(target_categories, "2019-06-14T00:00:00Z")
+    extract_wiki_data(target_categories, "2019-06-14T00:00:00Z", args["api_url"],
+                      args["max_in_flight"], args["requests_per_second"])
@@ -0,0 +1,260 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import time
+import random
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from typing import List
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+from extraction_tools_wiki.wiki_page_text import MAX_TITLES_PER_REQUEST
+from extraction_tools_wiki.wiki_page_text import WikiPageTextBatch
+from extraction_tools_wiki.wiki_text_store import WikiTextStore
+
+# HTTP status codes that are worth retrying: too many requests, and server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# MediaWiki API error codes that are worth retrying
+RETRY_ERROR_CODES = {"maxlag", "ratelimited", "readonly"}
+
+
+class WikiExtractionError(Exception):
+    """An OSRS Wiki API request that failed after all retries."""
+
+
+class TokenBucket:
+    """A token-bucket rate limit for asyncio tasks.
+
+    Tokens are added at a constant rate, up to the capacity of the bucket, and each
+    request takes one token. Must be created inside the running event loop.
+
+    :param rate: The number of tokens added per second.
+    :param capacity: The maximum number of tokens, the size of a burst of requests.
+    """
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available, and take it."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class WikiExtractionEngine:
+    """An asyncio engine to extract the wiki text of many OSRS Wiki pages concurrently.
+
+    Pages are fetched in batches of 50 using revisions queries (see `WikiPageTextBatch`),
+    with a bounded number of requests in flight, and a token-bucket rate limit across
+    all requests. Requests share a pooled keep-alive session, and are made from a thread
+    pool, as `requests` is not asyncio aware. A request that fails with a connection
+    error, a 429 or 5xx status code, or a maxlag error is retried with jittered
+    exponential backoff.
+
+    The wiki text store is the checkpoint: each batch is appended to the store as soon
+    as it is extracted, so the pages of an interrupted run do not need to be fetched again.
+
+    :param base_url: The OSRS Wiki URL used for API queries.
+    :param user_agent: A custom user-agent name to be used for the API request.
+    :param user_email: A custom user-agent email to be used for the API request.
+    :param max_in_flight: The maximum number of concurrent requests.
+    :param requests_per_second: The maximum request rate.
+    :param max_retries: The number of retries of a failed request.
+    :param backoff_base: The maximum delay in seconds before the first retry, doubled for every retry.
+    :param backoff_max: The maximum delay in seconds before any retry.
+    :param timeout: The timeout in seconds of a single request.
+    """
+    def __init__(self, base_url: str, user_agent: str, user_email: str, max_in_flight: int = 4,
+                 requests_per_second: float = 5.0, max_retries: int = 5, backoff_base: float = 1.0,
+                 backoff_max: float = 60.0, timeout: float = 60.0):
+        self.base_url = base_url
+        self.user_agent = user_agent
+        self.user_email = user_email
+        self.max_in_flight = max_in_flight
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'From': user_email
+        })
+
+        self.request_count = 0
+        self.retry_count = 0
+
+        # Created for each run, inside the event loop
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._bucket: Optional[TokenBucket] = None
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Return a random delay before a retry, up to an exponentially increasing maximum ("full jitter").
+
+        :param attempt: The number of the failed attempt, starting at 0.
+        :return: The delay in seconds.
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def get(self, params: Dict) -> Dict:
+        """Perform a rate-limited OSRS Wiki API GET request, with retries.
+
+        :param params: The API query parameters.
+        :return: The JSON response.
+        :raises WikiExtractionError: The request failed after all retries, or failed with an error that is not retried.
+        """
+        loop = asyncio.get_event_loop()
+        request = functools.partial(self.session.get, self.base_url, params=params, timeout=self.timeout)
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.retry_count += 1
+
+            await self._bucket.acquire()
+            retry_after = 0.0
+            async with self._semaphore:
+                self.request_count += 1
+                try:
+                    response = await loop.run_in_executor(self._executor, request)
+                except requests.exceptions.RequestException as e:
+                    error = e
+                    response = None
+
+            if response is not None:
+                if response.status_code in RETRY_STATUS_CODES:
+                    error = f"HTTP status code {response.status_code}"
+                    try:
+                        retry_after = float(response.headers.get("Retry-After", 0))
+                    except ValueError:
+                        retry_after = 0.0
+                elif response.status_code >= 400:
+                    raise WikiExtractionError(f"HTTP status code {response.status_code} for: {params}")
+                else:
+                    try:
+                        page_data = response.json()
+                    except ValueError as e:
+                        error = e
+                    else:
+                        api_error = page_data.get("error", dict()).get("code")
+                        if api_error not in RETRY_ERROR_CODES:
+                            return page_data
+                        error = f"API error code {api_error}"
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(max(retry_after, self.backoff_delay(attempt)))
+
+        raise WikiExtractionError(f"Request failed after {self.max_retries} retries: {error}")
+
+    async def extract_batch_wiki_text(self, page_titles: List[str], store: WikiTextStore):
+        """Extract the wiki text of a batch of up to 50 pages, and append it to the store.
+
+        :param page_titles: A list of OSRS Wiki page titles.
+        :param store: The wiki text store to save the wiki text to.
+        """
+        wiki_page_text = WikiPageTextBatch(self.base_url, page_titles, self.user_agent, self.user_email, self.session)
+        request = wiki_page_text.query_request(page_titles)
+
+        last_continue = dict()
+        while True:
+            req = request.copy()
+            req.update(last_continue)
+            page_data = await self.get(req)
+            wiki_page_text.parse_query_response(page_data, page_titles)
+
+            if "continue" not in page_data:
+                break
+            last_continue = page_data["continue"]
+
+        # Only the event loop thread writes to the store, so appends never interleave
+        wiki_page_text.export_wiki_text_to_store(store)
+
+    async def extract_pages_wiki_text_async(self, page_titles: List[str], store: WikiTextStore,
+                                            verbose: bool = False) -> List[str]:
+        """Extract the wiki text of every page, in concurrent batches of 50 pages.
+
+        Every batch is attempted, even when another batch fails.
+
+        :param page_titles: A list of OSRS Wiki page titles.
+        :param store: The wiki text store to save the wiki text to.
+        :param verbose: Print the progress after each batch.
+        :return: A list of the page titles that failed extraction.
+        """
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._bucket = TokenBucket(self.requests_per_second)
+        batches = [page_titles[i:i + MAX_TITLES_PER_REQUEST] for i in range(0, len(page_titles), MAX_TITLES_PER_REQUEST)]
+        failed_page_titles = list()
+        extracted_count = 0
+
+        async def extract_batch(batch: List[str]):
+            nonlocal extracted_count
+            try:
+                await self.extract_batch_wiki_text(batch, store)
+            except WikiExtractionError as e:
+                failed_page_titles.extend(batch)
+                print(f"  > ERROR: {e} - Failed: {batch[0]}...")
+                return
+            extracted_count += len(batch)
+            if verbose:
+                print(f"  > Progress: {extracted_count:4d} of {len(page_titles):4d} - Processed: {batch[0]}...")
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+        try:
+            await asyncio.gather(*[extract_batch(batch) for batch in batches])
+        finally:
+            self._executor.shutdown()
+            self._executor = None
+
+        return failed_page_titles
+
+    def extract_pages_wiki_text(self, page_titles: List[str], store: WikiTextStore, verbose: bool = False) -> List[str]:
+        """Extract the wiki text of every page, running the asyncio engine to completion.
+
+        :param page_titles: A list of OSRS Wiki page titles.
+        :param store: The wiki text store to save the wiki text to.
+        :param verbose: Print the progress after each batch.
+        :return: A list of the page titles that failed extraction.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.extract_pages_wiki_text_async(page_titles, store, verbose))
+        finally:
+            loop.close()
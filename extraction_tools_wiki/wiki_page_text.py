@@ -22,10 +22,18 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import os
 import json
 import logging
+from typing import Dict
+from typing import List
+from typing import Optional
 import requests
 
+from extraction_tools_wiki.wiki_text_store import WikiTextStore
+
 LOG = logging.getLogger(__name__)
 
+# The maximum number of page titles in a single revisions query
+MAX_TITLES_PER_REQUEST = 50
+
 
 class WikiPageText:
     """This class handles extraction of wiki text using an OSRS Wiki API query.
@@ -98,3 +106,138 @@ class WikiPageText:
             feeds[self.page_title] = str(self.wiki_text)
             with open(out_file_name, mode='w') as out_file:
                 out_file.write(json.dumps(feeds, indent=4))
+
+    def export_wiki_text_to_store(self, store: WikiTextStore, timestamp: Optional[str] = None):
+        """Save the extracted wiki text to an append-only wiki text store.
+
+        Unlike `export_wiki_text_to_json`, this does not re-read or re-write any
+        previously extracted pages, the page is appended to the store.
+
+        :param store: The wiki text store to save the wiki text to.
+        :param timestamp: The revision timestamp of the extracted page.
+        """
+        store.save(self.page_title, str(self.wiki_text), timestamp)
+
+
+class WikiPageTextBatch:
+    """This class handles extraction of wiki text for many pages using batched OSRS Wiki API queries.
+
+    Up to 50 pages are fetched per request, using a revisions query for the page
+    content, revision ID and revision timestamp. Titles normalized by the API are mapped back to
+    the requested title. Redirects are not followed, the same as `WikiPageText`.
+
+    :param base_url: The OSRS Wiki URL used for API queries.
+    :param page_titles: OSRS Wiki page titles used for API queries.
+    :param user_agent: A custom user-agent name to be used for the API request.
+    :param user_email: A custom user-agent email to be used for the API request.
+    :param session: An optional requests session, to reuse connections between requests.
+    """
+    def __init__(self, base_url: str, page_titles: List[str], user_agent: str, user_email: str,
+                 session: Optional[requests.Session] = None):
+        self.base_url = base_url
+        self.page_titles = page_titles
+        self.custom_agent = {
+            'User-Agent': user_agent,
+            'From': user_email
+        }
+        self.session = session or requests.Session()
+        self.wiki_text: Dict[str, Optional[str]] = dict()
+        self.timestamps: Dict[str, Optional[str]] = dict()
+        self.revision_ids: Dict[str, Optional[int]] = dict()
+
+    def extract_pages_wiki_text(self):
+        """Extract wiki text from OSRS Wiki for every page title, 50 pages per request.
+
+        Pages that are missing from the OSRS Wiki have their wiki text set to None.
+        """
+        for i in range(0, len(self.page_titles), MAX_TITLES_PER_REQUEST):
+            self.extract_batch_wiki_text(self.page_titles[i:i + MAX_TITLES_PER_REQUEST])
+
+    def extract_batch_wiki_text(self, page_titles: List[str]):
+        """Extract wiki text for a batch of up to 50 page titles, using a single revisions query.
+
+        The API can split the content of a batch across multiple responses, so the
+        query is continued until all page content is returned.
+
+        :param page_titles: A list of OSRS Wiki page titles.
+        """
+        request = self.query_request(page_titles)
+
+        for page_title in page_titles:
+            self.wiki_text[page_title] = None
+            self.timestamps[page_title] = None
+            self.revision_ids[page_title] = None
+
+        last_continue = dict()
+        while True:
+            req = request.copy()
+            req.update(last_continue)
+
+            # Perform HTTP GET request
+            try:
+                response = self.session.get(self.base_url,
+                                            headers=self.custom_agent,
+                                            params=req)
+                response.raise_for_status()
+                page_data = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                raise SystemExit(">>> ERROR: Get request error. Exiting.") from e
+
+            self.parse_query_response(page_data, page_titles)
+
+            if "continue" not in page_data:
+                break
+            last_continue = page_data["continue"]
+
+    def query_request(self, page_titles: List[str]) -> Dict:
+        """Return the parameters of a revisions query for the content, ID and timestamp of a batch of pages.
+
+        :param page_titles: A list of up to 50 OSRS Wiki page titles.
+        :return: A dictionary of API query parameters.
+        """
+        return {
+            "action": "query",
+            "prop": "revisions",
+            "rvprop": "content|ids|timestamp",
+            "rvslots": "main",
+            "format": "json",
+            "titles": "|".join(page_titles)
+        }
+
+    def parse_query_response(self, page_data: Dict, page_titles: List[str]):
+        """Extract the wiki text, revision ID and revision timestamp of each page in a revisions query response.
+
+        :param page_data: The JSON response of a revisions query.
+        :param page_titles: The page titles that were requested.
+        """
+        query = page_data.get("query", dict())
+
+        # Map the titles normalized by the API back to the requested titles
+        normalized_titles = {normalized["from"]: normalized["to"] for normalized in query.get("normalized", list())}
+        requested_titles = dict()
+        for page_title in page_titles:
+            requested_titles.setdefault(normalized_titles.get(page_title, page_title), list()).append(page_title)
+
+        for page in query.get("pages", dict()).values():
+            revisions = page.get("revisions")
+            if "missing" in page or not revisions:
+                continue
+
+            revision = revisions[0]
+            if "slots" in revision:
+                revision = revision["slots"]["main"]
+            for page_title in requested_titles.get(page["title"], [page["title"]]):
+                self.wiki_text[page_title] = revision.get("*", revision.get("content"))
+                self.timestamps[page_title] = revisions[0].get("timestamp")
+                self.revision_ids[page_title] = revisions[0].get("revid")
+
+    def export_wiki_text_to_store(self, store: WikiTextStore):
+        """Save the extracted wiki text of every page to an append-only wiki text store.
+
+        Missing and invalid pages (without wiki text) are not saved, so they are not
+        treated as extracted pages.
+
+        :param store: The wiki text store to save the wiki text to.
+        """
+        store.save_many([(page_title, str(self.wiki_text[page_title]), self.timestamps.get(page_title), self.revision_ids.get(page_title))
+                         for page_title in self.page_titles if self.wiki_text.get(page_title) is not None])
@@ -22,12 +22,21 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import os
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Optional
 from typing import Generator
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 LOG = logging.getLogger(__name__)
 
+# The maximum number of page titles in a single revisions query
+MAX_TITLES_PER_REQUEST = 50
+
 
 class WikiPageTitles:
     """This class handles extraction of wiki page titles by category using an OSRS Wiki API query.
@@ -36,15 +45,26 @@ class WikiPageTitles:
     :param categories: A list of OSRS Wiki categories.
     :param user_agent: A custom user-agent name to be used for the API request.
     :param user_email: A custom user-agent email to be used for the API request.
+    :param max_workers: The maximum number of concurrent revisions queries.
     """
-    def __init__(self, base_url: str, categories: list, user_agent: str, user_email: str):
+    def __init__(self, base_url: str, categories: list, user_agent: str, user_email: str, max_workers: int = 4):
         self.base_url = base_url
         self.categories = categories
         self.custom_agent = {
             'User-Agent': user_agent,
             'From': user_email
         }
+        self.max_workers = max_workers
         self.page_titles: Dict[str, str] = dict()
+        self.revision_ids: Dict[str, Optional[int]] = dict()
+
+        # A keep-alive session, with a connection for each worker, that retries server errors
+        self.session = requests.Session()
+        retry = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(self.custom_agent)
 
     def __iter__(self) -> Generator[str, None, None]:
         """Iterate (loop) over the extracted or loaded OSRS Wiki page titles.
@@ -145,9 +165,8 @@ class WikiPageTitles:
 
             # Perform HTTP GET request
             try:
-                result = requests.get(self.base_url,
-                                      headers=self.custom_agent,
-                                      params=req).json()
+                result = self.session.get(self.base_url,
+                                          params=req).json()
             except requests.exceptions.RequestException as e:
                 raise SystemExit(">>> ERROR: Get request error. Exiting.") from e
 
@@ -177,6 +196,7 @@ class WikiPageTitles:
         changes have recently been made to the page, and if the page should be processed
         again. The input page_titles_string needs to be a list of page titles separated
         by the pipe (|) character. The maximum number of page titles is 50 per API query.
+        Missing pages are skipped.
 
         :param page_titles_string: A string of pipe separated wiki page titles.
         :return pages_revision_data:
@@ -190,13 +210,15 @@ class WikiPageTitles:
             'rvprop': 'timestamp'
         }
 
-        page_data = requests.get(self.base_url,
-                                 headers=self.custom_agent,
-                                 params=request).json()
+        page_data = self.session.get(self.base_url,
+                                     params=request).json()
 
         # Loop returned page revision data
         pages_revision_data = page_data["query"]["pages"]
         for page_id in pages_revision_data:
+            # Skip missing pages, that have no revisions
+            if "revisions" not in pages_revision_data[page_id]:
+                continue
             # Extract page title from the response
             page_title = pages_revision_data[page_id]["title"]
             # Extract last revision timestamp (ISO 8601 format)
@@ -206,6 +228,86 @@ class WikiPageTitles:
 
         return pages_revision_data
 
+    def extract_page_revisions(self, page_titles: Optional[List[str]] = None) -> Dict[str, Tuple[Optional[int], Optional[str]]]:
+        """Extract the last revision ID and timestamp of many pages, using concurrent revisions queries.
+
+        The page titles are queried in batches of 50 (the maximum for a revisions query),
+        and the batches are queried concurrently over the session. Titles normalized by the
+        API are mapped back to the requested title. Redirects are not followed, so a redirect
+        page has its own revision, the same as the wiki text extracted by `WikiPageTextBatch`.
+        Missing pages have a revision ID and timestamp of None.
+
+        The revision IDs and timestamps are also saved to the `revision_ids` and
+        `page_titles` dictionaries.
+
+        :param page_titles: A list of page titles, or None for all the extracted page titles.
+        :return: A dictionary of page title to a (revision ID, revision timestamp) tuple.
+        """
+        if page_titles is None:
+            page_titles = list(self.page_titles)
+
+        batches = [page_titles[i:i + MAX_TITLES_PER_REQUEST] for i in range(0, len(page_titles), MAX_TITLES_PER_REQUEST)]
+        revisions = dict()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for batch_revisions in executor.map(self.extract_batch_revisions, batches):
+                revisions.update(batch_revisions)
+
+        for page_title, (revision_id, timestamp) in revisions.items():
+            self.page_titles[page_title] = timestamp
+            self.revision_ids[page_title] = revision_id
+
+        return revisions
+
+    def extract_batch_revisions(self, page_titles: List[str]) -> Dict[str, Tuple[Optional[int], Optional[str]]]:
+        """Extract the last revision ID and timestamp of a batch of up to 50 pages, using a single revisions query.
+
+        :param page_titles: A list of OSRS Wiki page titles.
+        :return: A dictionary of page title to a (revision ID, revision timestamp) tuple.
+        """
+        request = {
+            'action': 'query',
+            'prop': 'revisions',
+            'titles': '|'.join(page_titles),
+            'format': 'json',
+            'rvprop': 'ids|timestamp'
+        }
+
+        revisions = {page_title: (None, None) for page_title in page_titles}
+        last_continue = dict()
+        while True:
+            req = request.copy()
+            req.update(last_continue)
+
+            # Perform HTTP GET request
+            try:
+                response = self.session.get(self.base_url,
+                                            params=req)
+                response.raise_for_status()
+                page_data = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                raise SystemExit(">>> ERROR: Get request error. Exiting.") from e
+
+            query = page_data.get("query", dict())
+
+            # Map the titles normalized by the API back to the requested titles
+            normalized_titles = {normalized["from"]: normalized["to"] for normalized in query.get("normalized", list())}
+            requested_titles = dict()
+            for page_title in page_titles:
+                requested_titles.setdefault(normalized_titles.get(page_title, page_title), list()).append(page_title)
+
+            for page in query.get("pages", dict()).values():
+                page_revisions = page.get("revisions")
+                if "missing" in page or not page_revisions:
+                    continue
+                for page_title in requested_titles.get(page["title"], list()):
+                    revisions[page_title] = (page_revisions[0].get("revid"), page_revisions[0].get("timestamp"))
+
+            if "continue" not in page_data:
+                break
+            last_continue = page_data["continue"]
+
+        return revisions
+
     def export_page_titles_in_json(self, out_file_name: str):
         """Export all extracted page titles and revision timestamp to a JSON file.
 
@@ -0,0 +1,216 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+import time
+import datetime
+import threading
+import urllib.parse
+from pathlib import Path
+from typing import Dict
+from typing import List
+from socketserver import ThreadingMixIn
+from http.server import HTTPServer
+from http.server import BaseHTTPRequestHandler
+
+# The maximum number of page titles in a single query, the same as the OSRS Wiki API
+MAX_TITLES_PER_REQUEST = 50
+
+
+def normalize_title(page_title: str) -> str:
+    """Normalize a page title the same way as MediaWiki: underscores to spaces, and an uppercase first letter.
+
+    :param page_title: The page title.
+    :return: The normalized page title.
+    """
+    page_title = page_title.replace("_", " ").strip()
+    return page_title[:1].upper() + page_title[1:]
+
+
+class WikiFixtures:
+    """The OSRS Wiki pages served by the stand-in server, loaded from a fixtures directory.
+
+    Each page is a `<page title>.wiki` file of wiki text, where the page title is URL
+    quoted (for example, `Abyssal%20whip.wiki`). The revision timestamp of a page is the
+    modification time of the file. An optional `categories.json` file maps a category
+    name to a list of page titles.
+
+    :param path_to_fixtures: The path to the fixtures directory.
+    """
+    def __init__(self, path_to_fixtures: Path):
+        self.pages: Dict[str, Dict] = dict()
+        for path_to_page in sorted(path_to_fixtures.glob("*.wiki")):
+            page_title = urllib.parse.unquote(path_to_page.stem)
+            timestamp = datetime.datetime.fromtimestamp(path_to_page.stat().st_mtime, datetime.timezone.utc)
+            self.pages[page_title] = {
+                "pageid": len(self.pages) + 1,
+                "revid": int(path_to_page.stat().st_mtime),
+                "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "wiki_text": path_to_page.read_text()
+            }
+
+        self.categories: Dict[str, List[str]] = dict()
+        path_to_categories = path_to_fixtures / "categories.json"
+        if path_to_categories.is_file():
+            with open(path_to_categories) as f:
+                self.categories = json.load(f)
+
+
+class WikiStandInHandler(BaseHTTPRequestHandler):
+    """Answer the MediaWiki API queries used by the extraction tools, from the fixtures of the server."""
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        params = dict(urllib.parse.parse_qsl(url.query, keep_blank_values=True))
+        with self.server.lock:
+            self.server.request_count += 1
+            failing = self.server.failures > 0
+            if failing:
+                self.server.failures -= 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if failing:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if params.get("action") == "parse":
+            result = self.parse(params)
+        elif params.get("action") == "query" and params.get("list") == "categorymembers":
+            result = self.category_members(params)
+        elif params.get("action") == "query" and params.get("prop") == "revisions":
+            result = self.revisions(params)
+        else:
+            result = {"error": {"code": "badvalue", "info": "Unsupported request."}}
+
+        body = json.dumps(result).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Do not log every request to stderr."""
+        return
+
+    def parse(self, params: Dict) -> Dict:
+        """Answer an `action=parse&prop=wikitext` query."""
+        page_title = normalize_title(params.get("page", ""))
+        page = self.server.fixtures.pages.get(page_title)
+        if page is None:
+            return {"error": {"code": "missingtitle", "info": "The page you specified doesn't exist."}}
+        return {"parse": {"title": page_title, "pageid": page["pageid"], "wikitext": {"*": page["wiki_text"]}}}
+
+    def category_members(self, params: Dict) -> Dict:
+        """Answer an `action=query&list=categorymembers` query, without continuation."""
+        category = params.get("cmtitle", "").replace("Category:", "", 1)
+        members = [{"ns": 0, "title": page_title} for page_title in self.server.fixtures.categories.get(category, list())]
+        return {"batchcomplete": "", "query": {"categorymembers": members}}
+
+    def revisions(self, params: Dict) -> Dict:
+        """Answer an `action=query&prop=revisions` query, for up to 50 titles."""
+        page_titles = [page_title for page_title in params.get("titles", "").split("|") if page_title]
+        if len(page_titles) > MAX_TITLES_PER_REQUEST:
+            return {"error": {"code": "toomanyvalues", "info": "Too many values supplied for parameter \"titles\"."}}
+
+        rvprop = params.get("rvprop", "").split("|")
+        query = {"pages": dict()}
+        missing_count = 0
+        for page_title in page_titles:
+            normalized_title = normalize_title(page_title)
+            if normalized_title != page_title:
+                query.setdefault("normalized", list()).append({"from": page_title, "to": normalized_title})
+
+            page = self.server.fixtures.pages.get(normalized_title)
+            if page is None:
+                missing_count += 1
+                query["pages"][str(-missing_count)] = {"ns": 0, "title": normalized_title, "missing": ""}
+                continue
+
+            revision = dict()
+            if "ids" in rvprop:
+                revision["revid"] = page["revid"]
+            if "timestamp" in rvprop:
+                revision["timestamp"] = page["timestamp"]
+            if "content" in rvprop:
+                revision["slots"] = {"main": {"contentmodel": "wikitext", "contentformat": "text/x-wiki", "*": page["wiki_text"]}}
+            query["pages"][str(page["pageid"])] = {"pageid": page["pageid"], "ns": 0, "title": normalized_title, "revisions": [revision]}
+
+        return {"batchcomplete": "", "query": query}
+
+
+class WikiStandInServer(ThreadingMixIn, HTTPServer):
+    """A local HTTP stand-in for the OSRS Wiki MediaWiki API, for offline tests and benchmarks.
+
+    Use as a context manager to serve requests from a background thread:
+
+        with WikiStandInServer(Path("fixtures")) as server:
+            requests.get(server.url, params={"action": "parse", "page": "Abyssal whip", ...})
+
+    :param path_to_fixtures: The path to the fixtures directory, see `WikiFixtures`.
+    :param port: The port to listen on, 0 for any free port.
+    :param latency: An artificial delay in seconds added to every request, to simulate a round trip.
+
+    Set `failures` to answer the next number of requests with a 503 (Service Unavailable)
+    error, to test retries.
+    """
+    daemon_threads = True
+
+    def __init__(self, path_to_fixtures: Path, port: int = 0, latency: float = 0.0):
+        super().__init__(("127.0.0.1", port), WikiStandInHandler)
+        self.fixtures = WikiFixtures(path_to_fixtures)
+        self.latency = latency
+        self.request_count = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        """The URL of the stand-in `api.php` endpoint."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api.php"
+
+    def __enter__(self) -> "WikiStandInServer":
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+        self.thread.join()
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Serve a stand-in OSRS Wiki API from a fixtures directory.")
+    ap.add_argument("fixtures", help="The fixtures directory of <page title>.wiki files")
+    ap.add_argument("--port", type=int, default=8080, help="The port to listen on")
+    ap.add_argument("--latency", type=float, default=0.0, help="An artificial delay in seconds added to every request")
+    args = ap.parse_args()
+
+    stand_in_server = WikiStandInServer(Path(args.fixtures), args.port, args.latency)
+    print(f">>> Serving stand-in OSRS Wiki API: {stand_in_server.url}")
+    stand_in_server.serve_forever()
@@ -0,0 +1,220 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import json
+import mmap
+from json.decoder import WHITESPACE
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+from typing import Optional
+from typing import Generator
+
+
+class WikiTextStore:
+    """An append-only store of extracted OSRS Wiki page wiki text.
+
+    The store is a JSON lines file, where each line is a JSON array of:
+    `[page_title, revision_timestamp, wiki_text, revision_id]` (the revision ID is
+    missing from records saved by older versions). Saving a page appends a line,
+    and the last line for a page title is the current record. When opened, only
+    the page title, timestamp and revision ID of each line are decoded to build an
+    index of line offsets, and the wiki text of a page is read from the (memory-mapped)
+    file when accessed. Use `compact` to remove superseded records.
+
+    The store can be used as a read-only mapping of page title to wiki text.
+
+    :param path_to_store: The path to the JSON lines file, created if it does not exist.
+    """
+    def __init__(self, path_to_store: Union[Path, str]):
+        self.path_to_store = Path(path_to_store)
+        self.offsets: Dict[str, Tuple[int, int]] = dict()
+        self.timestamps: Dict[str, Optional[str]] = dict()
+        self.revision_ids: Dict[str, Optional[int]] = dict()
+        self.data: Optional[mmap.mmap] = None
+        self.size = 0
+
+        if self.path_to_store.is_file():
+            self._scan()
+
+    def __contains__(self, page_title: str) -> bool:
+        """Return if a page title is in the store."""
+        return page_title in self.offsets
+
+    def __len__(self) -> int:
+        """Return the number of pages in the store."""
+        return len(self.offsets)
+
+    def __iter__(self) -> Generator[str, None, None]:
+        """Iterate (loop) over each page title in the store."""
+        for page_title in self.offsets:
+            yield page_title
+
+    def __getitem__(self, page_title: str) -> str:
+        """Return the wiki text of a page.
+
+        :param page_title: The OSRS Wiki page title.
+        :return: The page wiki text.
+        :raises KeyError: The page title is not in the store.
+        """
+        return self.read_record(page_title)[2]
+
+    def get(self, page_title: str, default: Optional[str] = None) -> Optional[str]:
+        """Return the wiki text of a page, or a default value if it is not in the store."""
+        try:
+            return self[page_title]
+        except KeyError:
+            return default
+
+    def timestamp(self, page_title: str) -> Optional[str]:
+        """Return the revision timestamp saved with a page.
+
+        :param page_title: The OSRS Wiki page title.
+        :return: The revision timestamp (ISO 8601 format), or None if unknown.
+        :raises KeyError: The page title is not in the store.
+        """
+        if page_title not in self.offsets:
+            raise KeyError(page_title)
+        return self.timestamps.get(page_title)
+
+    def revision_id(self, page_title: str) -> Optional[int]:
+        """Return the revision ID saved with a page.
+
+        :param page_title: The OSRS Wiki page title.
+        :return: The revision ID, or None if unknown.
+        :raises KeyError: The page title is not in the store.
+        """
+        if page_title not in self.offsets:
+            raise KeyError(page_title)
+        return self.revision_ids.get(page_title)
+
+    def read_record(self, page_title: str) -> List:
+        """Read the current record for a page.
+
+        :param page_title: The OSRS Wiki page title.
+        :return: A list of [page title, revision timestamp, wiki text, revision ID], without the revision ID for older records.
+        :raises KeyError: The page title is not in the store.
+        """
+        start, length = self.offsets[page_title]
+        if self.data is None:
+            with open(self.path_to_store, "rb") as store_file:
+                self.data = mmap.mmap(store_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return json.loads(self.data[start:start + length])
+
+    def save(self, page_title: str, wiki_text: str, timestamp: Optional[str] = None, revision_id: Optional[int] = None) -> None:
+        """Save the wiki text for a page, by appending a record to the store.
+
+        :param page_title: The OSRS Wiki page title.
+        :param wiki_text: The page wiki text.
+        :param timestamp: The page revision timestamp (ISO 8601 format).
+        :param revision_id: The page revision ID.
+        """
+        self.save_many([(page_title, wiki_text, timestamp, revision_id)])
+
+    def save_many(self, records: List[Tuple]) -> None:
+        """Save the wiki text for multiple pages, by appending records to the store.
+
+        :param records: A list of (page title, wiki text, revision timestamp) or
+            (page title, wiki text, revision timestamp, revision ID) tuples.
+        """
+        lines = list()
+        offsets = dict()
+        timestamps = dict()
+        revision_ids = dict()
+        position = self.size
+        for page_title, wiki_text, timestamp, *revision_id in records:
+            revision_id = revision_id[0] if revision_id else None
+            line = json.dumps([page_title, timestamp, wiki_text, revision_id]).encode("utf-8")
+            offsets[page_title] = (position, len(line))
+            timestamps[page_title] = timestamp
+            revision_ids[page_title] = revision_id
+            position += len(line) + 1
+            lines.append(line)
+
+        self._close_data()
+        with open(self.path_to_store, "ab") as store_file:
+            # Remove a partial line, left by an interrupted write, so new records start on a new line
+            if store_file.tell() > self.size:
+                store_file.truncate(self.size)
+            store_file.write(b"".join(line + b"\n" for line in lines))
+
+        self.offsets.update(offsets)
+        self.timestamps.update(timestamps)
+        self.revision_ids.update(revision_ids)
+        self.size = position
+
+    def compact(self) -> None:
+        """Rewrite the store with only the current record for each page."""
+        temp_path = self.path_to_store.with_name(self.path_to_store.name + ".tmp")
+        offsets = dict()
+        position = 0
+        with open(temp_path, "wb") as temp_file:
+            for page_title in self.offsets:
+                line = json.dumps(self.read_record(page_title)).encode("utf-8")
+                temp_file.write(line + b"\n")
+                offsets[page_title] = (position, len(line))
+                position += len(line) + 1
+
+        self._close_data()
+        os.replace(temp_path, self.path_to_store)
+        self.offsets = offsets
+        self.size = position
+
+    def import_json(self, path_to_json_file: Union[Path, str]) -> None:
+        """Import the pages from a `extract_page_text_<category>.json` file.
+
+        :param path_to_json_file: The path to a JSON file of page title to wiki text.
+        """
+        with open(path_to_json_file) as json_file:
+            wiki_text = json.load(json_file)
+        self.save_many([(page_title, text, None) for page_title, text in wiki_text.items()])
+
+    def _scan(self) -> None:
+        """Build the index of page title to line offset, by decoding only the page title, timestamp and revision ID of each line."""
+        decoder = json.JSONDecoder()
+        position = 0
+        with open(self.path_to_store, "rb") as store_file:
+            for line in store_file:
+                # A partial last line, left by an interrupted write, is ignored (and removed by the next save)
+                if not line.endswith(b"\n"):
+                    break
+                text = line.decode("utf-8")
+                page_title, end = decoder.raw_decode(text, text.index("[") + 1)
+                end = WHITESPACE.match(text, text.index(",", end) + 1).end()
+                timestamp, _ = decoder.raw_decode(text, end)
+                # The revision ID is a number (or null) after the wiki text string, so follows the last comma
+                revision_id = None
+                if not text.endswith("\"]\n"):
+                    revision_id = json.loads(text[text.rindex(",") + 1:text.rindex("]")])
+                self.offsets[page_title] = (position, len(line) - 1)
+                self.timestamps[page_title] = timestamp
+                self.revision_ids[page_title] = revision_id
+                position += len(line)
+        self.size = position
+
+    def _close_data(self) -> None:
+        """Close the memory-mapped file, so the next read maps the updated file."""
+        if self.data is not None:
+            self.data.close()
+            self.data = None
@@ -0,0 +1,129 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+import hashlib
+import datetime
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Iterable
+
+from scripts.update_items.determine_new_items import DetermineNewItems
+
+
+def item_inputs(item_id: str, cache_item: Dict, normalized_names: Dict, buy_limits: Dict, skill_requirements: Dict,
+                weapon_types: Dict, weapon_stances: Dict, wiki_timestamps: Dict) -> Dict:
+    """Collect every builder input that can change the output for a single item.
+
+    :param item_id: The item ID number.
+    :param cache_item: The item entry from `items-cache-data.json`.
+    :param normalized_names: The parsed `normalized_names.txt` entries.
+    :param buy_limits: The item name to buy limit dictionary.
+    :param skill_requirements: The item ID to skill requirements dictionary.
+    :param weapon_types: The item ID to weapon type dictionary.
+    :param weapon_stances: The weapon type to stances dictionary.
+    :param wiki_timestamps: The wiki page name to page revision timestamp dictionary.
+    :return: A dictionary of the item inputs.
+    """
+    name = cache_item["name"]
+    normalized_name = normalized_names.get(item_id)
+    wiki_name = normalized_name[1] if normalized_name else name
+
+    weapon_type = weapon_types.get(item_id)
+    stances = None
+    if weapon_type:
+        stances = weapon_stances.get(weapon_type["weapon_type"])
+
+    return {
+        "cache": cache_item,
+        "normalized_name": normalized_name,
+        "normalized_name_by_name": normalized_names.get(name),
+        "wiki_timestamp": wiki_timestamps.get(wiki_name),
+        "buy_limit": buy_limits.get(name),
+        "skill_requirements": skill_requirements.get(item_id),
+        "weapon_type": weapon_type,
+        "weapon_stances": stances
+    }
+
+
+def item_digest(inputs: Dict) -> str:
+    """Return a digest of the item inputs, that changes when any input changes.
+
+    :param inputs: A dictionary of the item inputs, from `item_inputs`.
+    :return: A hex digest string.
+    """
+    return hashlib.sha1(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class BuildManifest:
+    """The record of item inputs used by the last build, to determine which items need rebuilding.
+
+    The manifest stores a digest of the inputs of every built item. An item is dirty
+    when its digest is new or has changed since the last build, or its output file is missing.
+
+    :param path_to_manifest: The path to the manifest JSON file.
+    """
+    def __init__(self, path_to_manifest: Path):
+        self.path_to_manifest = path_to_manifest
+        self.digests: Dict[str, str] = dict()
+        self.last_build = None
+
+        if path_to_manifest.is_file():
+            with open(path_to_manifest) as f:
+                manifest = json.load(f)
+            self.digests = manifest["items"]
+            self.last_build = manifest["last_build"]
+
+    def dirty_items(self, digests: Dict[str, str], path_to_items_json: Path) -> List[str]:
+        """Determine the items that need to be rebuilt.
+
+        :param digests: A dictionary of item ID to the digest of its current inputs.
+        :param path_to_items_json: The directory of item JSON files (`items-json`).
+        :return: A list of item IDs to rebuild.
+        """
+        dd = DetermineNewItems(digests, self.digests)
+        dirty = set(dd.added()) | set(dd.changed())
+
+        for item_id in dd.unchanged():
+            if not Path(path_to_items_json / f"{item_id}.json").is_file():
+                dirty.add(item_id)
+
+        return [item_id for item_id in digests if item_id in dirty]
+
+    def update(self, digests: Dict[str, str], item_ids: Iterable[str]) -> None:
+        """Record the inputs of built items.
+
+        :param digests: A dictionary of item ID to the digest of its current inputs.
+        :param item_ids: The item IDs that were built.
+        """
+        for item_id in item_ids:
+            self.digests[item_id] = digests[item_id]
+        self.last_build = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def save(self) -> None:
+        """Write the manifest JSON file."""
+        manifest = {
+            "last_build": self.last_build,
+            "items": self.digests
+        }
+        with open(self.path_to_manifest, "w") as f:
+            json.dump(manifest, f, indent=4, sort_keys=True)
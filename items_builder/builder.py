@@ -19,82 +19,297 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
 
+import io
 import os
+import sys
 import json
+import argparse
+import contextlib
+import multiprocessing
 from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Optional
 
 import config
+from extraction_tools_wiki.wiki_text_store import WikiTextStore
 from items_builder import item_builder
+from items_builder.build_manifest import BuildManifest
+from items_builder.build_manifest import item_digest
+from items_builder.build_manifest import item_inputs
+from items_builder.item_diff import ItemChangelog
+from items_builder.wiki_template_cache import WikiTemplateCache
 
+PATH_TO_BUILD_MANIFEST = Path(config.ITEMS_BUILDER_PATH / "build-manifest.json")
+PATH_TO_BUILD_CHANGELOG = Path(config.ITEMS_BUILDER_PATH / "build-changelog.json")
 
-if __name__ == "__main__":
-    # Delete old log file
-    if os.path.exists("builder.log"):
-        os.remove("builder.log")
+# The read-only build inputs of a pool worker, inherited from the parent process when forked
+_worker_inputs: Optional[Dict] = None
+
+
+def load_build_inputs() -> Dict:
+    """Load every input file used to build the item database.
+
+    :return: A dictionary of input name to the loaded input data.
+    """
+    inputs = dict()
 
     # Load the raw output from OSRS cache
     scraper_path = Path(config.DATA_PATH / "items-cache-data.json")
     with open(scraper_path) as f:
-        cache_items = json.load(f)
+        inputs["cache_items"] = json.load(f)
 
     # Load the current database contents
     items_complete_path = Path(config.DOCS_PATH / "items-complete.json")
     with open(items_complete_path) as f:
-        current_db = json.load(f)
+        inputs["current_db"] = json.load(f)
 
-    # Load the wiki text file
-    wiki_text_file_path = Path(config.EXTRACTION_WIKI_PATH / "extract_page_text_items.json")
-    with open(wiki_text_file_path) as wiki_text_file:
-        wiki_text = json.load(wiki_text_file)
+    # Open the wiki text store, pages are read when used
+    wiki_text_file_path = Path(config.EXTRACTION_WIKI_PATH / "extract_page_text_items.jsonl")
+    if not wiki_text_file_path.is_file():
+        raise FileNotFoundError(f"Error: Wiki text store not found: {wiki_text_file_path}. Exiting.")
+    inputs["wiki_text"] = WikiTextStore(wiki_text_file_path)
+
+    # Cache the templates extracted from each wiki page, for the duration of the build
+    inputs["template_cache"] = WikiTemplateCache(inputs["wiki_text"])
+
+    # Load the wiki page revision timestamps
+    wiki_titles_file_path = Path(config.EXTRACTION_WIKI_PATH / "extract_page_titles_items.json")
+    with open(wiki_titles_file_path) as wiki_titles_file:
+        inputs["wiki_timestamps"] = json.load(wiki_titles_file)
 
     # Load all normalized names
     normalized_names = dict()
-    with open("normalized_names.txt") as f:
+    with open(Path(config.ITEMS_BUILDER_PATH / "normalized_names.txt")) as f:
         for line in f:
             line = line.strip()
             if "#" in line or line.startswith("TODO"):
                 continue
             line = line.split("|")
             normalized_names[line[0]] = [line[1], line[2], line[3]]
+    inputs["normalized_names"] = normalized_names
 
     # Load buy limit data
     buy_limits_path = Path(config.DATA_PATH / "ge-limits-names.json")
     with open(buy_limits_path) as f:
-        buy_limits = json.load(f)
+        inputs["buy_limits"] = json.load(f)
 
     # Load skill requirement data
     skill_requirements_path = Path(config.DATA_PATH / "item-skill-requirements.json")
     with open(skill_requirements_path) as f:
-        skill_requirements = json.load(f)
+        inputs["skill_requirements"] = json.load(f)
 
     # Load weapon_type data
     weapon_type_path = Path(config.DATA_PATH / "weapon-types.json")
     with open(weapon_type_path) as f:
-        weapon_types = json.load(f)
+        inputs["weapon_types"] = json.load(f)
 
     # Load stances data
     weapon_stance_path = Path(config.DATA_PATH / "weapon-stances.json")
     with open(weapon_stance_path) as f:
-        weapon_stances = json.load(f)
+        inputs["weapon_stances"] = json.load(f)
+
+    return inputs
+
+
+def input_digests(inputs: Dict) -> Dict[str, str]:
+    """Determine the digest of the inputs for every item.
+
+    :param inputs: A dictionary of loaded input data, from `load_build_inputs`.
+    :return: A dictionary of item ID to input digest.
+    """
+    digests = dict()
+    for item_id, cache_item in inputs["cache_items"].items():
+        digests[item_id] = item_digest(item_inputs(item_id,
+                                                   cache_item,
+                                                   inputs["normalized_names"],
+                                                   inputs["buy_limits"],
+                                                   inputs["skill_requirements"],
+                                                   inputs["weapon_types"],
+                                                   inputs["weapon_stances"],
+                                                   inputs["wiki_timestamps"]))
+    return digests
+
+
+def build_item(item_id: str, inputs: Dict) -> Optional[Dict]:
+    """Build a single item, and export the item JSON file.
+
+    :param item_id: The item ID number.
+    :param inputs: A dictionary of loaded input data, from `load_build_inputs`.
+    :return: The change record of the item compared to the current database, or None if unchanged.
+    """
+    # Initialize the BuildItem class
+    builder = item_builder.BuildItem(item_id,
+                                     inputs["cache_items"][item_id],
+                                     inputs["wiki_text"],
+                                     inputs["normalized_names"],
+                                     inputs["buy_limits"],
+                                     inputs["skill_requirements"],
+                                     inputs["current_db"],
+                                     inputs["weapon_types"],
+                                     inputs["weapon_stances"],
+                                     inputs["template_cache"])
+    # Start the build item population function
+    builder.populate()
+    return builder.change_record
+
+
+def _set_worker_inputs(inputs: Dict) -> None:
+    """Set the build inputs of a pool worker process (used when workers are not forked).
+
+    :param inputs: A dictionary of loaded input data, from `load_build_inputs`.
+    """
+    global _worker_inputs
+    _worker_inputs = inputs
+
+
+def _build_chunk(item_ids: List[str]) -> List[Tuple[str, str, Optional[Dict], Optional[str]]]:
+    """Build a chunk of items in a pool worker process.
+
+    The output printed while building each item is captured, so the parent process
+    can print it in item order. An item that fails to build does not stop the chunk,
+    as a fatal data error (SystemExit) would otherwise stop the worker process.
+
+    :param item_ids: The item ID numbers to build.
+    :return: A list of (item ID, printed output, change record or None, error or None) tuples.
+    """
+    results = list()
+    for item_id in item_ids:
+        output = io.StringIO()
+        change_record = None
+        error = None
+        with contextlib.redirect_stdout(output):
+            try:
+                change_record = build_item(item_id, _worker_inputs)
+            except SystemExit:
+                error = "build stopped, see builder.log"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        results.append((item_id, output.getvalue(), change_record, error))
+    return results
+
+
+def build_items_serial(item_ids: List[str], inputs: Dict, changelog: ItemChangelog) -> List[str]:
+    """Build items in this process.
+
+    The build stops at the first item that fails to build, including a fatal data
+    error (SystemExit). A parallel build instead reports the failed items after the build.
+
+    :param item_ids: The item ID numbers to build.
+    :param inputs: A dictionary of loaded input data, from `load_build_inputs`.
+    :param changelog: The build changelog, the item change records are added in item order.
+    :return: A list of the item IDs that were built.
+    """
+    for item_id in item_ids:
+        changelog.add(build_item(item_id, inputs))
+    return list(item_ids)
+
+
+def build_items_parallel(item_ids: List[str], inputs: Dict, workers: int, chunk_size: int,
+                         changelog: ItemChangelog) -> List[str]:
+    """Build items across a pool of worker processes.
+
+    Workers are forked after the build inputs are loaded, so every worker shares the
+    inputs without pickling them for each task. Items are built in chunks, and the
+    results are collected in item order, so the printed output matches a serial build.
+
+    :param item_ids: The item ID numbers to build.
+    :param inputs: A dictionary of loaded input data, from `load_build_inputs`.
+    :param workers: The number of worker processes.
+    :param chunk_size: The number of items built by a worker per task.
+    :param changelog: The build changelog, the item change records are added in item order.
+    :return: A list of the item IDs that were built successfully.
+    """
+    chunks = [item_ids[i:i + chunk_size] for i in range(0, len(item_ids), chunk_size)]
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        _set_worker_inputs(inputs)
+        pool = multiprocessing.get_context("fork").Pool(workers)
+    else:
+        pool = multiprocessing.Pool(workers, initializer=_set_worker_inputs, initargs=(inputs,))
+
+    built_item_ids = list()
+    failures = list()
+    with pool:
+        for results in pool.imap(_build_chunk, chunks):
+            for item_id, output, change_record, error in results:
+                sys.stdout.write(output)
+                if error is None:
+                    built_item_ids.append(item_id)
+                    changelog.add(change_record)
+                else:
+                    failures.append((item_id, error))
+
+    for item_id, error in failures:
+        print(f">>> Failed to build item: {item_id}: {error}")
+
+    return built_item_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the osrsbox-db item database.")
+    parser.add_argument("--incremental",
+                        action="store_true",
+                        help="Only build items with inputs that changed since the last build")
+    parser.add_argument("--start-id",
+                        type=int,
+                        default=None,
+                        help="The lowest item ID number to build")
+    parser.add_argument("--end-id",
+                        type=int,
+                        default=None,
+                        help="The highest item ID number to build")
+    parser.add_argument("--workers",
+                        type=int,
+                        default=1,
+                        help="The number of worker processes to build items with")
+    parser.add_argument("--chunk-size",
+                        type=int,
+                        default=50,
+                        help="The number of items built by a worker process per task")
+    args = parser.parse_args()
+
+    # Delete old log file
+    if os.path.exists("builder.log"):
+        os.remove("builder.log")
+
+    inputs = load_build_inputs()
+    digests = input_digests(inputs)
+    manifest = BuildManifest(PATH_TO_BUILD_MANIFEST)
+
+    # Determine the items to build, every item unless an incremental build is requested
+    if args.incremental:
+        item_ids = manifest.dirty_items(digests, Path(config.DOCS_PATH / "items-json"))
+        print(f">>> Incremental build: {len(item_ids)} dirty items (last build: {manifest.last_build})")
+    else:
+        item_ids = list(inputs["cache_items"])
+
+    # Only build items in the requested ID number range
+    if args.start_id is not None:
+        item_ids = [item_id for item_id in item_ids if int(item_id) >= args.start_id]
+    if args.end_id is not None:
+        item_ids = [item_id for item_id in item_ids if int(item_id) <= args.end_id]
 
     # Start processing every item!
-    for item_id in cache_items:
-        json_data = cache_items[item_id]
-
-        # Toggle to start, stop at a specific item ID
-        # if int(item_id) < 23000:
-        #     continue
-
-        # Initialize the BuildItem class
-        builder = item_builder.BuildItem(item_id,
-                                         json_data,
-                                         wiki_text,
-                                         normalized_names,
-                                         buy_limits,
-                                         skill_requirements,
-                                         current_db,
-                                         weapon_types,
-                                         weapon_stances)
-        # Start the build item population function
-        builder.populate()
+    changelog = ItemChangelog()
+    if args.workers > 1:
+        built_item_ids = build_items_parallel(item_ids, inputs, args.workers, args.chunk_size, changelog)
+    else:
+        built_item_ids = build_items_serial(item_ids, inputs, changelog)
+
+    # Record the inputs of the built items, for the next incremental build
+    manifest.update(digests, built_item_ids)
+    manifest.save()
+
+    # Save the new and changed items of this build to a single changelog
+    changelog.save(PATH_TO_BUILD_CHANGELOG, manifest.last_build)
+    print(f">>> Changelog: {changelog.count('new')} new, {changelog.count('changed')} changed items: {PATH_TO_BUILD_CHANGELOG}")
     print("Done.")
+
+    if len(built_item_ids) != len(item_ids):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
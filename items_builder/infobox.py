@@ -0,0 +1,109 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+from typing import Dict
+from typing import Optional
+
+import mwparserfromhell
+
+# Infobox properties used to name each version of a versioned infobox
+VERSION_IDENTIFIERS = ["version",
+                       "name",
+                       "itemname"]
+
+# Guessing max version number is 20
+MAX_VERSION_COUNT = 20
+
+
+class Infobox:
+    """A precompiled OSRS Wiki infobox template.
+
+    The template parameters are converted to a dictionary of parameter name to
+    stripped value once, and the versions of a versioned infobox are counted once,
+    so every property lookup afterwards is a dictionary lookup.
+
+    :param params: A dictionary of stripped parameter name to stripped value.
+    """
+    def __init__(self, params: Dict[str, str]):
+        self.params = params
+
+        # The number of contiguous versions (name1, name2, ...) for each version identifier
+        self.version_counts = dict()
+        for version_identifier in VERSION_IDENTIFIERS:
+            version_count = 0
+            while version_count < MAX_VERSION_COUNT and f"{version_identifier}{version_count + 1}" in params:
+                version_count += 1
+            self.version_counts[version_identifier] = version_count
+
+        self.is_versioned = any(self.version_counts.values())
+
+    @classmethod
+    def from_template(cls, template: mwparserfromhell.nodes.template.Template) -> "Infobox":
+        """Precompile a wiki text template.
+
+        When a parameter name is repeated, the last value is kept (the same as MediaWiki).
+
+        :param template: A mediawiki wiki text template.
+        :return: The precompiled infobox.
+        """
+        return cls({str(param.name).strip(): str(param.value).strip() for param in template.params})
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the value of a parameter.
+
+        :param key: The parameter name.
+        :return: The stripped parameter value, or None if the parameter is not present.
+        """
+        return self.params.get(key)
+
+    def lookup(self, prop: str, version: Optional[int] = None) -> Optional[str]:
+        """Return the value of a property, preferring the value for a specific version.
+
+        :param prop: The property name, for example `weight`.
+        :param version: The infobox version number, or None for an unversioned lookup.
+        :return: The stripped property value, or None if the property is not present.
+        """
+        value = None
+        if version is not None:
+            value = self.params.get(prop + str(version))
+        if value is None:
+            value = self.params.get(prop)
+        return value
+
+    def match_version(self, name: str) -> Optional[int]:
+        """Determine the infobox version that matches an item name.
+
+        :param name: The item name.
+        :return: The matched version number, 1 if no version matches, or None if the infobox is not versioned.
+        """
+        if not self.is_versioned:
+            return None
+
+        current_version = None
+        for version_identifier in VERSION_IDENTIFIERS:
+            for version in range(1, self.version_counts[version_identifier] + 1):
+                if name == self.params[version_identifier + str(version)]:
+                    current_version = version
+                    break
+
+        if current_version is None:
+            current_version = 1
+        return current_version
@@ -22,16 +22,16 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import os
 import logging
 
-from deepdiff import DeepDiff
-import mwparserfromhell
-
 from osrsbox.items_api.item_definition import ItemDefinition
 from items_builder import infobox_cleaner
+from items_builder.infobox import Infobox
+from items_builder.item_diff import item_change_record
+from items_builder.wiki_template_cache import WikiTemplateCache
 
 
 class BuildItem:
     def __init__(self, item_id, item_json, wiki_text, normalized_names, buy_limits, skill_requirements, current_db,
-                 weapon_types, weapon_stances):
+                 weapon_types, weapon_stances, template_cache=None):
         # Input item ID number
         self.item_id = item_id
         # Input JSON file (from RuneLite ItemScraper plugin)
@@ -46,6 +46,11 @@ class BuildItem:
         self.weapon_types = weapon_types  # Weapon type dictionary
         self.weapon_stances = weapon_stances  # Weapon stances dictionary
 
+        # Cache of templates extracted from each wiki page, shared by every item in a build
+        if template_cache is None:
+            template_cache = WikiTemplateCache(wiki_text)
+        self.template_cache = template_cache
+
         # For this item, create dictionary for property storage
         self.item_dict = dict()
 
@@ -58,6 +63,9 @@ class BuildItem:
         # If a page does not have a wiki page, it may be given a status number
         self.status_code = None
 
+        # The change record of this item compared to the current database, None if unchanged
+        self.change_record = None
+
         self.properties = [
             "id",
             "name",
@@ -296,36 +304,24 @@ class BuildItem:
         self.template_bonuses = None
 
         try:
-            wiki_text_entry = self.wiki_text[self.item_dict["wiki_name"]]
-            wikicode = mwparserfromhell.parse(wiki_text_entry)
+            page_templates = self.template_cache[self.item_dict["wiki_name"]]
         except KeyError:
             # The wiki_name was not found in the available dumped wikitext pages
             # Return false to indicate no wikitext was extracted
             self.logger.debug("extract_infobox: KeyError for self.wikitext")
             return False
 
-        # Loop through templates in wikicode from wiki page
-        # Then call Inforbox Item processing method
-        templates = wikicode.filter_templates()
-        for template in templates:
-            template_name = template.name.strip()
-            template_name = template_name.lower()
-            if "infobox item" in template_name:
-                self.template_primary = template
-            if "infobox bonuses" in template_name:
-                self.template_bonuses = template
-            if "infobox construction" in template_name:
-                self.template_primary = template
-            if "infobox pet" in template_name:
-                self.template_primary = template
+        # The wiki page is parsed once, then the Infobox Item and Infobox Bonuses templates are reused
+        self.template_primary = page_templates.primary
+        self.template_bonuses = page_templates.bonuses if page_templates.has_bonuses else None
 
         # If no template_primary was found, return false
-        if not self.template_primary:
+        if self.template_primary is None:
             self.logger.debug("extract_infobox: not self.template_primary")
             return False
 
         # If any equipable item, and no bonuses was found, return false
-        if self.item_dict["equipable"] and not self.template_bonuses:
+        if self.item_dict["equipable"] and not page_templates.has_bonuses:
             self.logger.debug("extract_infobox: not self.template_bonuses")
             return False
 
@@ -335,136 +331,51 @@ class BuildItem:
     def parse_primary_infobox(self):
         """Parse an actual Infobox template."""
         template = self.template_primary
-        # Set defaults for versioned infoboxes
-        is_versioned = False  # has multiple versions available
-        self.current_version = None  # The version that matches the item
-        version_count = 0  # the number of versions available
-
-        # STAGE ONE: Determine if we have a versioned infobox, and the version count
-
-        version_identifiers = ["version",
-                               "name",
-                               "itemname"]
-
-        for version_identifier in version_identifiers:
-            # Check if the infobox is versioned, and get a version count
-            if version_count == 0:
-                try:
-                    template.get(version_identifier + "1").value
-                    is_versioned = True
-                    # Now, try to determine how many versions are present
-                    i = 1
-                    while i <= 20:  # Guessing max version number is 20
-                        try:
-                            template.get(version_identifier + "1").value
-                            version_count += 1
-                        except ValueError:
-                            break
-                        i += 1
-                except ValueError:
-                    pass
-
-        # STAGE TWO: Match a versioned infobox to the item name
-
-        if is_versioned:
-            # Try determine
-            for version_identifier in version_identifiers:
-                try:
-                    template.get(version_identifier + "1").value
-                    i = 1
-                    while i <= version_count:
-                        versioned_name = version_identifier + str(i)
-                        if self.item_dict["name"] == template.get(versioned_name).value.strip():
-                            self.current_version = i
-                            break
-                        i += 1
-                except ValueError:
-                    pass
 
+        # Match a versioned infobox to the item name, the version count is determined once per infobox
+        self.current_version = template.match_version(self.item_dict["name"])
+        if template.is_versioned:
             self.logger.debug("NOTE: versioned infobox: %s" % self.current_version)
 
-        if is_versioned and self.current_version is None:
-            self.current_version = 1
-
         # WEIGHT: Determine the weight of an item ()
-        weight = None
-        if self.current_version is not None:
-            key = "weight" + str(self.current_version)
-            weight = self.extract_infobox_value(template, key)
-        if weight is None:
-            weight = self.extract_infobox_value(template, "weight")
+        weight = template.lookup("weight", self.current_version)
         if weight is not None:
             self.item_dict["weight"] = infobox_cleaner.clean_weight(weight, self.item_id)
 
         # QUEST: Determine if item is associated with a quest ()
-        quest = None
-        if self.current_version is not None:
-            key = "quest" + str(self.current_version)
-            quest = self.extract_infobox_value(template, key)
-        if quest is None:
-            quest = self.extract_infobox_value(template, "quest")
+        quest = template.lookup("quest", self.current_version)
         if quest is not None:
             self.item_dict["quest_item"] = infobox_cleaner.clean_quest(quest)
 
         # Determine the release date of an item ()
-        release_date = None
-        if self.current_version is not None:
-            key = "release" + str(self.current_version)
-            release_date = self.extract_infobox_value(template, key)
-        if release_date is None:
-            release_date = self.extract_infobox_value(template, "release")
+        release_date = template.lookup("release", self.current_version)
         if release_date is not None:
             self.item_dict["release_date"] = infobox_cleaner.clean_release_date(release_date)
 
         # Determine if item has a store price ()
-        store_price = None
-        if self.current_version is not None:
-            key = "store" + str(self.current_version)
-            store_price = self.extract_infobox_value(template, key)
-        if store_price is None:
-            store_price = self.extract_infobox_value(template, "store")
+        store_price = template.lookup("store", self.current_version)
         if store_price is not None:
             self.item_dict["store_price"] = infobox_cleaner.clean_store_price(store_price)
 
         # Determine if item has a store price ()
-        seller = None
-        if self.current_version is not None:
-            key = "seller" + str(self.current_version)
-            seller = self.extract_infobox_value(template, key)
-        if seller is None:
-            seller = self.extract_infobox_value(template, "seller")
+        seller = template.lookup("seller", self.current_version)
         if seller is not None:
             self.item_dict["seller"] = infobox_cleaner.clean_seller(seller)
 
         # Determine the examine text of an item ()
-        tradeable = None
-        if self.current_version is not None:
-            key = "tradeable" + str(self.current_version)
-            tradeable = self.extract_infobox_value(template, key)
-        if tradeable is None:
-            tradeable = self.extract_infobox_value(template, "tradeable")
+        tradeable = template.lookup("tradeable", self.current_version)
         if tradeable is not None:
             self.item_dict["tradeable"] = infobox_cleaner.clean_tradeable(tradeable)
         else:
             self.item_dict["tradeable"] = False
 
         # Determine the examine text of an item ()
-        examine = None
-        if self.current_version is not None:
-            key = "examine" + str(self.current_version)
-            examine = self.extract_infobox_value(template, key)
+        examine = template.lookup("examine", self.current_version)
         if examine is None:
-            examine = self.extract_infobox_value(template, "examine")
+            # Being here means the extraction for "examine" failed
+            examine = template.lookup("itemexamine", self.current_version)
         if examine is not None:
             self.item_dict["examine"] = infobox_cleaner.clean_examine(examine, self.item_dict["name"])
-        else:
-            # Being here means the extraction for "examine" failed
-            key = "itemexamine" + str(self.current_version)
-            examine = self.extract_infobox_value(template, key)
-            if examine is None:
-                examine = self.extract_infobox_value(template, "itemexamine")
-            if examine is not None:
-                self.item_dict["examine"] = infobox_cleaner.clean_examine(examine, self.item_dict["name"])
 
         # Determine if item has a buy limit ()
         if not self.item_dict["tradeable"]:
@@ -479,47 +390,25 @@ class BuildItem:
 
         return True
 
-    def extract_infobox_value(self, template: mwparserfromhell.nodes.template.Template, key: str) -> str:
-        """Helper method to extract a value from a template using a specified key.
-
-        This helper method is a simple solution to repeatedly try to fetch a specific
-        entry from a wiki text template (a mwparserfromhell template object).
-
-        :param template: A mediawiki wiki text template.
-        :param key: The key to query in the template.
-        :return value: The extracted template value based on supplied key.
-        """
-        value = None
-        try:
-            value = template.get(key).value
-            value = value.strip()
-            return value
-        except ValueError:
-            return value
-
     def extract_bonuses(self) -> bool:
         """Extract the infobox bonuses template from raw wikitext.
 
         :return: If the infobox bonuses template was extracted successfully or not.
         """
-        # Extract Infobox Bonuses from wikitext
+        # Extract Infobox Bonuses from the parsed wiki page
         try:
-            wikicode = mwparserfromhell.parse(self.wiki_text[self.item_dict["wiki_name"]])
+            template = self.template_cache[self.item_dict["wiki_name"]].bonuses
         except KeyError:
             return False
-        templates = wikicode.filter_templates()
-        for template in templates:
-            if "infobox bonuses" in template.lower():
-                extracted_infobox = self.parse_bonuses(template)
-                if extracted_infobox:
-                    return True
+        if template is None:
+            return False
 
-        return False
+        return self.parse_bonuses(template)
 
-    def parse_bonuses(self, template: mwparserfromhell.nodes.template.Template) -> bool:
+    def parse_bonuses(self, template: Infobox) -> bool:
         """Parse the wiki text template and extract item bonus values from it.
 
-        :param template: A mediawiki wiki text template.
+        :param template: A precompiled mediawiki wiki text infobox.
         """
         self.item_dict["equipment"]["attack_stab"] = self.clean_bonuses_value(template, "astab")
         self.item_dict["equipment"]["attack_slash"] = self.clean_bonuses_value(template, "aslash")
@@ -538,13 +427,11 @@ class BuildItem:
 
         # Determine the slot for the equipable item
         self.item_dict["equipment"]["slot"] = None
-        try:
-            self.item_dict["equipment"]["slot"] = self.strip_infobox(template.get("slot").value)
-            self.item_dict["equipment"]["slot"] = self.item_dict["equipment"]["slot"].lower()
-        except ValueError:
-            self.item_dict["equipment"]["slot"] = None
+        slot = template.get("slot")
+        if slot is None:
             self.logger.critical("Could not determine equipable item slot")
             quit()
+        self.item_dict["equipment"]["slot"] = self.strip_infobox(slot).lower()
 
         # Determine the skill requirements for the equipable item
         self.item_dict["equipment"]["requirements"] = None
@@ -564,8 +451,10 @@ class BuildItem:
             self.item_dict["weapon"] = dict()
 
             # Try set the attack speed of the weapon
+            # A missing attack speed is handled the same as an invalid attack speed
+            attack_speed = template.get("aspeed") or ""
             try:
-                self.item_dict["weapon"]["attack_speed"] = int(self.strip_infobox(template.get("aspeed").value))
+                self.item_dict["weapon"]["attack_speed"] = int(self.strip_infobox(attack_speed))
             except ValueError:
                 self.item_dict["weapon"]["attack_speed"] = None
                 self.logger.critical("WEAPON: Could not determine weapon attack speed")
@@ -601,23 +490,15 @@ class BuildItem:
 
         return True
 
-    def clean_bonuses_value(self, template: mwparserfromhell.nodes.template.Template, prop: str):
+    def clean_bonuses_value(self, template: Infobox, prop: str):
         """Clean a item bonuses value extracted from a wiki template.
 
-        :param template: A mediawiki wiki text template.
+        :param template: A precompiled mediawiki wiki text infobox.
         :param prop: The key to query in the template.
         :return value: The extracted template value that has been int cast.
         """
-        value = None
-
-        # Try and get the versioned infobox value
-        if self.current_version is not None:
-            key = prop + str(self.current_version)
-            value = self.extract_infobox_value(template, key)
-
-        # If unsuccessful, try and get the normal infoxbox value
-        if value is None:
-            value = self.extract_infobox_value(template, prop)
+        # Get the versioned infobox value, or the normal infobox value
+        value = template.lookup(prop, self.current_version)
 
         if value is not None:
             value = self.strip_infobox(value)
@@ -649,28 +530,17 @@ class BuildItem:
         return clean_value
 
     def compare_json_files(self, item_definition: ItemDefinition) -> bool:
-        """Print the difference between this item object, and the item that exists in the database.
+        """Determine the difference between this item object, and the item that exists in the database.
+
+        The change record is saved in `change_record`, to be added to the build changelog.
 
         :return changed: A boolean if the item is different, or not.
         """
-        changed = False
-
         # Create JSON out object to compare
         current_json = item_definition.construct_json()
 
-        # Try get existing entry (KeyError means it doesn't exist - aka a new item)
-        try:
-            existing_json = self.current_db[self.item_id]
-        except KeyError:
-            print(f">>> compare_json_files: NEW ITEM: {item_definition.id}")
-            print(current_json)
-            return changed
-
-        if current_json == existing_json:
-            return changed
-
-        ddiff = DeepDiff(existing_json, current_json, ignore_order=True)
-        print(f">>> compare_json_files: CHANGED ITEM: {item_definition.id}: {item_definition.name}")
-        print(f"    {ddiff}")
-        changed = True
-        return changed
+        # Try get existing entry (None means it doesn't exist - aka a new item)
+        existing_json = self.current_db.get(self.item_id)
+
+        self.change_record = item_change_record(existing_json, current_json)
+        return self.change_record is not None and self.change_record["status"] == "changed"
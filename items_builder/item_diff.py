@@ -0,0 +1,198 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+from dataclasses import fields
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Union
+from typing import Optional
+
+from osrsbox.items_api.item_definition import ItemDefinition
+from osrsbox.items_api.item_equipment import ItemEquipment
+from osrsbox.items_api.item_weapon import ItemWeapon
+
+# The scalar properties of each item schema object, compared directly
+ITEM_SCALAR_FIELDS = [field.name for field in fields(ItemDefinition) if field.name not in ("equipment", "weapon")]
+EQUIPMENT_SCALAR_FIELDS = [field.name for field in fields(ItemEquipment) if field.name != "requirements"]
+WEAPON_SCALAR_FIELDS = [field.name for field in fields(ItemWeapon) if field.name != "stances"]
+
+# The stance property that identifies a weapon stance, so stances are compared independent of order
+STANCE_KEY = "combat_style"
+
+
+def _change(changes: List[Dict], path: str, old: Any, new: Any) -> None:
+    """Append a change record, when a value has changed.
+
+    :param changes: The list of change records.
+    :param path: The property path, for example `equipment.attack_slash`.
+    :param old: The value in the existing item.
+    :param new: The value in the built item.
+    """
+    if old != new:
+        changes.append({"path": path, "old": old, "new": new})
+
+
+def _diff_scalars(changes: List[Dict], prefix: str, property_names: List[str], old: Dict, new: Dict) -> None:
+    """Compare the scalar properties of an item schema object."""
+    for property_name in property_names:
+        _change(changes, prefix + property_name, old.get(property_name), new.get(property_name))
+
+
+def diff_requirements(changes: List[Dict], old: Optional[Dict], new: Optional[Dict]) -> None:
+    """Compare the skill requirements of an item, by skill.
+
+    :param changes: The list of change records.
+    :param old: The existing skill requirements dictionary, or None.
+    :param new: The built skill requirements dictionary, or None.
+    """
+    if old is None or new is None:
+        _change(changes, "equipment.requirements", old, new)
+        return
+    for skill in sorted(set(old) | set(new)):
+        _change(changes, f"equipment.requirements.{skill}", old.get(skill), new.get(skill))
+
+
+def diff_stances(changes: List[Dict], old: Optional[List[Dict]], new: Optional[List[Dict]]) -> None:
+    """Compare the stances of a weapon, matching stances by combat style so the order is ignored.
+
+    :param changes: The list of change records.
+    :param old: The existing list of stance dictionaries, or None.
+    :param new: The built list of stance dictionaries, or None.
+    """
+    if old is None or new is None:
+        _change(changes, "weapon.stances", old, new)
+        return
+
+    old_stances = {stance.get(STANCE_KEY): stance for stance in old}
+    new_stances = {stance.get(STANCE_KEY): stance for stance in new}
+    if len(old_stances) != len(old) or len(new_stances) != len(new):
+        # Combat styles are not unique, so compare the stances as unordered lists
+        _change(changes, "weapon.stances", sorted(old, key=_stance_sort_key), sorted(new, key=_stance_sort_key))
+        return
+
+    for combat_style in sorted(old_stances.keys() | new_stances.keys(), key=str):
+        old_stance = old_stances.get(combat_style)
+        new_stance = new_stances.get(combat_style)
+        path = f"weapon.stances[{combat_style}]"
+        if old_stance is None or new_stance is None:
+            _change(changes, path, old_stance, new_stance)
+            continue
+        for property_name in sorted(old_stance.keys() | new_stance.keys()):
+            _change(changes, f"{path}.{property_name}", old_stance.get(property_name), new_stance.get(property_name))
+
+
+def _stance_sort_key(stance: Dict) -> str:
+    """Sort stances by their canonical JSON, for an order independent comparison."""
+    return json.dumps(stance, sort_keys=True)
+
+
+def diff_items(old: Dict, new: Dict) -> List[Dict]:
+    """Compare two item JSON dictionaries, using the item schema.
+
+    Scalar properties are compared directly, and the equipment requirements and
+    weapon stances are compared structurally. Each change is a record of the
+    property path, and the old and new value, for example:
+    `{"path": "equipment.requirements.attack", "old": 60, "new": 70}`.
+
+    :param old: The existing item JSON dictionary.
+    :param new: The built item JSON dictionary.
+    :return: A list of change records, empty if the items are the same.
+    """
+    changes = list()
+    _diff_scalars(changes, "", ITEM_SCALAR_FIELDS, old, new)
+
+    old_equipment, new_equipment = old.get("equipment"), new.get("equipment")
+    if old_equipment is None or new_equipment is None:
+        _change(changes, "equipment", old_equipment, new_equipment)
+    else:
+        _diff_scalars(changes, "equipment.", EQUIPMENT_SCALAR_FIELDS, old_equipment, new_equipment)
+        diff_requirements(changes, old_equipment.get("requirements"), new_equipment.get("requirements"))
+
+    old_weapon, new_weapon = old.get("weapon"), new.get("weapon")
+    if old_weapon is None or new_weapon is None:
+        _change(changes, "weapon", old_weapon, new_weapon)
+    else:
+        _diff_scalars(changes, "weapon.", WEAPON_SCALAR_FIELDS, old_weapon, new_weapon)
+        diff_stances(changes, old_weapon.get("stances"), new_weapon.get("stances"))
+
+    return changes
+
+
+class ItemChangelog:
+    """The new and changed items of a build, saved as a single changelog JSON file.
+
+    Each entry is a compact change record of an item:
+    `{"id": 4151, "name": "Abyssal whip", "status": "changed", "changes": [...]}`,
+    where a new item has no changes.
+    """
+    def __init__(self):
+        self.entries: List[Dict] = list()
+
+    def __len__(self) -> int:
+        """Return the number of new and changed items."""
+        return len(self.entries)
+
+    def add(self, entry: Optional[Dict]) -> None:
+        """Add the change record of an item, from `item_change_record`.
+
+        :param entry: The item change record, or None for an unchanged item.
+        """
+        if entry is not None:
+            self.entries.append(entry)
+
+    def count(self, status: str) -> int:
+        """Return the number of items with a status, new or changed."""
+        return sum(1 for entry in self.entries if entry["status"] == status)
+
+    def save(self, path_to_changelog: Union[Path, str], last_build: Optional[str] = None) -> None:
+        """Write the changelog JSON file.
+
+        :param path_to_changelog: The path to the changelog JSON file.
+        :param last_build: The build timestamp (ISO 8601 format).
+        """
+        changelog = {
+            "build": last_build,
+            "new": self.count("new"),
+            "changed": self.count("changed"),
+            "items": self.entries
+        }
+        with open(path_to_changelog, "w") as f:
+            json.dump(changelog, f, indent=4)
+
+
+def item_change_record(old: Optional[Dict], new: Dict) -> Optional[Dict]:
+    """Return the change record of a built item, compared to the existing item.
+
+    :param old: The existing item JSON dictionary, or None for a new item.
+    :param new: The built item JSON dictionary.
+    :return: The item change record, or None if the item is unchanged.
+    """
+    if old is None:
+        return {"id": new["id"], "name": new["name"], "status": "new", "changes": []}
+    if old == new:
+        return None
+    changes = diff_items(old, new)
+    if not changes:
+        return None
+    return {"id": new["id"], "name": new["name"], "status": "changed", "changes": changes}
@@ -0,0 +1,109 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict
+from typing import Optional
+
+import mwparserfromhell
+
+from items_builder.infobox import Infobox
+
+
+@dataclass
+class WikiPageTemplates:
+    """The item templates extracted from a single OSRS Wiki page, as precompiled infoboxes."""
+    primary: Optional[Infobox]  # The infobox item, construction or pet template
+    bonuses: Optional[Infobox]  # The infobox bonuses template
+    has_bonuses: bool  # If any template is named infobox bonuses
+
+
+def extract_page_templates(wiki_text_entry: str) -> WikiPageTemplates:
+    """Parse the wiki text of a page, and extract the item templates.
+
+    :param wiki_text_entry: The raw wiki text of a page.
+    :return: The extracted item templates.
+    """
+    primary = None
+    bonuses = None
+    has_bonuses = False
+
+    wikicode = mwparserfromhell.parse(wiki_text_entry)
+    for template in wikicode.filter_templates():
+        template_name = template.name.strip()
+        template_name = template_name.lower()
+        if "infobox item" in template_name:
+            primary = template
+        if "infobox bonuses" in template_name:
+            has_bonuses = True
+        if "infobox construction" in template_name:
+            primary = template
+        if "infobox pet" in template_name:
+            primary = template
+        # The first template that mentions infobox bonuses has the item bonuses
+        if bonuses is None and "infobox bonuses" in template.lower():
+            bonuses = template
+
+    return WikiPageTemplates(primary=Infobox.from_template(primary) if primary is not None else None,
+                             bonuses=Infobox.from_template(bonuses) if bonuses is not None else None,
+                             has_bonuses=has_bonuses)
+
+
+class WikiTemplateCache:
+    """A build-scoped cache of the item templates extracted from each OSRS Wiki page.
+
+    Many item IDs (noted, placeholder and versioned items) share a wiki page, so each
+    page is parsed once and the extracted templates are reused. The least recently
+    used pages are evicted when the cache is full.
+
+    :param wiki_text: A dictionary of wiki page name to raw wiki text.
+    :param max_size: The maximum number of pages to cache.
+    """
+    def __init__(self, wiki_text: Dict[str, str], max_size: int = 2048):
+        self.wiki_text = wiki_text
+        self.max_size = max_size
+        self.pages: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __getitem__(self, page_name: str) -> WikiPageTemplates:
+        """Return the item templates for a wiki page, parsing the page on first access.
+
+        :param page_name: The wiki page name.
+        :return: The extracted item templates.
+        :raises KeyError: The page is not in the wiki text.
+        """
+        try:
+            page = self.pages[page_name]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            self.pages.move_to_end(page_name)
+            return page
+
+        page = extract_page_templates(self.wiki_text[page_name])
+        self.misses += 1
+        self.pages[page_name] = page
+        if len(self.pages) > self.max_size:
+            self.pages.popitem(last=False)
+        return page
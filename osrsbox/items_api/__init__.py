@@ -20,11 +20,33 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from osrsbox.items_api import all_items
+from osrsbox.items_api import shared_items
 
 
-def load() -> all_items.AllItems:
+def load(lazy: bool = False, path: str = None) -> all_items.AllItems:
     """Load the osrsbox item database.
 
+    :param lazy: Toggles decoding items on first access, instead of on load.
+    :param path: The item database file or directory, by default the `OSRSBOX_ITEMS_PATH`
+        environment variable, or the `items-complete.json` file included in the package.
     :return all_db_items: An AllItems object containing the entire item database.
     """
-    return all_items.AllItems()
+    return all_items.AllItems(path, lazy=lazy)
+
+
+def share(all_db_items: all_items.AllItems) -> shared_items.SharedItems:
+    """Publish an item database in shared memory, for other processes to attach.
+
+    :param all_db_items: The item database to publish, for example from `load()`.
+    :return shared: A SharedItems object, with the snapshot `path` and a shared `items` view.
+    """
+    return shared_items.SharedItems(all_db_items)
+
+
+def attach(path_to_snapshot_file: str) -> all_items.AllItems:
+    """Attach to an item database published by another process.
+
+    :param path_to_snapshot_file: The path to the published snapshot file.
+    :return all_db_items: An AllItems object, sharing the item data with other processes.
+    """
+    return shared_items.attach(path_to_snapshot_file)
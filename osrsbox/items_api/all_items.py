@@ -19,35 +19,102 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
 
+import os
 import json
 from pathlib import Path
+from typing import Any
 from typing import Dict
 from typing import List
+from typing import Tuple
 from typing import Union
+from typing import Optional
 from typing import Generator
 
 from osrsbox.items_api.item_definition import ItemDefinition
+from osrsbox.items_api.item_interner import ItemInterner
+from osrsbox.items_api import offset_index
+from osrsbox.items_api.offset_index import JsonFileOffsetIndex
+from osrsbox.items_api.offset_index import JsonDirectoryOffsetIndex
+from osrsbox.items_api import item_snapshot
+from osrsbox.items_api.item_snapshot import SnapshotReader
+from osrsbox.items_api.equipment_table import EquipmentTable
+from osrsbox.items_api.item_query import ItemQuery
 
-PATH_TO_ITEMS_COMPLETE_JSON = Path(__file__).absolute().parent / ".." / ".." / "docs" / "items-complete.json"
-if not PATH_TO_ITEMS_COMPLETE_JSON.is_file():
-    PATH_TO_ITEMS_COMPLETE_JSON = Path(__file__).absolute().parent / ".." / "docs" / "items-complete.json"
-    if not PATH_TO_ITEMS_COMPLETE_JSON.is_file():
-        raise ValueError("Error: Default item database file not found. Exiting")
+# The environment variable to override the default item database location
+ITEMS_PATH_ENVIRONMENT_VARIABLE = "OSRSBOX_ITEMS_PATH"
+
+# The default item database locations, in the repository then the installed package
+DEFAULT_ITEMS_COMPLETE_PATHS = (
+    Path(__file__).absolute().parent / ".." / ".." / "docs" / "items-complete.json",
+    Path(__file__).absolute().parent / ".." / "docs" / "items-complete.json"
+)
+
+# Item properties with a secondary index, built on first use
+INDEXED_FIELDS = (
+    "name",
+    "slot",
+    "members",
+    "tradeable_on_ge",
+    "linked_id"
+)
+
+
+def resolve_items_path(input_data_file_or_directory: Optional[Union[Path, str]] = None) -> Path:
+    """Determine the location of the item database, when it is loaded (not when the package is imported).
+
+    The location is the supplied path, the `OSRSBOX_ITEMS_PATH` environment variable,
+    or the first default `items-complete.json` file that exists.
+
+    :param input_data_file_or_directory: The item database JSON file, directory of JSON files or snapshot file, or None.
+    :return: The path to the item database.
+    :raises ValueError: No path was supplied, and the default item database file was not found.
+    """
+    if input_data_file_or_directory is not None:
+        return Path(input_data_file_or_directory)
+
+    environment_path = os.environ.get(ITEMS_PATH_ENVIRONMENT_VARIABLE)
+    if environment_path:
+        return Path(environment_path)
+
+    for path_to_items_complete_json in DEFAULT_ITEMS_COMPLETE_PATHS:
+        if path_to_items_complete_json.is_file():
+            return path_to_items_complete_json
+    raise ValueError("Error: Default item database file not found. Exiting")
 
 
 class AllItems:
     """This class handles loading of the osrsbox-db items database.
 
-    :param input_data_file_or_directory: The osrsbox-db items folder of JSON files, or single JSON file.
+    By default every item is loaded when the object is created. In lazy mode only
+    an index of item ID numbers is built, and each item is decoded the first time
+    it is accessed. A binary snapshot file (see :mod:`item_snapshot`) is always
+    memory-mapped, so processes loading the same snapshot share its pages.
+
+    :param input_data_file_or_directory: The osrsbox-db items folder of JSON files, single JSON file or snapshot file,
+        by default see :func:`resolve_items_path`.
+    :param lazy: Toggles decoding items on first access, instead of on load.
+    :param intern: Toggles sharing repeated (read-only) values between items, see :class:`ItemInterner`.
     """
-    def __init__(self, input_data_file_or_directory: Path = PATH_TO_ITEMS_COMPLETE_JSON):
-        self.all_items: List[ItemDefinition] = list()
+    def __init__(self, input_data_file_or_directory: Optional[Union[Path, str]] = None, lazy: bool = False,
+                 intern: bool = False):
+        self.lazy = lazy
+        self.intern = intern
+        self.interner: Optional[ItemInterner] = ItemInterner() if intern else None
+        self._all_items: List[ItemDefinition] = list()
         self.all_items_dict: Dict[int, ItemDefinition] = dict()
-        self.load_all_items(input_data_file_or_directory)
+        self.item_index: Optional[Union[JsonFileOffsetIndex, JsonDirectoryOffsetIndex, SnapshotReader]] = None
+        self._equipment_table: Optional[EquipmentTable] = None
+        self._indexes: Dict[str, Dict[Any, Tuple[int, ...]]] = dict()
+        self.load_all_items(resolve_items_path(input_data_file_or_directory))
 
     def __iter__(self) -> Generator[ItemDefinition, None, None]:
         """Iterate (loop) over each ItemDefinition object."""
-        for item in self.all_items:
+        if self.item_index is not None:
+            for id_number in self.item_index:
+                yield self[id_number]
+            return
+
+        for item in self._all_items:
             yield item
 
     def __getitem__(self, id_number: int) -> ItemDefinition:
@@ -56,17 +123,194 @@ class AllItems:
         :param id_number: The item ID number.
         :return: The item definition object linked to a specific ID number.
         """
-        return self.all_items_dict[id_number]
+        try:
+            return self.all_items_dict[id_number]
+        except KeyError:
+            if self.item_index is None:
+                raise
+
+        return self._load_item(self.item_index.read(id_number))
 
     def __len__(self) -> int:
         """Return the count of the total number of items.
 
         :return: The total number of items.
         """
-        return len(self.all_items)
+        if self.item_index is not None:
+            return len(self.item_index)
+        return len(self._all_items)
+
+    def __reduce_ex__(self, protocol):
+        """Pickle an item database loaded from a snapshot file as the path to the snapshot file.
+
+        The unpickled item database maps the same snapshot file in lazy mode, with the
+        same interning, so sending it to a worker process does not pickle any items, and
+        every process shares the snapshot pages. Other item databases are pickled as a
+        copy of every item.
+        """
+        if isinstance(self.item_index, SnapshotReader) and self.item_index.path_to_snapshot_file is not None:
+            return AllItems, (self.item_index.path_to_snapshot_file, True, self.intern)
+        return super().__reduce_ex__(protocol)
+
+    @property
+    def all_items(self) -> List[ItemDefinition]:
+        """Return a list of every ItemDefinition object, sorted by item ID number.
+
+        In lazy mode, this decodes every item that has not been accessed yet.
+        """
+        if self.item_index is not None:
+            return list(self)
+        return self._all_items
+
+    def id_numbers(self) -> List[int]:
+        """Return the item ID number of every item, without decoding any items.
+
+        :return: A sorted list of item ID numbers.
+        """
+        if self.item_index is not None:
+            return list(self.item_index)
+        return [item.id for item in self._all_items]
+
+    def iter_json(self) -> Generator[Tuple[int, str], None, None]:
+        """Serialize every item to a JSON string, in item ID order.
+
+        :return: Tuples of (item ID number, item JSON string).
+        """
+        for item in self:
+            yield item.id, item.to_json()
+
+    def to_json_bytes(self) -> bytes:
+        """Serialize the item database to the bytes of an `items-complete.json` file.
+
+        :return: The JSON object of item ID to item JSON, identical to `json.dumps` of every `construct_json`.
+        """
+        return ("{" + ", ".join(f"\"{id_number}\": {item_json}" for id_number, item_json in self.iter_json()) + "}").encode("utf-8")
+
+    def write_items_complete(self, path_to_json_file: Union[Path, str]) -> None:
+        """Stream the item database to an `items-complete.json` file, with the offset index for lazy loading.
+
+        :param path_to_json_file: The file name for the `items-complete.json` file.
+        """
+        offset_index.write_items_complete(self.iter_json(), path_to_json_file)
+
+    def query(self) -> ItemQuery:
+        """Return a query over every item, see :class:`ItemQuery`.
+
+        For example: `items.query().where(slot="weapon", members=False).order_by("attack_slash").limit(10)`
+
+        :return: An ItemQuery that matches every item.
+        """
+        return ItemQuery(self)
+
+    def equipment_table(self) -> EquipmentTable:
+        """Return the columnar table of equipment stats for every equipable item.
+
+        The table is built on first use, then cached. When loaded from a snapshot, the
+        table is built from the snapshot columns without decoding any items.
+
+        :return: An EquipmentTable with typed arrays of item ID numbers, bonuses, slots and attack speeds.
+        """
+        if self._equipment_table is None:
+            if isinstance(self.item_index, SnapshotReader):
+                self._equipment_table = EquipmentTable.from_snapshot(self.item_index)
+            else:
+                self._equipment_table = EquipmentTable.from_items(self)
+        return self._equipment_table
+
+    def index(self, field: str) -> Dict[Any, Tuple[int, ...]]:
+        """Return the secondary index for an item property.
+
+        Each index maps a property value to a sorted tuple of the item ID numbers with
+        that value. Items with a `None` value are not indexed. The `name` index uses
+        lowercase names, and the `slot` index only has items equipable by a player.
+        Indexes are built on first use, then cached.
+
+        :param field: The item property, one of `INDEXED_FIELDS`.
+        :return: A dictionary of property value to item ID numbers.
+        :raises ValueError: The item property is not indexed.
+        """
+        try:
+            return self._indexes[field]
+        except KeyError:
+            if field not in INDEXED_FIELDS:
+                raise ValueError(f"Error: No index for item property: {field}. Exiting.")
+
+        index = dict()
+        for id_number, value in self._field_values(field):
+            if value is None:
+                continue
+            if field == "name":
+                value = value.lower()
+            index.setdefault(value, list()).append(id_number)
+
+        self._indexes[field] = {value: tuple(sorted(id_numbers)) for value, id_numbers in index.items()}
+        return self._indexes[field]
+
+    def ids_by_name(self, name: str) -> Tuple[int, ...]:
+        """Return the item ID numbers of all items with a name (case-insensitive).
+
+        :param name: The item name.
+        :return: A sorted tuple of item ID numbers.
+        """
+        return self.index("name").get(name.lower(), ())
+
+    def ids_by_slot(self, slot: str) -> Tuple[int, ...]:
+        """Return the item ID numbers of all items equipable by a player in a slot.
+
+        :param slot: The equipment slot, for example `head`.
+        :return: A sorted tuple of item ID numbers.
+        """
+        return self.index("slot").get(slot, ())
+
+    def ids_by_members(self, members: bool) -> Tuple[int, ...]:
+        """Return the item ID numbers of all members (True), or free-to-play (False), items.
+
+        :param members: The members property value.
+        :return: A sorted tuple of item ID numbers.
+        """
+        return self.index("members").get(members, ())
+
+    def ids_by_tradeable_on_ge(self, tradeable_on_ge: bool) -> Tuple[int, ...]:
+        """Return the item ID numbers of all items that are, or are not, tradeable on the GE.
+
+        :param tradeable_on_ge: The tradeable_on_ge property value.
+        :return: A sorted tuple of item ID numbers.
+        """
+        return self.index("tradeable_on_ge").get(tradeable_on_ge, ())
+
+    def ids_by_linked_id(self, linked_id: int) -> Tuple[int, ...]:
+        """Return the item ID numbers of all items linked to an item ID (noted/unnoted).
+
+        :param linked_id: The linked item ID number.
+        :return: A sorted tuple of item ID numbers.
+        """
+        return self.index("linked_id").get(linked_id, ())
+
+    def _field_values(self, field: str) -> Generator[Tuple[int, Any], None, None]:
+        """Yield the value of an item property for every item.
+
+        :param field: The item property.
+        :return: Tuples of (item ID number, value).
+        """
+        # Snapshot columns are read directly, without decoding any items
+        if isinstance(self.item_index, SnapshotReader):
+            values = self.item_index.field_values(field)
+            if field == "slot":
+                equipable = self.item_index.field_values("equipable_by_player")
+                values = ((id_number, slot if is_equipable else None)
+                          for (id_number, slot), (_, is_equipable) in zip(values, equipable))
+            yield from values
+            return
+
+        for item in self:
+            if field == "slot":
+                if item.equipable_by_player and item.equipment is not None:
+                    yield item.id, item.equipment.slot
+                continue
+            yield item.id, getattr(item, field)
 
     def load_all_items(self, input_data_file_or_directory: Union[Path, str]) -> None:
-        """Load the items database via a JSON file, or directory of JSON files.
+        """Load the items database via a JSON file, directory of JSON files, or snapshot file.
 
         :param input_data_file_or_directory: The path to the data input.
         :raises ValueError: Valid input not found.
@@ -75,6 +319,24 @@ class AllItems:
         if isinstance(input_data_file_or_directory, str):
             input_data_file_or_directory = Path(input_data_file_or_directory)
 
+        # Snapshot files are indexed and memory-mapped, then decoded now or on first access
+        if input_data_file_or_directory.is_file() and item_snapshot.is_snapshot_file(input_data_file_or_directory):
+            self.item_index = SnapshotReader(input_data_file_or_directory)
+            if not self.lazy:
+                for id_number in self.item_index:
+                    self[id_number]
+            return
+
+        # In lazy mode, only index the directory of JSON, or single JSON file
+        if self.lazy:
+            if input_data_file_or_directory.is_dir():
+                self.item_index = JsonDirectoryOffsetIndex(input_data_file_or_directory)
+            elif input_data_file_or_directory.is_file():
+                self.item_index = JsonFileOffsetIndex(input_data_file_or_directory)
+            else:
+                raise ValueError("Error: Valid input not found. Exiting.")
+            return
+
         # Process the directory of JSON, or a single JSON file
         if input_data_file_or_directory.is_dir():
             self._load_items_from_directory(path_to_directory=input_data_file_or_directory)
@@ -84,7 +346,7 @@ class AllItems:
             raise ValueError("Error: Valid input not found. Exiting.")
 
         # Sort the list of items
-        self.all_items.sort(key=lambda x: x.id)
+        self._all_items.sort(key=lambda x: x.id)
 
     def _load_items_from_directory(self, path_to_directory: Path) -> None:
         """Load item database from a directory of JSON files (`items-json`).
@@ -118,10 +380,11 @@ class AllItems:
         for entry in temp:
             self._load_item(temp[entry])
 
-    def _load_item(self, item_json: Dict) -> None:
+    def _load_item(self, item_json: Dict) -> ItemDefinition:
         """Convert the `item_json` into a :class:`ItemDefinition` and store it.
 
         :param item_json: A dict from an open and loaded JSON file.
+        :return item_def: The populated item definition object.
         :raises ValueError: Cannot populate item.
         """
         # Load the item using the ItemDefinition class
@@ -130,6 +393,12 @@ class AllItems:
         except TypeError as e:
             raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting") from e
 
-        # Add item to list
-        self.all_items.append(item_def)
+        # Share the values repeated across items
+        if self.interner is not None:
+            self.interner.intern(item_def)
+
+        # Add item to list, in lazy mode the list is built from the index instead
+        if self.item_index is None:
+            self._all_items.append(item_def)
         self.all_items_dict[item_def.id] = item_def
+        return item_def
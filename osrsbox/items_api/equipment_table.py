@@ -0,0 +1,288 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import array
+import heapq
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Iterable
+from typing import Optional
+
+from osrsbox.items_api import item_snapshot
+from osrsbox.items_api.item_definition import ItemDefinition
+
+# NumPy is imported on first use by `load_numpy`, so importing the package does not import it
+_NOT_IMPORTED = object()
+numpy = _NOT_IMPORTED
+
+
+def load_numpy():
+    """Import NumPy the first time it is needed.
+
+    :return: The numpy module, or None if NumPy is not installed.
+    """
+    global numpy
+    if numpy is _NOT_IMPORTED:
+        try:
+            import numpy as numpy_module
+        except ImportError:
+            numpy_module = None
+        numpy = numpy_module
+    return numpy
+
+
+STAT_COLUMNS = [
+    "attack_stab",
+    "attack_slash",
+    "attack_crush",
+    "attack_magic",
+    "attack_ranged",
+    "defence_stab",
+    "defence_slash",
+    "defence_crush",
+    "defence_magic",
+    "defence_ranged",
+    "melee_strength",
+    "ranged_strength",
+    "magic_damage",
+    "prayer",
+    "attack_speed"
+]
+
+# The attack_speed value used for equipment that is not a weapon
+NO_ATTACK_SPEED = -1
+
+# The value used for a missing (None) equipment bonus
+NO_BONUS = 0
+
+
+def stat_value(name: str, value: Optional[int]) -> int:
+    """Return the column value of a stat, replacing a missing (None) stat.
+
+    :param name: The stat name.
+    :param value: The stat value, or None.
+    :return: The value, NO_ATTACK_SPEED for a missing attack speed, or NO_BONUS for a missing bonus.
+    """
+    if value is None:
+        return NO_ATTACK_SPEED if name == "attack_speed" else NO_BONUS
+    return value
+
+
+class EquipmentTable:
+    """A columnar (struct-of-arrays) store of equipment stats for every equipable item.
+
+    Each equipment bonus, the slot and the weapon attack speed are stored in a
+    contiguous typed array, aligned with the `ids` array of item ID numbers. The
+    arrays are NumPy arrays when NumPy is installed, otherwise `array.array` objects.
+    Slots are stored as codes in the `slot_codes` array, that index the `slots` list.
+
+    :param ids: The item ID number of each row.
+    :param columns: A dictionary of stat name to an integer value for each row.
+    :param slot_codes: The slot code of each row.
+    :param slots: The slot names, indexed by slot code.
+    """
+    def __init__(self, ids: array.array, columns: Dict[str, array.array], slot_codes: array.array, slots: List[str]):
+        self.slots = slots
+        self.ids = self._as_array(ids)
+        self.slot_codes = self._as_array(slot_codes)
+        self.columns = {name: self._as_array(columns[name]) for name in STAT_COLUMNS}
+        self._rows_by_id: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        """Return the number of equipable items in the table."""
+        return len(self.ids)
+
+    def __getitem__(self, stat: str):
+        """Return the typed array for a stat column.
+
+        :param stat: The stat name, for example `attack_slash`.
+        :return: The column of values, aligned with the `ids` array.
+        """
+        return self.columns[stat]
+
+    @classmethod
+    def from_items(cls, items: Iterable[ItemDefinition]) -> "EquipmentTable":
+        """Build the table from ItemDefinition objects.
+
+        :param items: An iterable of ItemDefinition objects.
+        :return: An EquipmentTable containing every item equipable by a player.
+        """
+        ids = array.array("i")
+        columns = {name: array.array("i") for name in STAT_COLUMNS}
+        slot_codes = array.array("B")
+        slots: Dict[str, int] = dict()
+
+        for item in items:
+            if not item.equipable_by_player or item.equipment is None:
+                continue
+            ids.append(item.id)
+            for name in STAT_COLUMNS[:-1]:
+                columns[name].append(stat_value(name, getattr(item.equipment, name)))
+            attack_speed = item.weapon.attack_speed if item.weapon is not None else None
+            columns["attack_speed"].append(stat_value("attack_speed", attack_speed))
+            slot_codes.append(slots.setdefault(item.equipment.slot, len(slots)))
+
+        return cls(ids, columns, slot_codes, list(slots))
+
+    @classmethod
+    def from_snapshot(cls, snapshot: item_snapshot.SnapshotReader) -> "EquipmentTable":
+        """Build the table directly from the columns of a snapshot, without decoding any items.
+
+        :param snapshot: An open snapshot.
+        :return: An EquipmentTable containing every item equipable by a player.
+        """
+        required_flags = item_snapshot.FLAG_BITS["equipable_by_player"] | item_snapshot.FLAG_EQUIPMENT
+        flags = snapshot.columns["flags"]
+        rows = [row for row in range(len(snapshot)) if flags[row] & required_flags == required_flags]
+
+        ids = array.array("i", (snapshot.ids[row] for row in rows))
+        columns = dict()
+        for name in STAT_COLUMNS:
+            column = snapshot.columns[name]
+            values = (None if column[row] == item_snapshot.NONE_INT else column[row] for row in rows)
+            columns[name] = array.array("i", (stat_value(name, value) for value in values))
+
+        slot_codes = array.array("B")
+        slots: Dict[str, int] = dict()
+        slot_column = snapshot.columns["slot"]
+        for row in rows:
+            slot = snapshot.string(slot_column[row])
+            slot_codes.append(slots.setdefault(slot, len(slots)))
+
+        return cls(ids, columns, slot_codes, list(slots))
+
+    def rows(self, slot: Optional[str] = None, **minimums: int) -> List[int]:
+        """Return the row numbers matching a slot and minimum stat values.
+
+        :param slot: Only include items in this equipment slot.
+        :param minimums: Stat names mapped to a minimum (inclusive) value.
+        :return: A list of row numbers, in item ID order.
+        :raises KeyError: An unknown stat name was supplied.
+        """
+        numpy = load_numpy()
+        conditions: List[Tuple] = [(self.columns[stat], minimum) for stat, minimum in minimums.items()]
+        slot_code = self._slot_code(slot)
+
+        if numpy is not None:
+            mask = numpy.ones(len(self.ids), dtype=bool)
+            if slot is not None:
+                mask &= self.slot_codes == slot_code
+            for column, minimum in conditions:
+                mask &= column >= minimum
+            return numpy.flatnonzero(mask).tolist()
+
+        matched_rows = list()
+        for row in range(len(self.ids)):
+            if slot is not None and self.slot_codes[row] != slot_code:
+                continue
+            if all(column[row] >= minimum for column, minimum in conditions):
+                matched_rows.append(row)
+        return matched_rows
+
+    def row(self, id_number: int) -> int:
+        """Return the row number for an item ID number.
+
+        :param id_number: The item ID number.
+        :return: The row of the item in every column.
+        :raises KeyError: The item is not in the table.
+        """
+        if self._rows_by_id is None:
+            self._rows_by_id = {int(id_number): row for row, id_number in enumerate(self.ids)}
+        return self._rows_by_id[id_number]
+
+    def ids_with_values(self, stat: str, values: Iterable[int]) -> List[int]:
+        """Return the item ID numbers where a stat is one of the supplied values.
+
+        :param stat: The stat name.
+        :param values: The stat values to match.
+        :return: A list of item ID numbers, sorted.
+        """
+        numpy = load_numpy()
+        column = self.columns[stat]
+        values = set(values)
+        if numpy is not None:
+            mask = numpy.isin(column, list(values))
+            return self.ids[mask].tolist()
+        return [self.ids[row] for row in range(len(self.ids)) if column[row] in values]
+
+    def filter(self, slot: Optional[str] = None, **minimums: int) -> List[int]:
+        """Return the item ID numbers matching a slot and minimum stat values.
+
+        :param slot: Only include items in this equipment slot.
+        :param minimums: Stat names mapped to a minimum (inclusive) value.
+        :return: A list of item ID numbers, sorted.
+        """
+        return [int(self.ids[row]) for row in self.rows(slot, **minimums)]
+
+    def top_k(self, stat: str, k: int = 10, slot: Optional[str] = None) -> List[Tuple[int, int]]:
+        """Return the items with the highest value for a stat.
+
+        Items with equal values are ordered by item ID number.
+
+        :param stat: The stat name to rank items by.
+        :param k: The maximum number of items to return.
+        :param slot: Only include items in this equipment slot.
+        :return: A list of (item ID number, stat value) tuples, highest value first.
+        """
+        numpy = load_numpy()
+        column = self.columns[stat]
+
+        if numpy is not None:
+            if slot is None:
+                rows = numpy.arange(len(self.ids))
+            else:
+                rows = numpy.flatnonzero(self.slot_codes == self._slot_code(slot))
+            values = column[rows]
+            order = numpy.lexsort((self.ids[rows], -values.astype(numpy.int64)))[:k]
+            return [(int(self.ids[row]), int(column[row])) for row in rows[order]]
+
+        rows = self.rows(slot)
+        ids = self.ids
+        top_rows = heapq.nsmallest(k, rows, key=lambda row: (-column[row], ids[row]))
+        return [(ids[row], column[row]) for row in top_rows]
+
+    def argmax(self, stat: str, slot: Optional[str] = None) -> Optional[int]:
+        """Return the item ID number with the highest value for a stat.
+
+        :param stat: The stat name to rank items by.
+        :param slot: Only include items in this equipment slot.
+        :return: The item ID number (the lowest ID number for ties), or None if no items match.
+        """
+        top_items = self.top_k(stat, 1, slot)
+        if not top_items:
+            return None
+        return top_items[0][0]
+
+    def _slot_code(self, slot: Optional[str]) -> int:
+        """Return the code for a slot name, or -1 if the slot is unknown."""
+        try:
+            return self.slots.index(slot)
+        except ValueError:
+            return -1
+
+    @staticmethod
+    def _as_array(values: array.array):
+        """Convert an array.array to a NumPy array without copying, when NumPy is installed."""
+        numpy = load_numpy()
+        if numpy is None:
+            return values
+        return numpy.frombuffer(values, dtype=numpy.dtype(values.typecode))
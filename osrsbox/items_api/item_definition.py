@@ -20,8 +20,9 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import os
+import copy
 import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Dict, Optional
 
 from osrsbox.items_api.item_equipment import ItemEquipment
@@ -78,9 +79,51 @@ class ItemDefinition:
     def construct_json(self) -> Dict:
         """Construct dictionary/JSON for exporting or printing.
 
+        The dictionary is built directly, in field order, and is identical to `asdict`
+        (which recursively deep copies every field), but several times faster.
+
         :return json_out: All class attributes stored in a dictionary.
         """
-        return asdict(self)
+        equipment = self.equipment
+        if equipment is not None:
+            equipment = equipment.construct_json() if isinstance(equipment, ItemEquipment) else copy.deepcopy(equipment)
+        weapon = self.weapon
+        if weapon is not None:
+            weapon = weapon.construct_json() if isinstance(weapon, ItemWeapon) else copy.deepcopy(weapon)
+
+        return {
+            "id": self.id,
+            "name": self.name,
+            "members": self.members,
+            "tradeable": self.tradeable,
+            "tradeable_on_ge": self.tradeable_on_ge,
+            "stackable": self.stackable,
+            "noted": self.noted,
+            "noteable": self.noteable,
+            "linked_id": self.linked_id,
+            "placeholder": self.placeholder,
+            "equipable": self.equipable,
+            "equipable_by_player": self.equipable_by_player,
+            "equipable_weapon": self.equipable_weapon,
+            "cost": self.cost,
+            "lowalch": self.lowalch,
+            "highalch": self.highalch,
+            "weight": self.weight,
+            "buy_limit": self.buy_limit,
+            "quest_item": self.quest_item,
+            "release_date": self.release_date,
+            "examine": self.examine,
+            "url": self.url,
+            "equipment": equipment,
+            "weapon": weapon
+        }
+
+    def to_json(self) -> str:
+        """Serialize the item to a JSON string, the same as `json.dumps(construct_json())`.
+
+        :return: The item JSON string.
+        """
+        return json.dumps(self.construct_json())
 
     def export_json(self, pretty: bool, export_path: str):
         """Output Item to JSON file.
@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Dict, Optional
 
 
@@ -51,6 +51,26 @@ class ItemEquipment:
     def construct_json(self) -> Dict:
         """Construct dictionary/JSON of item_equipment property for exporting or printing.
 
+        The dictionary is built directly, in field order, and is identical to `asdict`.
+
         :return json_out: A dictionary of all equipment properties.
         """
-        return asdict(self)
+        return {
+            "attack_stab": self.attack_stab,
+            "attack_slash": self.attack_slash,
+            "attack_crush": self.attack_crush,
+            "attack_magic": self.attack_magic,
+            "attack_ranged": self.attack_ranged,
+            "defence_stab": self.defence_stab,
+            "defence_slash": self.defence_slash,
+            "defence_crush": self.defence_crush,
+            "defence_magic": self.defence_magic,
+            "defence_ranged": self.defence_ranged,
+            "melee_strength": self.melee_strength,
+            "ranged_strength": self.ranged_strength,
+            "magic_damage": self.magic_damage,
+            "prayer": self.prayer,
+            "slot": self.slot,
+            # The requirements are a dictionary of skill to level, so a shallow copy is a deep copy
+            "requirements": dict(self.requirements) if self.requirements is not None else None
+        }
@@ -0,0 +1,125 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import sys
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from osrsbox.items_api.item_definition import ItemDefinition
+
+
+class ReadOnlyDict(dict):
+    """A dictionary that can not be modified, for a value shared by many items.
+
+    It compares equal to (and is) a dictionary, so an interned item is equal to the
+    same item loaded without interning.
+    """
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"'{type(self).__name__}' object is shared between items, and can not be modified")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+class ReadOnlyList(list):
+    """A list that can not be modified, for a value shared by many items.
+
+    It compares equal to (and is) a list, so an interned item is equal to the same
+    item loaded without interning.
+    """
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"'{type(self).__name__}' object is shared between items, and can not be modified")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+
+class ItemInterner:
+    """Share a single object for each value that is repeated across many loaded items.
+
+    Slots, weapon types, release dates and URLs (the same for an item, its noted item
+    and its placeholder) are interned strings, every weapon with the same stances
+    shares one stances list, and every item with the same skill requirements shares
+    one requirements dictionary.
+
+    The shared stances and requirements are read-only (`ReadOnlyList` and
+    `ReadOnlyDict`), so modifying them raises a TypeError instead of changing other
+    items. They compare equal to a list and dictionary, so interning does not change
+    item equality, and `construct_json` returns copies of them.
+    """
+    def __init__(self):
+        self.stances: Dict[Tuple, List[Dict]] = dict()
+        self.requirements: Dict[Tuple, Dict] = dict()
+
+    def intern(self, item_def: ItemDefinition) -> ItemDefinition:
+        """Replace the repeated values of an item with the shared values.
+
+        :param item_def: The item definition object, modified in place.
+        :return: The same item definition object.
+        """
+        if item_def.release_date is not None:
+            item_def.release_date = sys.intern(item_def.release_date)
+        if item_def.url is not None:
+            item_def.url = sys.intern(item_def.url)
+
+        equipment = item_def.equipment
+        if equipment is not None and not isinstance(equipment, dict):
+            if equipment.slot is not None:
+                equipment.slot = sys.intern(equipment.slot)
+            if equipment.requirements is not None:
+                equipment.requirements = self.shared_requirements(equipment.requirements)
+
+        weapon = item_def.weapon
+        if weapon is not None and not isinstance(weapon, dict):
+            if weapon.weapon_type is not None:
+                weapon.weapon_type = sys.intern(weapon.weapon_type)
+            if weapon.stances is not None:
+                weapon.stances = self.shared_stances(weapon.stances)
+
+        return item_def
+
+    def shared_requirements(self, requirements: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the shared read-only dictionary of skill requirements equal to the requirements."""
+        key = tuple(requirements.items())
+        try:
+            return self.requirements[key]
+        except KeyError:
+            shared = ReadOnlyDict(requirements)
+            self.requirements[key] = shared
+            return shared
+
+    def shared_stances(self, stances: List[Dict]) -> List[Dict]:
+        """Return the shared read-only list of read-only stances equal to the stances."""
+        key = tuple(tuple(stance.items()) for stance in stances)
+        try:
+            return self.stances[key]
+        except KeyError:
+            shared = ReadOnlyList(ReadOnlyDict(stance) for stance in stances)
+            self.stances[key] = shared
+            return shared
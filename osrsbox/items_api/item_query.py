@@ -0,0 +1,314 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import copy
+import dataclasses
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Callable
+from typing import Optional
+from typing import Generator
+
+from osrsbox.items_api.item_definition import ItemDefinition
+from osrsbox.items_api.item_equipment import ItemEquipment
+from osrsbox.items_api.item_weapon import ItemWeapon
+from osrsbox.items_api.equipment_table import STAT_COLUMNS
+from osrsbox.items_api.equipment_table import NO_ATTACK_SPEED
+from osrsbox.items_api.equipment_table import NO_BONUS
+
+ITEM_FIELDS = [field.name for field in dataclasses.fields(ItemDefinition) if field.name not in ("equipment", "weapon")]
+EQUIPMENT_FIELDS = [field.name for field in dataclasses.fields(ItemEquipment)]
+WEAPON_FIELDS = [field.name for field in dataclasses.fields(ItemWeapon)]
+
+
+def field_value(item: ItemDefinition, field: str) -> Any:
+    """Return the value of an item, equipment or weapon property for an item.
+
+    Equipment and weapon properties are only available for items equipable by a
+    player, and are `None` for every other item. A missing equipment bonus is 0,
+    the same as in the columnar equipment table.
+
+    :param item: The item definition object.
+    :param field: The property name, for example `members`, `slot` or `attack_speed`.
+    :return: The property value.
+    """
+    if field in EQUIPMENT_FIELDS:
+        if not item.equipable_by_player or item.equipment is None:
+            return None
+        value = getattr(item.equipment, field)
+        if value is None and field in STAT_COLUMNS:
+            return NO_BONUS
+        return value
+    if field in WEAPON_FIELDS:
+        if not item.equipable_by_player or item.weapon is None:
+            return None
+        return getattr(item.weapon, field)
+    return getattr(item, field)
+
+
+class ItemQuery:
+    """A composable query over the items in an :class:`AllItems` object.
+
+    Queries are built by chaining `where`, `filter`, `order_by` and `limit`, each
+    returning a new query. Nothing is evaluated until the query is iterated. The
+    planner answers `where` conditions from the secondary indexes of `AllItems`,
+    or the columnar equipment table, when one exists for a property. Any other
+    condition, and every `filter` predicate, is checked against the decoded items.
+    Call `explain` to see the plan for a query.
+
+    For example, the ten free-to-play weapons with the highest slash bonus:
+
+        items.query().where(slot="weapon", members=False).order_by("attack_slash", descending=True).limit(10)
+
+    :param all_items: The AllItems object to query.
+    """
+    def __init__(self, all_items):
+        self.all_items = all_items
+        self.conditions: List[Tuple[str, Tuple[Any, ...]]] = list()
+        self.predicates: List[Callable[[ItemDefinition], bool]] = list()
+        self.order_field: Optional[str] = None
+        self.descending = False
+        self.limit_count: Optional[int] = None
+
+    def __iter__(self) -> Generator[ItemDefinition, None, None]:
+        """Evaluate the query, and iterate (loop) over each matching ItemDefinition object."""
+        id_numbers, index_steps, column_steps, residual_conditions = self._plan()
+        id_numbers = self._order(id_numbers)
+
+        count = 0
+        for id_number in id_numbers:
+            if self.limit_count is not None and count >= self.limit_count:
+                return
+            item = self.all_items[id_number]
+            if not all(field_value(item, field) in values for field, values in residual_conditions):
+                continue
+            if not all(predicate(item) for predicate in self.predicates):
+                continue
+            count += 1
+            yield item
+
+    def where(self, **conditions: Any) -> "ItemQuery":
+        """Return a new query, restricted to items where each property equals a value.
+
+        A tuple, list or set of values matches an item with any one of the values.
+
+        :param conditions: Item, equipment or weapon property names mapped to a value.
+        :return: A new ItemQuery.
+        :raises ValueError: An unknown property name was supplied.
+        """
+        query = self._copy()
+        for field, value in conditions.items():
+            self._check_field(field)
+            if isinstance(value, (tuple, list, set, frozenset)):
+                values = tuple(value)
+            else:
+                values = (value,)
+            query.conditions.append((field, values))
+        return query
+
+    def filter(self, predicate: Callable[[ItemDefinition], bool]) -> "ItemQuery":
+        """Return a new query, restricted to items where a predicate function returns True.
+
+        :param predicate: A function that is called with each candidate ItemDefinition object.
+        :return: A new ItemQuery.
+        """
+        query = self._copy()
+        query.predicates.append(predicate)
+        return query
+
+    def order_by(self, field: str, descending: bool = False) -> "ItemQuery":
+        """Return a new query, with items sorted by a property value.
+
+        Items with equal values are sorted by item ID number, and items without a
+        value (`None`) are always last. Unordered queries are in item ID number order.
+
+        :param field: The item, equipment or weapon property name.
+        :param descending: Toggles sorting from the highest value to the lowest.
+        :return: A new ItemQuery.
+        :raises ValueError: An unknown property name was supplied.
+        """
+        self._check_field(field)
+        query = self._copy()
+        query.order_field = field
+        query.descending = descending
+        return query
+
+    def limit(self, count: int) -> "ItemQuery":
+        """Return a new query, returning at most a number of items.
+
+        :param count: The maximum number of items.
+        :return: A new ItemQuery.
+        """
+        query = self._copy()
+        query.limit_count = count
+        return query
+
+    def all(self) -> List[ItemDefinition]:
+        """Evaluate the query.
+
+        :return: A list of the matching ItemDefinition objects.
+        """
+        return list(self)
+
+    def ids(self) -> List[int]:
+        """Evaluate the query.
+
+        :return: A list of the matching item ID numbers.
+        """
+        return [item.id for item in self]
+
+    def first(self) -> Optional[ItemDefinition]:
+        """Evaluate the query, returning only the first matching item.
+
+        :return: The first matching ItemDefinition object, or None if no items match.
+        """
+        for item in self.limit(1):
+            return item
+        return None
+
+    def explain(self) -> str:
+        """Describe the plan the query will be evaluated with.
+
+        :return: A multi-line description, with one plan step per line.
+        """
+        id_numbers, index_steps, column_steps, residual_conditions = self._plan()
+
+        steps = list()
+        for field, values in index_steps:
+            steps.append(f"index lookup: {field} in {values}")
+        for field, values in column_steps:
+            steps.append(f"columnar scan: {field} in {values} (equipment table)")
+        if not index_steps and not column_steps:
+            steps.append("full scan: all items")
+        steps.append(f"candidates: {len(id_numbers)}")
+        for field, values in residual_conditions:
+            steps.append(f"filtered scan: {field} in {values}")
+        for predicate in self.predicates:
+            steps.append(f"filtered scan: {getattr(predicate, '__name__', repr(predicate))}")
+        if self.order_field is not None:
+            direction = "descending" if self.descending else "ascending"
+            if self.order_field in STAT_COLUMNS:
+                steps.append(f"order by: {self.order_field} {direction} (equipment table)")
+            else:
+                steps.append(f"order by: {self.order_field} {direction} (decoded items)")
+        if self.limit_count is not None:
+            steps.append(f"limit: {self.limit_count}")
+
+        return "\n".join(f"{number}. {step}" for number, step in enumerate(steps, start=1))
+
+    def _plan(self) -> Tuple[List[int], List, List, List]:
+        """Determine the candidate item ID numbers, using an index or columnar scan where possible.
+
+        :return: A tuple of (candidate item ID numbers, index conditions, columnar conditions, residual conditions).
+        """
+        candidates = None
+        index_steps = list()
+        column_steps = list()
+        residual_conditions = list()
+
+        for field, values in self.conditions:
+            # Indexes and the equipment table have no entry for a None value, so these are filtered scans
+            if any(value is None for value in values) or (field == "name" and not all(isinstance(value, str) for value in values)):
+                residual_conditions.append((field, values))
+                continue
+
+            try:
+                index = self.all_items.index(field)
+            except ValueError:
+                index = None
+
+            if index is not None:
+                id_numbers = set()
+                for value in values:
+                    if field == "name":
+                        value = value.lower()
+                    id_numbers.update(index.get(value, ()))
+                index_steps.append((field, values))
+                # The name index is case-insensitive, so the exact name is checked on the decoded items
+                if field == "name":
+                    residual_conditions.append((field, values))
+            elif field in STAT_COLUMNS:
+                table = self.all_items.equipment_table()
+                column_values = [value for value in values if not (field == "attack_speed" and value == NO_ATTACK_SPEED)]
+                id_numbers = set(table.ids_with_values(field, column_values))
+                column_steps.append((field, values))
+            else:
+                residual_conditions.append((field, values))
+                continue
+            candidates = id_numbers if candidates is None else candidates & id_numbers
+
+        if candidates is None:
+            id_numbers = self.all_items.id_numbers()
+        else:
+            id_numbers = sorted(candidates)
+
+        return id_numbers, index_steps, column_steps, residual_conditions
+
+    def _order(self, id_numbers: List[int]) -> List[int]:
+        """Sort the candidate item ID numbers by the order property.
+
+        Equipment stats are read from the columnar equipment table, without decoding
+        the items, so a limited query only decodes the items it returns.
+
+        :param id_numbers: The candidate item ID numbers, sorted.
+        :return: The candidate item ID numbers, in query order.
+        """
+        if self.order_field is None:
+            return id_numbers
+
+        if self.order_field in STAT_COLUMNS:
+            table = self.all_items.equipment_table()
+            column = table[self.order_field]
+            values: Dict[int, Any] = dict()
+            for id_number in id_numbers:
+                try:
+                    value = int(column[table.row(id_number)])
+                except KeyError:
+                    continue
+                if self.order_field == "attack_speed" and value == NO_ATTACK_SPEED:
+                    continue
+                values[id_number] = value
+        else:
+            values = {id_number: field_value(self.all_items[id_number], self.order_field) for id_number in id_numbers}
+
+        ordered = [id_number for id_number in id_numbers if values.get(id_number) is not None]
+        ordered.sort(key=values.__getitem__, reverse=self.descending)
+        ordered.extend(id_number for id_number in id_numbers if values.get(id_number) is None)
+        return ordered
+
+    def _copy(self) -> "ItemQuery":
+        """Return a copy of the query, that can be modified without changing this query."""
+        query = copy.copy(self)
+        query.conditions = list(self.conditions)
+        query.predicates = list(self.predicates)
+        return query
+
+    @staticmethod
+    def _check_field(field: str) -> None:
+        """Check a property name is an item, equipment or weapon property.
+
+        :param field: The property name.
+        :raises ValueError: An unknown property name was supplied.
+        """
+        if field not in ITEM_FIELDS and field not in EQUIPMENT_FIELDS and field not in WEAPON_FIELDS:
+            raise ValueError(f"Error: Unknown item property: {field}. Exiting.")
@@ -0,0 +1,310 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import io
+import gzip
+import json
+import hashlib
+import threading
+import urllib.parse
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Iterable
+from typing import Optional
+from socketserver import ThreadingMixIn
+from http.server import HTTPServer
+from http.server import BaseHTTPRequestHandler
+
+from osrsbox.items_api.all_items import AllItems
+
+# The gzip compression level of the response bodies prepared when loading, and of batch and search responses
+PREPARED_GZIP_LEVEL = 9
+GZIP_LEVEL = 5
+
+# Response bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = 256
+
+# The maximum number of item IDs in a batch request, and of items in a search response
+MAX_BATCH_IDS = 500
+MAX_SEARCH_RESULTS = 500
+DEFAULT_SEARCH_RESULTS = 50
+
+
+def gzip_bytes(data: bytes, level: int) -> bytes:
+    """Compress data with gzip, without a timestamp so the output only depends on the input.
+
+    :param data: The data to compress.
+    :param level: The gzip compression level.
+    :return: The gzip compressed data.
+    """
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=level, mtime=0) as gzip_file:
+        gzip_file.write(data)
+    return buffer.getvalue()
+
+
+def join_items(item_bodies: Iterable[Tuple[int, bytes]]) -> bytes:
+    """Join serialized items into a JSON object of item ID to item, the same format as `items-complete.json`.
+
+    :param item_bodies: An iterable of (item ID number, item JSON bytes) tuples.
+    :return: The JSON object bytes.
+    """
+    return b"{" + b", ".join(b"\"%d\": %s" % (id_number, body) for id_number, body in item_bodies) + b"}"
+
+
+class ItemResponses:
+    """The response bodies of the item server, serialized once when loaded.
+
+    Every item, and every equipment slot, is serialized to JSON bytes (and gzip compressed)
+    when loaded, so answering a request does not create any item objects. Batch and
+    search responses are joined from the serialized items. The data version is a hash
+    of every serialized item, and is used for the strong ETag of every response.
+
+    :param all_db_items: The item database to serve.
+    :param use_gzip: Toggles preparing gzip compressed response bodies.
+    """
+    def __init__(self, all_db_items: AllItems, use_gzip: bool = True):
+        self.use_gzip = use_gzip
+        self.items: Dict[int, bytes] = dict()
+        self.names: List[Tuple[str, int]] = list()
+
+        version = hashlib.sha1()
+        for item in all_db_items:
+            body = item.to_json().encode("utf-8")
+            self.items[item.id] = body
+            self.names.append((item.name.lower(), item.id))
+            version.update(body)
+        self.version = version.hexdigest()[:20]
+
+        # The prepared (body, gzip body) of each fixed path
+        self.prepared: Dict[str, Tuple[bytes, Optional[bytes]]] = dict()
+        for id_number, body in self.items.items():
+            self.prepared[f"/items/{id_number}"] = self._prepare(body)
+        for slot in sorted(all_db_items.index("slot")):
+            id_numbers = all_db_items.ids_by_slot(slot)
+            self.prepared[f"/items/slot/{slot}"] = self._prepare(join_items((id_number, self.items[id_number]) for id_number in id_numbers))
+
+    def _prepare(self, body: bytes) -> Tuple[bytes, Optional[bytes]]:
+        """Return the body, and gzip compressed body, of a prepared response."""
+        if not self.use_gzip or len(body) < GZIP_MIN_SIZE:
+            return body, None
+        return body, gzip_bytes(body, PREPARED_GZIP_LEVEL)
+
+    def batch(self, id_numbers: List[int]) -> bytes:
+        """Return the JSON object of the requested items, missing items are not included.
+
+        :param id_numbers: The item ID numbers.
+        :return: The JSON object bytes.
+        """
+        return join_items((id_number, self.items[id_number]) for id_number in dict.fromkeys(id_numbers)
+                          if id_number in self.items)
+
+    def search(self, name: str, limit: int) -> bytes:
+        """Return the JSON object of the items with a name that contains a search string (case-insensitive).
+
+        :param name: The search string.
+        :param limit: The maximum number of items.
+        :return: The JSON object bytes, ordered by item ID number.
+        """
+        name = name.lower()
+        id_numbers = sorted(id_number for item_name, id_number in self.names if name in item_name)[:limit]
+        return join_items((id_number, self.items[id_number]) for id_number in id_numbers)
+
+
+class ItemRequestHandler(BaseHTTPRequestHandler):
+    """Answer item lookup requests from the prepared responses of the server.
+
+    Endpoints:
+        `/items/<id>`: A single item.
+        `/items?ids=<id>,<id>,...`: A JSON object of item ID to item, for multiple items.
+        `/items/slot/<slot>`: A JSON object of every item equipable by a player in a slot.
+        `/items/search?name=<name>&limit=<limit>`: A JSON object of the items with a name that contains a search string.
+    """
+    protocol_version = "HTTP/1.1"
+    # The headers and body are separate writes, so send without waiting for the client ACK (keep-alive)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def log_message(self, format, *args):
+        """Do not log every request to stderr."""
+        return
+
+    def respond(self, send_body: bool) -> None:
+        """Answer a request, with a prepared response when possible."""
+        responses = self.server.responses
+        url = urllib.parse.urlsplit(self.path)
+        params = dict(urllib.parse.parse_qsl(url.query))
+
+        prepared = responses.prepared.get(url.path)
+        if prepared is not None:
+            body, gzip_body = prepared
+        else:
+            try:
+                if url.path == "/items" and "ids" in params:
+                    id_numbers = [int(id_number) for id_number in params["ids"].split(",") if id_number]
+                    if len(id_numbers) > MAX_BATCH_IDS:
+                        raise ValueError(f"Too many item IDs, the maximum is {MAX_BATCH_IDS}")
+                    body = responses.batch(id_numbers)
+                elif url.path == "/items/search":
+                    if not params.get("name"):
+                        raise ValueError("Missing search parameter: name")
+                    limit = max(0, min(int(params.get("limit", DEFAULT_SEARCH_RESULTS)), MAX_SEARCH_RESULTS))
+                    body = responses.search(params["name"], limit)
+                elif url.path.startswith("/items/"):
+                    self.send_error_json(404, "Item not found", send_body)
+                    return
+                else:
+                    self.send_error_json(404, "Unknown endpoint", send_body)
+                    return
+            except ValueError as e:
+                self.send_error_json(400, str(e), send_body)
+                return
+            gzip_body = None
+
+        # Only a resource that exists is not modified, so the check follows resolving the path
+        etag = f"\"{responses.version}\""
+        has_gzip = gzip_body is not None or (responses.use_gzip and len(body) >= GZIP_MIN_SIZE)
+        matched_etag = self.matched_etag(responses.version, has_gzip)
+        if matched_etag is not None:
+            self.send(304, b"", None, matched_etag, send_body)
+            return
+
+        if gzip_body is None and has_gzip and self.accepts_gzip():
+            gzip_body = gzip_bytes(body, GZIP_LEVEL)
+        self.send(200, body, gzip_body, etag, send_body)
+
+    def accepts_gzip(self) -> bool:
+        """Return if the client accepts a gzip compressed response."""
+        accept_encoding = self.headers.get("Accept-Encoding", "")
+        return any(encoding.split(";")[0].strip() == "gzip" for encoding in accept_encoding.split(","))
+
+    def matched_etag(self, version: str, has_gzip: bool) -> Optional[str]:
+        """Return the ETag of the current data version matched by the If-None-Match header.
+
+        The identity and gzip responses have their own ETag, and a `*` matches the ETag
+        of the response the client would receive.
+
+        :param version: The current data version.
+        :param has_gzip: If the resource has a gzip compressed response.
+        :return: The matched ETag, or None if the header is missing or does not match.
+        """
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is None:
+            return None
+        etags = [etag.strip() for etag in if_none_match.split(",")]
+        identity_etag = f"\"{version}\""
+        gzip_etag = f"\"{version}-gzip\""
+        current_etag = gzip_etag if has_gzip and self.accepts_gzip() else identity_etag
+        if "*" in etags:
+            return current_etag
+        for etag in (current_etag, identity_etag, gzip_etag):
+            if etag in etags:
+                return etag
+        return None
+
+    def send(self, status: int, body: bytes, gzip_body: Optional[bytes], etag: str, send_body: bool) -> None:
+        """Send a response, using the gzip compressed body when the client accepts it."""
+        self.send_response(status)
+        if gzip_body is not None and self.accepts_gzip():
+            body = gzip_body
+            etag = etag[:-1] + "-gzip\""
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Cache-Control", "public, max-age=3600")
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body and status != 304:
+            self.wfile.write(body)
+
+    def send_error_json(self, status: int, message: str, send_body: bool) -> None:
+        """Send a JSON error response."""
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+class ItemServer(ThreadingMixIn, HTTPServer):
+    """A read-only HTTP item lookup service, using only the standard library.
+
+    Use as a context manager to serve requests from a background thread:
+
+        with ItemServer(items_api.load()) as server:
+            requests.get(f"{server.url}/items/4151")
+
+    :param all_db_items: The item database to serve.
+    :param host: The host address to listen on.
+    :param port: The port to listen on, 0 for any free port.
+    :param use_gzip: Toggles gzip compressed responses, for clients that accept them.
+    """
+    daemon_threads = True
+
+    def __init__(self, all_db_items: AllItems, host: str = "127.0.0.1", port: int = 0, use_gzip: bool = True):
+        self.responses = ItemResponses(all_db_items, use_gzip)
+        super().__init__((host, port), ItemRequestHandler)
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "ItemServer":
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+        self.thread.join()
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Serve the osrsbox item database over HTTP.")
+    ap.add_argument("--input", default=None, help="The item database JSON file, directory of JSON files or snapshot file")
+    ap.add_argument("--host", default="127.0.0.1", help="The host address to listen on")
+    ap.add_argument("--port", type=int, default=8000, help="The port to listen on")
+    ap.add_argument("--no-gzip", action="store_true", help="Do not send gzip compressed responses")
+    args = ap.parse_args()
+
+    if args.input:
+        items = AllItems(Path(args.input))
+    else:
+        items = AllItems()
+    item_server = ItemServer(items, args.host, args.port, not args.no_gzip)
+    print(f">>> Serving {len(item_server.responses.items)} items: {item_server.url}")
+    item_server.serve_forever()
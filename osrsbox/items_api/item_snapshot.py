@@ -0,0 +1,438 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import sys
+import json
+import math
+import mmap
+import array
+import bisect
+import struct
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+from typing import Iterable
+from typing import Generator
+
+# Snapshot file layout (all values little-endian):
+#   header:           magic, version, flags, item count, column count, string count, string table offset
+#   column directory: one (name, type code, offset) entry per column
+#   columns:          one fixed-width value per item for each column, ordered by item ID number
+#   string table:     (string count + 1) uint32 offsets, followed by the UTF-8 string data
+# The `id` column is sorted, so it is the ID to row table. The offset of any value
+# is the column offset plus the row number multiplied by the column value width.
+SNAPSHOT_MAGIC = b"OSRSBOXS"
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct("<8sHHIIIQ")
+COLUMN_ENTRY = struct.Struct("<16sc7xQ")
+COLUMN_ALIGNMENT = 8
+
+NONE_INT = -2 ** 31
+NONE_STRING = 2 ** 32 - 1
+
+FLAGS = [
+    "members",
+    "tradeable_on_ge",
+    "stackable",
+    "noted",
+    "noteable",
+    "placeholder",
+    "equipable",
+    "equipable_by_player",
+    "equipable_weapon"
+]
+FLAG_BITS = {flag: 1 << bit for bit, flag in enumerate(FLAGS)}
+FLAG_TRADEABLE_SET = 1 << 9
+FLAG_TRADEABLE = 1 << 10
+FLAG_QUEST_ITEM_SET = 1 << 11
+FLAG_QUEST_ITEM = 1 << 12
+FLAG_EQUIPMENT = 1 << 13
+FLAG_WEAPON = 1 << 14
+
+ITEM_INT_COLUMNS = [
+    "linked_id",
+    "cost",
+    "lowalch",
+    "highalch",
+    "buy_limit"
+]
+ITEM_STRING_COLUMNS = [
+    "name",
+    "release_date",
+    "examine",
+    "url"
+]
+EQUIPMENT_INT_COLUMNS = [
+    "attack_stab",
+    "attack_slash",
+    "attack_crush",
+    "attack_magic",
+    "attack_ranged",
+    "defence_stab",
+    "defence_slash",
+    "defence_crush",
+    "defence_magic",
+    "defence_ranged",
+    "melee_strength",
+    "ranged_strength",
+    "magic_damage",
+    "prayer"
+]
+
+COLUMNS: List[Tuple[str, str]] = (
+    [("id", "i"), ("flags", "I"), ("weight", "d")] +
+    [(column, "i") for column in ITEM_INT_COLUMNS] +
+    [(column, "I") for column in ITEM_STRING_COLUMNS] +
+    [(column, "i") for column in EQUIPMENT_INT_COLUMNS] +
+    [("slot", "I"), ("requirements", "I")] +
+    [("attack_speed", "i"), ("weapon_type", "I"), ("stances", "I")]
+)
+
+
+def is_snapshot_file(path_to_file: Path) -> bool:
+    """Check if a file is an item database snapshot.
+
+    :param path_to_file: The path to the file to check.
+    :return: True if the file starts with the snapshot magic bytes.
+    """
+    with open(path_to_file, "rb") as snapshot_file:
+        return snapshot_file.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+
+
+def write_snapshot(items: Iterable[Dict], path_to_snapshot_file: Union[Path, str]) -> None:
+    """Write item JSON to a binary snapshot file.
+
+    :param items: An iterable of item JSON dictionaries (as exported by `construct_json`).
+    :param path_to_snapshot_file: The file name for the snapshot file.
+    :raises ValueError: An item property cannot be stored in a fixed-width column.
+    """
+    items = sorted(items, key=lambda x: x["id"])
+    columns = {name: array.array(type_code) for name, type_code in COLUMNS}
+    strings: Dict[str, int] = dict()
+
+    def intern_string(value) -> int:
+        if value is None:
+            return NONE_STRING
+        return strings.setdefault(value, len(strings))
+
+    def intern_json(value) -> int:
+        if value is None:
+            return NONE_STRING
+        return intern_string(json.dumps(value))
+
+    def int_value(value) -> int:
+        if value is None:
+            return NONE_INT
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError(f"Error: Cannot store {value!r} in an integer column. Exiting.")
+        return value
+
+    for item in items:
+        flags = 0
+        for flag, bit in FLAG_BITS.items():
+            if item[flag]:
+                flags |= bit
+        if item["tradeable"] is not None:
+            flags |= FLAG_TRADEABLE_SET
+            if item["tradeable"]:
+                flags |= FLAG_TRADEABLE
+        if item["quest_item"] is not None:
+            flags |= FLAG_QUEST_ITEM_SET
+            if item["quest_item"]:
+                flags |= FLAG_QUEST_ITEM
+
+        equipment = item.get("equipment")
+        weapon = item.get("weapon")
+        if equipment is not None:
+            flags |= FLAG_EQUIPMENT
+        if weapon is not None:
+            flags |= FLAG_WEAPON
+
+        columns["id"].append(int_value(item["id"]))
+        columns["flags"].append(flags)
+        columns["weight"].append(math.nan if item["weight"] is None else item["weight"])
+        for column in ITEM_INT_COLUMNS:
+            columns[column].append(int_value(item[column]))
+        for column in ITEM_STRING_COLUMNS:
+            columns[column].append(intern_string(item[column]))
+
+        equipment = equipment or dict()
+        for column in EQUIPMENT_INT_COLUMNS:
+            columns[column].append(int_value(equipment.get(column, 0)))
+        columns["slot"].append(intern_string(equipment.get("slot")))
+        columns["requirements"].append(intern_json(equipment.get("requirements")))
+
+        weapon = weapon or dict()
+        columns["attack_speed"].append(int_value(weapon.get("attack_speed")))
+        columns["weapon_type"].append(intern_string(weapon.get("weapon_type")))
+        columns["stances"].append(intern_json(weapon.get("stances")))
+
+    # Determine the location of each column, then the string table
+    position = HEADER.size + COLUMN_ENTRY.size * len(COLUMNS)
+    column_offsets = dict()
+    for name, _ in COLUMNS:
+        position += -position % COLUMN_ALIGNMENT
+        column_offsets[name] = position
+        position += columns[name].itemsize * len(items)
+    position += -position % COLUMN_ALIGNMENT
+    strings_offset = position
+
+    encoded_strings = [value.encode("utf-8") for value in strings]
+    string_offsets = array.array("I", [0])
+    for encoded_string in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(encoded_string))
+
+    def little_endian(values: array.array) -> bytes:
+        if sys.byteorder == "big":
+            values = array.array(values.typecode, values)
+            values.byteswap()
+        return values.tobytes()
+
+    with open(path_to_snapshot_file, "wb") as snapshot_file:
+        snapshot_file.write(HEADER.pack(SNAPSHOT_MAGIC,
+                                        SNAPSHOT_VERSION,
+                                        0,
+                                        len(items),
+                                        len(COLUMNS),
+                                        len(strings),
+                                        strings_offset))
+        for name, type_code in COLUMNS:
+            snapshot_file.write(COLUMN_ENTRY.pack(name.encode("ascii"),
+                                                  type_code.encode("ascii"),
+                                                  column_offsets[name]))
+        for name, _ in COLUMNS:
+            snapshot_file.write(b"\x00" * (column_offsets[name] - snapshot_file.tell()))
+            snapshot_file.write(little_endian(columns[name]))
+        snapshot_file.write(b"\x00" * (strings_offset - snapshot_file.tell()))
+        snapshot_file.write(little_endian(string_offsets))
+        snapshot_file.write(b"".join(encoded_strings))
+
+
+class SnapshotReader:
+    """Read-only, zero-copy access to a binary item database snapshot.
+
+    The snapshot is memory-mapped, so several processes loading the same file share
+    the same pages. Columns are exposed as typed views over the mapped data, and an
+    item is only decoded to JSON when it is read.
+
+    :param snapshot: The path to a snapshot file, or a buffer holding snapshot data.
+    :raises ValueError: The data is not a supported snapshot.
+    """
+    def __init__(self, snapshot: Union[Path, str, bytes, memoryview]):
+        # The path of a memory-mapped snapshot file, so other processes can map the same file
+        self.path_to_snapshot_file = None
+        if isinstance(snapshot, (Path, str)):
+            self.path_to_snapshot_file = Path(snapshot)
+            with open(snapshot, "rb") as snapshot_file:
+                snapshot = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = snapshot
+        self.buffer = memoryview(snapshot)
+
+        try:
+            (magic, version, _, self.item_count, column_count,
+             self.string_count, strings_offset) = HEADER.unpack_from(self.buffer, 0)
+        except struct.error as e:
+            raise ValueError("Error: Invalid item snapshot, check supplied input. Exiting.") from e
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Error: Invalid item snapshot, check supplied input. Exiting.")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Error: Unsupported item snapshot version: {version}. Exiting.")
+
+        self.columns: Dict[str, Union[memoryview, array.array]] = dict()
+        for column_number in range(column_count):
+            name, type_code, offset = COLUMN_ENTRY.unpack_from(self.buffer,
+                                                               HEADER.size + column_number * COLUMN_ENTRY.size)
+            name = name.rstrip(b"\x00").decode("ascii")
+            self.columns[name] = self._typed_view(type_code.decode("ascii"), offset, self.item_count)
+
+        self.string_offsets = self._typed_view("I", strings_offset, self.string_count + 1)
+        self.strings_start = strings_offset + 4 * (self.string_count + 1)
+        self._strings: Dict[int, str] = dict()
+
+        self.ids = self.columns["id"]
+
+    def __iter__(self) -> Generator[int, None, None]:
+        """Iterate (loop) over each item ID number, in sorted order."""
+        for id_number in self.ids:
+            yield id_number
+
+    def __len__(self) -> int:
+        """Return the number of items in the snapshot."""
+        return self.item_count
+
+    def __contains__(self, id_number: int) -> bool:
+        """Return if an item ID number is present in the snapshot."""
+        try:
+            self.row(id_number)
+        except KeyError:
+            return False
+        return True
+
+    def row(self, id_number: int) -> int:
+        """Return the row number for an item ID number.
+
+        :param id_number: The item ID number.
+        :return row: The row of the item in every column.
+        :raises KeyError: The item ID number is not in the snapshot.
+        """
+        row = bisect.bisect_left(self.ids, id_number)
+        if row == self.item_count or self.ids[row] != id_number:
+            raise KeyError(id_number)
+        return row
+
+    def string(self, string_number: int) -> Union[str, None]:
+        """Return a string from the string table.
+
+        :param string_number: The string number, as stored in a string column.
+        :return: The decoded string, or None.
+        """
+        if string_number == NONE_STRING:
+            return None
+        try:
+            return self._strings[string_number]
+        except KeyError:
+            start = self.strings_start + self.string_offsets[string_number]
+            end = self.strings_start + self.string_offsets[string_number + 1]
+            value = str(self.buffer[start:end], "utf-8")
+            self._strings[string_number] = value
+            return value
+
+    def field_values(self, field: str) -> Generator[Tuple[int, Union[bool, int, str, None]], None, None]:
+        """Yield the value of a single item property for every item, without decoding the items.
+
+        :param field: A flag, integer or string item property, or the equipment `slot`.
+        :return: Tuples of (item ID number, value), in item ID order.
+        :raises KeyError: The field is not stored as a single column.
+        """
+        ids = self.ids
+        if field in FLAG_BITS:
+            flags = self.columns["flags"]
+            bit = FLAG_BITS[field]
+            for row in range(self.item_count):
+                yield ids[row], bool(flags[row] & bit)
+        elif field in ITEM_INT_COLUMNS:
+            column = self.columns[field]
+            for row in range(self.item_count):
+                yield ids[row], self._int(column[row])
+        elif field in ITEM_STRING_COLUMNS:
+            column = self.columns[field]
+            for row in range(self.item_count):
+                yield ids[row], self.string(column[row])
+        elif field == "slot":
+            flags = self.columns["flags"]
+            column = self.columns[field]
+            for row in range(self.item_count):
+                value = self.string(column[row]) if flags[row] & FLAG_EQUIPMENT else None
+                yield ids[row], value
+        else:
+            raise KeyError(field)
+
+    def read(self, id_number: int) -> Dict:
+        """Decode the JSON for a single item.
+
+        :param id_number: The item ID number.
+        :return: A dict of the item JSON, identical to the `items-complete.json` entry.
+        :raises KeyError: The item ID number is not in the snapshot.
+        """
+        return self.read_row(self.row(id_number))
+
+    def read_row(self, row: int) -> Dict:
+        """Decode the JSON for the item stored in a specific row.
+
+        :param row: The row number.
+        :return item_json: A dict of the item JSON.
+        """
+        columns = self.columns
+        flags = columns["flags"][row]
+        weight = columns["weight"][row]
+
+        item_json = {
+            "id": columns["id"][row],
+            "name": self.string(columns["name"][row]),
+            "members": bool(flags & FLAG_BITS["members"]),
+            "tradeable": bool(flags & FLAG_TRADEABLE) if flags & FLAG_TRADEABLE_SET else None,
+            "tradeable_on_ge": bool(flags & FLAG_BITS["tradeable_on_ge"]),
+            "stackable": bool(flags & FLAG_BITS["stackable"]),
+            "noted": bool(flags & FLAG_BITS["noted"]),
+            "noteable": bool(flags & FLAG_BITS["noteable"]),
+            "linked_id": self._int(columns["linked_id"][row]),
+            "placeholder": bool(flags & FLAG_BITS["placeholder"]),
+            "equipable": bool(flags & FLAG_BITS["equipable"]),
+            "equipable_by_player": bool(flags & FLAG_BITS["equipable_by_player"]),
+            "equipable_weapon": bool(flags & FLAG_BITS["equipable_weapon"]),
+            "cost": self._int(columns["cost"][row]),
+            "lowalch": self._int(columns["lowalch"][row]),
+            "highalch": self._int(columns["highalch"][row]),
+            "weight": None if math.isnan(weight) else weight,
+            "buy_limit": self._int(columns["buy_limit"][row]),
+            "quest_item": bool(flags & FLAG_QUEST_ITEM) if flags & FLAG_QUEST_ITEM_SET else None,
+            "release_date": self.string(columns["release_date"][row]),
+            "examine": self.string(columns["examine"][row]),
+            "url": self.string(columns["url"][row]),
+            "equipment": None,
+            "weapon": None
+        }
+
+        if flags & FLAG_EQUIPMENT:
+            equipment = {column: self._int(columns[column][row]) for column in EQUIPMENT_INT_COLUMNS}
+            equipment["slot"] = self.string(columns["slot"][row])
+            equipment["requirements"] = self._json_string(columns["requirements"][row])
+            item_json["equipment"] = equipment
+
+        if flags & FLAG_WEAPON:
+            item_json["weapon"] = {
+                "attack_speed": self._int(columns["attack_speed"][row]),
+                "weapon_type": self.string(columns["weapon_type"][row]),
+                "stances": self._json_string(columns["stances"][row])
+            }
+
+        return item_json
+
+    def _json_string(self, string_number: int) -> Union[Dict, List, None]:
+        """Decode a JSON value stored in the string table, returning a new copy each time."""
+        if string_number == NONE_STRING:
+            return None
+        return json.loads(self.string(string_number))
+
+    @staticmethod
+    def _int(value: int) -> Union[int, None]:
+        """Convert the integer column None sentinel back to None."""
+        if value == NONE_INT:
+            return None
+        return value
+
+    def _typed_view(self, type_code: str, offset: int, count: int) -> Union[memoryview, array.array]:
+        """Return a typed view of little-endian values stored in the snapshot.
+
+        :param type_code: The array type code of the values.
+        :param offset: The offset of the first value.
+        :param count: The number of values.
+        :return: A memoryview over the mapped data, or a byte-swapped copy on big-endian hosts.
+        """
+        item_size = array.array(type_code).itemsize
+        raw = self.buffer[offset:offset + item_size * count]
+        if sys.byteorder == "little":
+            return raw.cast(type_code)
+        values = array.array(type_code, raw.tobytes())
+        values.byteswap()
+        return values
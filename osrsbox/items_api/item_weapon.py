@@ -19,7 +19,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import List, Dict
 
 
@@ -29,7 +29,9 @@ class ItemWeapon:
 
     The ItemWeapon class is the object that retains all items properties related
     to equipable items that are weapons. This includes weapon attack speed,
-    weapon type, stance, experience, and bonuses.
+    weapon type, stance, experience, and bonuses. When loaded by AllItems with
+    interning, the stances are a read-only list shared by every weapon with the
+    same stances.
     """
     attack_speed: int
     weapon_type: str
@@ -38,6 +40,16 @@ class ItemWeapon:
     def construct_json(self) -> Dict:
         """Construct dictionary/JSON of item_equipment property for exporting or printing.
 
+        The dictionary is built directly, in field order, and is identical to `asdict`.
+
         :return json_out: A dictionary of all equipment properties.
         """
-        return asdict(self)
+        stances = self.stances
+        if stances is not None:
+            # Each stance is a dictionary of strings (or None), so a shallow copy of each stance is a deep copy
+            stances = [dict(stance) for stance in stances]
+        return {
+            "attack_speed": self.attack_speed,
+            "weapon_type": self.weapon_type,
+            "stances": stances
+        }
@@ -0,0 +1,240 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import re
+import json
+import mmap
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+from typing import Iterable
+from typing import Generator
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def index_file_path(path_to_json_file: Path) -> Path:
+    """Return the location of the prebuilt offset index for an `items-complete.json` file.
+
+    :param path_to_json_file: The path to the `items-complete.json` file.
+    :return: The path to the matching `items-complete-index.json` file.
+    """
+    return path_to_json_file.with_name(path_to_json_file.stem + "-index.json")
+
+
+def dump_items_complete(items: Dict, path_to_json_file: Union[Path, str]) -> None:
+    """Write an `items-complete.json` file and its prebuilt offset index.
+
+    The JSON output is identical to `json.dump(items, f)`. Each item is
+    serialized separately so the byte offset and length of every item
+    can be recorded while writing.
+
+    :param items: A dictionary of item ID number to item JSON.
+    :param path_to_json_file: The file name for the `items-complete.json` file.
+    """
+    write_items_complete(((id_number, json.dumps(item_json)) for id_number, item_json in items.items()), path_to_json_file)
+
+
+def write_items_complete(entries: Iterable[Tuple[Union[int, str], str]], path_to_json_file: Union[Path, str]) -> None:
+    """Stream serialized items to an `items-complete.json` file, and write its prebuilt offset index.
+
+    :param entries: An iterable of (item ID number, item JSON string) tuples, for example from `AllItems.iter_json`.
+    :param path_to_json_file: The file name for the `items-complete.json` file.
+    """
+    path_to_json_file = Path(path_to_json_file)
+    offsets = dict()
+    position = 1
+
+    with open(path_to_json_file, "w") as json_file:
+        json_file.write("{")
+        for count, (id_number, entry_value) in enumerate(entries):
+            entry_prefix = ", " if count else ""
+            entry_prefix += json.dumps(str(id_number)) + ": "
+            json_file.write(entry_prefix)
+            json_file.write(entry_value)
+            position += len(entry_prefix)
+            offsets[str(id_number)] = [position, len(entry_value)]
+            position += len(entry_value)
+        json_file.write("}")
+
+    index_json = {
+        "size": position + 1,
+        "offsets": offsets
+    }
+    with open(index_file_path(path_to_json_file), "w") as index_file:
+        json.dump(index_json, index_file)
+
+
+def scan_offsets(data: bytes) -> Dict[int, Tuple[int, int]]:
+    """Determine the offset and length of every item in an `items-complete.json` file.
+
+    This is the fallback used when no prebuilt offset index is available. Every
+    item value is scanned once, but no item objects are created or retained.
+
+    :param data: The raw contents of the `items-complete.json` file.
+    :return offsets: A dictionary of item ID number to (offset, length).
+    :raises ValueError: The file is not an ASCII encoded JSON object.
+    """
+    text = data.decode("utf-8")
+    if len(text) != len(data):
+        raise ValueError("Error: Lazy loading requires an ASCII encoded JSON file. Exiting.")
+
+    decoder = json.JSONDecoder()
+    offsets = dict()
+
+    position = WHITESPACE.match(text, 0).end()
+    if text[position:position + 1] != "{":
+        raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting")
+    position += 1
+
+    while True:
+        position = WHITESPACE.match(text, position).end()
+        if text[position:position + 1] == "}":
+            break
+        id_number, position = decoder.raw_decode(text, position)
+        position = WHITESPACE.match(text, position).end()
+        if text[position:position + 1] != ":":
+            raise ValueError("Error: Invalid JSON structure found, check supplied input. Exiting")
+        position = WHITESPACE.match(text, position + 1).end()
+        start = position
+        _, position = decoder.raw_decode(text, position)
+        offsets[int(id_number)] = (start, position - start)
+        position = WHITESPACE.match(text, position).end()
+        if text[position:position + 1] == ",":
+            position += 1
+
+    return offsets
+
+
+class JsonFileOffsetIndex:
+    """An ID to byte offset index into a memory-mapped `items-complete.json` file.
+
+    The prebuilt `items-complete-index.json` file is used when it matches the
+    data file, otherwise the offsets are determined by scanning the data file.
+
+    :param path_to_json_file: The path to the `items-complete.json` file.
+    """
+    def __init__(self, path_to_json_file: Path):
+        self.path_to_json_file = path_to_json_file
+        with open(path_to_json_file, "rb") as json_file:
+            self.data = mmap.mmap(json_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.offsets = self._load_prebuilt_index()
+        if self.offsets is None:
+            self.offsets = scan_offsets(self.data[:])
+        self.id_numbers: List[int] = sorted(self.offsets)
+
+    def __iter__(self) -> Generator[int, None, None]:
+        """Iterate (loop) over each item ID number, in sorted order."""
+        for id_number in self.id_numbers:
+            yield id_number
+
+    def __len__(self) -> int:
+        """Return the number of indexed items."""
+        return len(self.id_numbers)
+
+    def __contains__(self, id_number: int) -> bool:
+        """Return if an item ID number is present in the index."""
+        return id_number in self.offsets
+
+    def read(self, id_number: int) -> Dict:
+        """Decode the JSON for a single item.
+
+        :param id_number: The item ID number.
+        :return: A dict of the item JSON.
+        :raises KeyError: The item ID number is not in the index.
+        """
+        start, length = self.offsets[id_number]
+        try:
+            item_json = json.loads(self.data[start:start + length])
+        except ValueError:
+            item_json = dict()
+
+        # A stale prebuilt index will point to the wrong item, rebuild it from the data file
+        if not isinstance(item_json, dict) or item_json.get("id") != id_number:
+            self.offsets = scan_offsets(self.data[:])
+            self.id_numbers = sorted(self.offsets)
+            start, length = self.offsets[id_number]
+            item_json = json.loads(self.data[start:start + length])
+
+        return item_json
+
+    def _load_prebuilt_index(self) -> Union[Dict[int, Tuple[int, int]], None]:
+        """Load the prebuilt offset index, if it exists and matches the data file.
+
+        :return: A dictionary of item ID number to (offset, length), or None.
+        """
+        path_to_index_file = index_file_path(self.path_to_json_file)
+        if not path_to_index_file.is_file():
+            return None
+
+        with open(path_to_index_file) as index_file:
+            index_json = json.load(index_file)
+
+        if index_json.get("size") != len(self.data):
+            return None
+
+        return {int(id_number): tuple(offset) for id_number, offset in index_json["offsets"].items()}
+
+
+class JsonDirectoryOffsetIndex:
+    """An ID to file index into a directory of JSON files (`items-json`).
+
+    :param path_to_directory: The path to the `items-json` directory.
+    :raises ValueError: No JSON files found in supplied directory.
+    """
+    def __init__(self, path_to_directory: Path):
+        self.files: Dict[int, Path] = dict()
+        for json_file in path_to_directory.glob("*.json"):
+            try:
+                self.files[int(json_file.stem)] = json_file
+            except ValueError as e:
+                raise ValueError(f"Error: Invalid item file name: {json_file.name}. Exiting.") from e
+
+        if not self.files:
+            raise ValueError("Error: No files found in directory, check the supplied path. Exiting.")
+
+        self.id_numbers: List[int] = sorted(self.files)
+
+    def __iter__(self) -> Generator[int, None, None]:
+        """Iterate (loop) over each item ID number, in sorted order."""
+        for id_number in self.id_numbers:
+            yield id_number
+
+    def __len__(self) -> int:
+        """Return the number of indexed items."""
+        return len(self.id_numbers)
+
+    def __contains__(self, id_number: int) -> bool:
+        """Return if an item ID number is present in the index."""
+        return id_number in self.files
+
+    def read(self, id_number: int) -> Dict:
+        """Decode the JSON for a single item.
+
+        :param id_number: The item ID number.
+        :return: A dict of the item JSON.
+        :raises KeyError: The item ID number is not in the index.
+        """
+        with open(self.files[id_number]) as input_json_file:
+            return json.load(input_json_file)
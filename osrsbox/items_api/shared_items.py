@@ -0,0 +1,114 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+from typing import Optional
+
+from osrsbox.items_api.all_items import AllItems
+from osrsbox.items_api.item_snapshot import SnapshotReader
+from osrsbox.items_api.item_snapshot import is_snapshot_file
+from osrsbox.items_api.item_snapshot import write_snapshot
+
+# A memory backed file system, so a published snapshot is never written to disk
+SHARED_MEMORY_DIRECTORY = Path("/dev/shm")
+
+
+def shared_snapshot_directory() -> Path:
+    """Return the directory for published snapshot files, shared memory when available.
+
+    :return: The path to the shared memory directory, or the temporary directory.
+    """
+    if SHARED_MEMORY_DIRECTORY.is_dir():
+        return SHARED_MEMORY_DIRECTORY
+    return Path(tempfile.gettempdir())
+
+
+def attach(path_to_snapshot_file: Union[Path, str]) -> AllItems:
+    """Attach to a published item database, with a read-only view of the snapshot file.
+
+    The snapshot file is memory-mapped and items are decoded on first access, so the
+    item data is shared with every other process that attached to the same file.
+
+    :param path_to_snapshot_file: The path to the published snapshot file.
+    :return: An AllItems object in lazy mode.
+    :raises ValueError: The file is not an item database snapshot.
+    """
+    path_to_snapshot_file = Path(path_to_snapshot_file)
+    if not path_to_snapshot_file.is_file() or not is_snapshot_file(path_to_snapshot_file):
+        raise ValueError(f"Error: Item snapshot not found: {path_to_snapshot_file}. Exiting.")
+    return AllItems(path_to_snapshot_file, lazy=True)
+
+
+class SharedItems:
+    """Publish an item database as a memory-mapped snapshot file, for other processes to attach.
+
+    The publishing process writes the snapshot once, then every process uses a
+    read-only, lazy `AllItems` view of the same mapped pages, instead of a private
+    copy of every ItemDefinition object. For example, in a pre-fork server:
+
+        shared = SharedItems(items_api.load())
+        items = shared.items  # Use this object in the workers forked after this point
+
+    The `items` object is pickled as the snapshot path, so it is cheap to send to
+    process pool workers. Other processes can also use `attach(shared.path)`.
+
+    :param all_db_items: The item database to publish.
+    :param path_to_snapshot_file: The snapshot file to write, by default a new file in the shared memory directory.
+    """
+    def __init__(self, all_db_items: AllItems, path_to_snapshot_file: Optional[Union[Path, str]] = None):
+        self.owner = False
+        item_index = all_db_items.item_index
+        if (path_to_snapshot_file is None and isinstance(item_index, SnapshotReader) and
+                item_index.path_to_snapshot_file is not None):
+            # Already loaded from a snapshot file, so publish the same file
+            self.path = item_index.path_to_snapshot_file
+        else:
+            if path_to_snapshot_file is None:
+                fd, path_to_snapshot_file = tempfile.mkstemp(prefix="osrsbox-items-", suffix=".snapshot",
+                                                             dir=str(shared_snapshot_directory()))
+                os.close(fd)
+            self.path = Path(path_to_snapshot_file)
+
+            # Write then rename, so an attaching process never maps a partial snapshot
+            temp_path = self.path.with_name(self.path.name + ".tmp")
+            write_snapshot((item.construct_json() for item in all_db_items), temp_path)
+            os.replace(temp_path, self.path)
+            self.owner = True
+
+        self.items = attach(self.path)
+
+    def __enter__(self) -> "SharedItems":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        """Remove a snapshot file written by this object.
+
+        Processes that already attached keep their mapping of the snapshot data.
+        """
+        if self.owner and self.path.is_file():
+            self.path.unlink()
+        self.owner = False
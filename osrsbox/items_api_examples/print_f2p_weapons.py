@@ -31,10 +31,8 @@ if __name__ == "__main__":
     # Load all items
     all_db_items = items_api.load()
 
-    # Loop through all items in the database and print the item name for each item
-    for item in all_db_items:
-        # Check if item is equipable, and is not memebers (aka f2p item)
-        if item.equipable_by_player and not item.members:
-            # If item is a "weapon" of "2h" weapon, print it!
-            if item.equipment.slot == "weapon" or item.equipment.slot == "2h":
-                print(f"{item.id:<6} {item.name}")  # New, f-strings printing method
+    # Query for items equipable by a player, that are not members (aka f2p items),
+    # and are a "weapon" or "2h" weapon, then print them!
+    f2p_weapons = all_db_items.query().where(members=False, slot=("weapon", "2h"))
+    for item in f2p_weapons:
+        print(f"{item.id:<6} {item.name}")  # New, f-strings printing method
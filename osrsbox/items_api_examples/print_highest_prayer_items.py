@@ -31,21 +31,14 @@ if __name__ == "__main__":
     # Load all items
     all_db_items = items_api.load()
 
-    prayer_items = dict()
-
-    # Populate dict
-    for item in all_db_items:
-        if item.equipable_by_player:
-            prayer_items[item.equipment.slot] = {"prayer_bonus": 0, "name": None}
-
-    # Loop through all items in the database
-    for item in all_db_items:
-        if item.equipable_by_player:
-            item_slot = item.equipment.slot
-            prayer_bonus = item.equipment.prayer
-
-            if prayer_bonus > prayer_items[item_slot]["prayer_bonus"]:
-                prayer_items[item_slot] = {"prayer_bonus": prayer_bonus, "name": item.name}
-
-    for item_slot, info_dict in prayer_items.items():
-        print(f"{item_slot:<10} {info_dict['prayer_bonus']:<10} {info_dict['name']}")
+    # Get the columnar table of equipment stats for all equipable items
+    equipment_table = all_db_items.equipment_table()
+
+    # Determine the item with the highest prayer bonus in each slot
+    for item_slot in equipment_table.slots:
+        item_id, prayer_bonus = equipment_table.top_k("prayer", k=1, slot=item_slot)[0]
+        name = all_db_items[item_id].name
+        # Only report items that actually have a prayer bonus
+        if prayer_bonus <= 0:
+            prayer_bonus, name = 0, None
+        print(f"{item_slot:<10} {prayer_bonus:<10} {name}")
@@ -24,8 +24,6 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
 
-from collections import defaultdict
-
 from osrsbox import items_api
 
 
@@ -33,16 +31,12 @@ if __name__ == "__main__":
     # Load all items
     all_db_items = items_api.load()
 
-    top_attack_slash = defaultdict(list)
+    # Get the columnar table of equipment stats for all equipable items
+    equipment_table = all_db_items.equipment_table()
 
-    # Loop the item database
-    for item in all_db_items:
-        if item.equipable_by_player:  # If item is equipable, continue processing
-            # Append equipable item slash bonus, and item name
-            top_attack_slash[item.equipment.attack_slash].append(item.name)
+    # Rank every equipable item by slash attack bonus, highest first
+    top_attack_slash = equipment_table.top_k("attack_slash", k=len(equipment_table))
 
-    # Loop sorted dictionary
-    for slash_attack_bonus, items in sorted(top_attack_slash.items(), reverse=True):
-        # Loop item list
-        for item_name in items:
-            print(f"{slash_attack_bonus:<5} {item_name}")
+    # Loop ranked items
+    for item_id, slash_attack_bonus in top_attack_slash:
+        print(f"{slash_attack_bonus:<5} {all_db_items[item_id].name}")
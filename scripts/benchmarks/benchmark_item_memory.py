@@ -0,0 +1,63 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import gc
+import argparse
+import tracemalloc
+from pathlib import Path
+
+from osrsbox.items_api import all_items
+from osrsbox.items_api.all_items import AllItems
+
+
+def loaded_size(input_path: Path, intern: bool) -> int:
+    """Return the memory allocated by a fully loaded item database, in bytes.
+
+    :param input_path: The item database JSON file or directory.
+    :param intern: Toggles sharing repeated values between items.
+    :return: The traced memory still allocated after loading.
+    """
+    gc.collect()
+    tracemalloc.start()
+    all_db_items = AllItems(input_path, intern=intern)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del all_db_items
+    return size
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the memory of a fully loaded item database, with and without interning.")
+    ap.add_argument("--input", default=None, help="The item database JSON file, directory or snapshot file")
+    args = ap.parse_args()
+
+    input_path = Path(args.input) if args.input else all_items.resolve_items_path()
+    plain_size = loaded_size(input_path, intern=False)
+    interned_size = loaded_size(input_path, intern=True)
+
+    print(f">>> Input: {input_path}")
+    print(f"  > Without interning: {plain_size / 2 ** 20:7.2f} MiB")
+    print(f"  > With interning:    {interned_size / 2 ** 20:7.2f} MiB ({100 * (1 - interned_size / plain_size):4.1f}% smaller)")
+
+
+if __name__ == "__main__":
+    main()
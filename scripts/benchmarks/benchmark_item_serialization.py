@@ -0,0 +1,75 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+import time
+import argparse
+import dataclasses
+from pathlib import Path
+
+from osrsbox.items_api.all_items import AllItems
+
+
+def best_time(function, repeat: int) -> float:
+    """Return the fastest of several runs of a function, in seconds."""
+    times = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark item serialization, using dataclasses.asdict and the item construct_json methods.")
+    ap.add_argument("--input", default=None, help="The item database JSON file or directory")
+    ap.add_argument("--repeat", type=int, default=3, help="The number of runs of each serializer, the fastest is reported")
+    args = ap.parse_args()
+
+    all_db_items = AllItems(Path(args.input)) if args.input else AllItems()
+    items = all_db_items.all_items
+
+    def asdict_dicts():
+        return [dataclasses.asdict(item) for item in items]
+
+    def construct_json_dicts():
+        return [item.construct_json() for item in items]
+
+    def asdict_bytes():
+        return json.dumps({item.id: dataclasses.asdict(item) for item in items}).encode("utf-8")
+
+    assert asdict_dicts() == construct_json_dicts(), "construct_json does not match dataclasses.asdict"
+    assert asdict_bytes() == all_db_items.to_json_bytes(), "to_json_bytes does not match dataclasses.asdict"
+
+    asdict_time = best_time(asdict_dicts, args.repeat)
+    construct_json_time = best_time(construct_json_dicts, args.repeat)
+    asdict_bytes_time = best_time(asdict_bytes, args.repeat)
+    to_json_bytes_time = best_time(all_db_items.to_json_bytes, args.repeat)
+
+    print(f">>> Items: {len(items)}")
+    print(f"  > dataclasses.asdict:           {asdict_time:6.3f} s")
+    print(f"  > construct_json:               {construct_json_time:6.3f} s ({asdict_time / construct_json_time:4.1f}x)")
+    print(f"  > json.dumps(asdict) (all):     {asdict_bytes_time:6.3f} s")
+    print(f"  > AllItems.to_json_bytes (all): {to_json_bytes_time:6.3f} s ({asdict_bytes_time / to_json_bytes_time:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import time
+import random
+import argparse
+import threading
+import statistics
+import http.client
+import urllib.parse
+from pathlib import Path
+from typing import List
+
+from osrsbox.items_api.all_items import AllItems
+from osrsbox.items_api.item_server import ItemServer
+
+
+def request_paths(all_db_items: AllItems, count: int, seed: int) -> List[str]:
+    """Generate a mix of item, batch, slot and search request paths.
+
+    :param all_db_items: The item database being served.
+    :param count: The number of request paths.
+    :param seed: The random seed, so every run requests the same paths.
+    :return: A list of request paths.
+    """
+    rng = random.Random(seed)
+    id_numbers = all_db_items.id_numbers()
+    slots = sorted(all_db_items.index("slot"))
+    names = ["whip", "rune", "dragon", "potion", "bones", "shield"]
+
+    paths = list()
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.85:
+            paths.append(f"/items/{rng.choice(id_numbers)}")
+        elif kind < 0.95:
+            paths.append("/items?ids=" + ",".join(str(rng.choice(id_numbers)) for _ in range(10)))
+        elif kind < 0.98:
+            paths.append(f"/items/search?name={rng.choice(names)}&limit=20")
+        else:
+            paths.append(f"/items/slot/{rng.choice(slots)}")
+    return paths
+
+
+def run_client(url: str, paths: List[str], use_gzip: bool, latencies: List[float]) -> None:
+    """Send requests over a single persistent connection, and record the latency of each request.
+
+    :param url: The base URL of the item server.
+    :param paths: The request paths to send.
+    :param use_gzip: Toggles requesting gzip compressed responses.
+    :param latencies: The list to append the latency of each request to, in seconds.
+    """
+    location = urllib.parse.urlsplit(url)
+    connection = http.client.HTTPConnection(location.hostname, location.port)
+    headers = {"Accept-Encoding": "gzip"} if use_gzip else dict()
+    for path in paths:
+        start = time.perf_counter()
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise ValueError(f"Error: Request failed: {path}: {response.status}. Exiting.")
+    connection.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Load test the osrsbox item server, and report latency percentiles and requests per second.")
+    ap.add_argument("--url", default=None, help="The base URL of a running item server, by default a local server is started")
+    ap.add_argument("--input", default=None, help="The item database file or directory, for the local server")
+    ap.add_argument("--requests", type=int, default=20000, help="The total number of requests")
+    ap.add_argument("--clients", type=int, default=8, help="The number of concurrent clients")
+    ap.add_argument("--gzip", action="store_true", help="Request gzip compressed responses")
+    ap.add_argument("--seed", type=int, default=1, help="The random seed of the request mix")
+    args = ap.parse_args()
+
+    start = time.perf_counter()
+    all_db_items = AllItems(Path(args.input)) if args.input else AllItems()
+    server = None
+    url = args.url
+    if url is None:
+        server = ItemServer(all_db_items).__enter__()
+        url = server.url
+        print(f">>> Local server: {len(all_db_items)} items, loaded in {time.perf_counter() - start:.2f} s")
+
+    paths = request_paths(all_db_items, args.requests, args.seed)
+    per_client = [paths[i::args.clients] for i in range(args.clients)]
+    latencies = [list() for _ in range(args.clients)]
+    threads = [threading.Thread(target=run_client, args=(url, per_client[i], args.gzip, latencies[i]))
+               for i in range(args.clients)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        server.__exit__()
+
+    all_latencies = sorted(latency for client_latencies in latencies for latency in client_latencies)
+    if len(all_latencies) != len(paths):
+        raise SystemExit(">>> ERROR: Not every request completed, see the client errors above.")
+
+    def percentile(p: float) -> float:
+        return all_latencies[min(len(all_latencies) - 1, int(p / 100 * len(all_latencies)))] * 1000
+
+    print(f">>> Requests: {len(paths)}, clients: {args.clients}, gzip: {args.gzip}")
+    print(f"  > Throughput: {len(paths) / elapsed:8.1f} requests/s")
+    print(f"  > Latency:    p50 {percentile(50):6.2f} ms, p99 {percentile(99):6.2f} ms, "
+          f"mean {statistics.mean(all_latencies) * 1000:6.2f} ms, max {all_latencies[-1] * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+import config
+from osrsbox.items_api import all_items
+from osrsbox.items_api import item_snapshot
+
+# Run in a new interpreter: import the package, then load the item database and look up one item
+STARTUP_CODE = """
+import json, sys, time
+start = time.perf_counter()
+from osrsbox import items_api
+imported = time.perf_counter()
+all_db_items = items_api.load(lazy=sys.argv[2] == "lazy", path=sys.argv[1])
+all_db_items[4151].name
+looked_up = time.perf_counter()
+print(json.dumps({"import": imported - start, "first_lookup": looked_up - imported}))
+"""
+
+
+def measure_startup(path_to_items: Path, lazy: bool) -> dict:
+    """Measure the import time, and time to first lookup, of a new interpreter.
+
+    :param path_to_items: The item database file or directory.
+    :param lazy: Toggles loading in lazy mode.
+    :return: A dictionary of the import and first lookup times, in seconds.
+    """
+    result = subprocess.run([sys.executable, "-c", STARTUP_CODE, str(path_to_items), "lazy" if lazy else "eager"],
+                            stdout=subprocess.PIPE, check=True, cwd=str(config.PROJECT_ROOT_PATH))
+    return json.loads(result.stdout)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the import time, and time to first item lookup, of each loading mode.")
+    ap.add_argument("--repeat", type=int, default=5, help="The number of new interpreters for each mode, the median is reported")
+    args = ap.parse_args()
+
+    path_to_items_complete = all_items.resolve_items_path()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Write a snapshot of the item database, for the snapshot loading modes
+        path_to_snapshot = Path(temp_dir) / "items-complete.snapshot"
+        item_snapshot.write_snapshot((item.construct_json() for item in all_items.AllItems(path_to_items_complete)), path_to_snapshot)
+
+        modes = [
+            ("JSON file", path_to_items_complete, False),
+            ("JSON file, lazy", path_to_items_complete, True),
+            ("Snapshot", path_to_snapshot, False),
+            ("Snapshot, lazy", path_to_snapshot, True)
+        ]
+        print(f">>> Interpreters per mode: {args.repeat}, median times")
+        for name, path_to_items, lazy in modes:
+            times = [measure_startup(path_to_items, lazy) for _ in range(args.repeat)]
+            import_time = statistics.median(t["import"] for t in times)
+            lookup_time = statistics.median(t["first_lookup"] for t in times)
+            print(f"  > {name:16s} import {import_time * 1000:7.1f} ms, first lookup {lookup_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import time
+import tempfile
+import argparse
+import urllib.parse
+from pathlib import Path
+
+from extraction_tools_wiki.wiki_page_text import WikiPageText
+from extraction_tools_wiki.wiki_page_text import WikiPageTextBatch
+from extraction_tools_wiki.wiki_extraction_engine import WikiExtractionEngine
+from extraction_tools_wiki.wiki_text_store import WikiTextStore
+from extraction_tools_wiki.wiki_stand_in_server import WikiStandInServer
+
+
+def write_fixtures(path_to_fixtures: Path, page_count: int, page_size: int) -> list:
+    """Write a fixtures directory of generated wiki pages.
+
+    :param path_to_fixtures: The fixtures directory.
+    :param page_count: The number of pages to generate.
+    :param page_size: The approximate size of each page, in characters.
+    :return: A list of the generated page titles.
+    """
+    page_titles = list()
+    for i in range(page_count):
+        page_title = f"Benchmark item {i}"
+        wiki_text = f"{{{{Infobox Item\n|name = {page_title}\n}}}}\n" + "x" * page_size
+        (path_to_fixtures / (urllib.parse.quote(page_title, safe="") + ".wiki")).write_text(wiki_text)
+        page_titles.append(page_title)
+    return page_titles
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark single page, batched and concurrent wiki text extraction against a stand-in OSRS Wiki API.")
+    ap.add_argument("--pages", type=int, default=500, help="The number of pages to extract")
+    ap.add_argument("--page-size", type=int, default=4000, help="The approximate size of each page, in characters")
+    ap.add_argument("--latency", type=float, default=0.02, help="The simulated round trip time of each request, in seconds")
+    ap.add_argument("--max-in-flight", type=int, default=4, help="The maximum number of concurrent requests of the engine")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        page_titles = write_fixtures(Path(temp_dir), args.pages, args.page_size)
+
+        with WikiStandInServer(Path(temp_dir), latency=args.latency) as server:
+            start = time.perf_counter()
+            single_wiki_text = dict()
+            for page_title in page_titles:
+                wiki_page_text = WikiPageText(server.url, page_title, "osrsbox-benchmark", "benchmark@osrsbox.com")
+                wiki_page_text.extract_page_wiki_text()
+                single_wiki_text[page_title] = wiki_page_text.wiki_text
+            single_time = time.perf_counter() - start
+            single_requests = server.request_count
+
+            start = time.perf_counter()
+            wiki_page_text = WikiPageTextBatch(server.url, page_titles, "osrsbox-benchmark", "benchmark@osrsbox.com")
+            wiki_page_text.extract_pages_wiki_text()
+            batch_time = time.perf_counter() - start
+            batch_requests = server.request_count - single_requests
+
+            start = time.perf_counter()
+            store = WikiTextStore(Path(temp_dir) / "extract_page_text_benchmark.jsonl")
+            engine = WikiExtractionEngine(server.url, "osrsbox-benchmark", "benchmark@osrsbox.com",
+                                          max_in_flight=args.max_in_flight, requests_per_second=1000.0)
+            engine.extract_pages_wiki_text(page_titles, store)
+            engine_time = time.perf_counter() - start
+            engine_requests = engine.request_count
+
+        assert wiki_page_text.wiki_text == single_wiki_text, "Batched wiki text does not match single page wiki text"
+        assert dict((page_title, store[page_title]) for page_title in store) == single_wiki_text, "Concurrent wiki text does not match single page wiki text"
+
+    print(f">>> Pages: {args.pages}, latency: {args.latency * 1000:.0f} ms")
+    print(f"  > Single page: {single_requests:5d} requests, {single_time:7.2f} s, {args.pages / single_time:8.1f} pages/s")
+    print(f"  > Batched:     {batch_requests:5d} requests, {batch_time:7.2f} s, {args.pages / batch_time:8.1f} pages/s")
+    print(f"  > Concurrent:  {engine_requests:5d} requests, {engine_time:7.2f} s, {args.pages / engine_time:8.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
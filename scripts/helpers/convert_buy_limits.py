@@ -30,11 +30,6 @@ if __name__ == "__main__":
     # Load all items from osrsbox item API
     all_db_items = items_api.load()
 
-    # Get a dict with: id -> ItemDefinition
-    all_item_ids = {}
-    for item in all_db_items:
-        all_item_ids[item.id] = item
-
     # Load the ge-limits-ids.json file from RuneLite
     ge_limits_path = Path(config.DATA_PATH / "ge-limits-ids.json")
     with open(ge_limits_path) as f:
@@ -44,7 +39,7 @@ if __name__ == "__main__":
     buy_limits = dict()
     for item_id, buy_limit in ge_limits.items():
         item_id = int(item_id)
-        item_name = all_item_ids[item_id].name
+        item_name = all_db_items[item_id].name
         buy_limits[item_name] = buy_limit
 
     # Write out buy limit data file
@@ -23,13 +23,13 @@ import json
 from pathlib import Path
 
 import config
+from extraction_tools_wiki.wiki_text_store import WikiTextStore
 
 
 if __name__ == "__main__":
-    # Get the dictionary of item ID -> wikitext
-    all_wiki_items_path = Path(config.EXTRACTION_WIKI_PATH / "extract_page_text_items.json")
-    with open(all_wiki_items_path) as f:
-        all_wiki_items = json.load(f)
+    # Get the store of wiki page title -> wikitext
+    all_wiki_items_path = Path(config.EXTRACTION_WIKI_PATH / "extract_page_text_items.jsonl")
+    all_wiki_items = WikiTextStore(all_wiki_items_path)
 
     # Read in normalized_names.txt
     all_wiki_normalized_names = dict()
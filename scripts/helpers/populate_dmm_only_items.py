@@ -53,7 +53,13 @@ if __name__ == "__main__":
     # Start processing all items in database
     all_db_items = items_api.load()
 
-    for item in all_db_items:
+    # Use the name index to look up the items, then keep exact (case-sensitive) name matches
+    dmm_only_item_ids = set()
+    for item_name in DMM_MODE_ITEM_NAMES:
+        dmm_only_item_ids.update(all_db_items.ids_by_name(item_name))
+
+    for item_id in sorted(dmm_only_item_ids):
+        item = all_db_items[item_id]
         if item.name in DMM_MODE_ITEM_NAMES:
             dmm_only_items[item.id] = item.name
 
@@ -47,11 +47,12 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 echo -e ">>> Updating item database"
 cd ~/repos/osrsbox-db/items_builder
-python3 builder.py
+python3 builder.py --incremental
 
 echo -e ">>> Runing item population scripts..."
 cd ~/repos/osrsbox-db/scripts/update_items
 python3 generate_items_complete.py
+python3 generate_items_snapshot.py
 python3 generate_items_slot_files.py
 
 # Print remaining tasks to user...
@@ -32,6 +32,8 @@ from typing import List
 from typing import Dict
 
 import config
+from extraction_tools_cache.content_hash import CONTENT_HASH_KEY
+from extraction_tools_cache.content_hash import content_hash
 
 
 class DetermineNewItems:
@@ -40,6 +42,8 @@ class DetermineNewItems:
     Every OSRS weekly update_items has the potential to add, remove or change item
     properties. This class analyzes the OSRS cache dump of the existing
     database entries and compares to a new database dump.
+    Items are compared by content hash (the `content_hash` property, or computed
+    when missing), so only the changed items need a property comparison.
     Calculate the difference between two dictionaries as:
 
     :param current_dict: A dictionary of the new items_scraper.json file
@@ -49,6 +53,32 @@ class DetermineNewItems:
         self.current_dict, self.past_dict = current_dict, past_dict
         self.set_current, self.set_past = set(current_dict.keys()), set(past_dict.keys())
         self.intersect = self.set_current.intersection(self.set_past)
+        self.current_hashes, self.past_hashes = dict(), dict()
+
+    def item_hash(self, item_id: str, item_dict: Dict, hashes: Dict) -> str:
+        """Return the content hash of an item, computed once.
+
+        :param item_id: The item ID number.
+        :param item_dict: A dictionary of item ID to item properties (or an item digest string).
+        :param hashes: The dictionary of computed hashes for the item dictionary.
+        :return: The content hash of the item.
+        """
+        try:
+            return hashes[item_id]
+        except KeyError:
+            pass
+        item = item_dict[item_id]
+        if isinstance(item, dict):
+            item_hash = item.get(CONTENT_HASH_KEY) or content_hash(item)
+        else:
+            item_hash = item
+        hashes[item_id] = item_hash
+        return item_hash
+
+    def is_changed(self, item_id: str) -> bool:
+        """Return if an item in both dictionaries has changed, by comparing content hashes."""
+        return (self.item_hash(item_id, self.current_dict, self.current_hashes) !=
+                self.item_hash(item_id, self.past_dict, self.past_hashes))
 
     def added(self) -> List:
         """Return a set of only new item IDs that is sorted."""
@@ -64,13 +94,13 @@ class DetermineNewItems:
 
     def changed(self) -> List:
         """Return a set of only changed items (including properties) that is sorted."""
-        changed_items = set(o for o in self.intersect if self.past_dict[o] != self.current_dict[o])
+        changed_items = set(o for o in self.intersect if self.is_changed(o))
         changed_items = sorted(changed_items)
         return changed_items
 
     def unchanged(self) -> List:
         """Return a set of only unchanged items (including properties) that is sorted."""
-        unchanged_items = set(o for o in self.intersect if self.past_dict[o] == self.current_dict[o])
+        unchanged_items = set(o for o in self.intersect if not self.is_changed(o))
         unchanged_items = sorted(unchanged_items)
         return unchanged_items
 
@@ -110,7 +140,9 @@ def determine_new_items():
     for itemID in changed:
         changed_keys = list()
         for key in new_items[itemID]:
-            if new_items[itemID][key] != old_items[itemID][key]:
+            if key == CONTENT_HASH_KEY:
+                continue
+            if new_items[itemID][key] != old_items[itemID].get(key):
                 changed_keys.append(key)
         if changed_keys:
             print("    - %s,%s,%s" % (itemID,
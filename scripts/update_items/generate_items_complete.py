@@ -24,11 +24,11 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
 
-import json
 from pathlib import Path
 
 import config
 from osrsbox import items_api
+from osrsbox.items_api import offset_index
 
 
 def main():
@@ -37,21 +37,16 @@ def main():
     path_to_items_json = Path(config.DOCS_PATH / "items-json")
     all_db_items = items_api.all_items.AllItems(path_to_items_json)
 
-    items = {}
+    # Serialize every item once, for both output files
+    items = list(all_db_items.iter_json())
 
-    for item in all_db_items:
-        json_out = item.construct_json()
-        items[item.id] = json_out
-
-    # Save all items to docs/items_complete.json
+    # Save all items to docs/items_complete.json, with the offset index for lazy loading
     out_fi = Path(config.DOCS_PATH / "items-complete.json")
-    with open(out_fi, "w") as f:
-        json.dump(items, f)
+    offset_index.write_items_complete(items, out_fi)
 
-    # Save all items to osrsbox/docs/items_complete.json
+    # Save all items to osrsbox/docs/items_complete.json, with the offset index for lazy loading
     out_fi = Path(config.PACKAGE_ROOT_PATH / "docs" / "items-complete.json")
-    with open(out_fi, "w") as f:
-        json.dump(items, f)
+    offset_index.write_items_complete(items, out_fi)
 
 
 if __name__ == "__main__":
@@ -25,7 +25,6 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import json
-import collections
 from pathlib import Path
 
 import config
@@ -37,17 +36,14 @@ def main():
     # Read in the item database content
     all_db_items = items_api.load()
 
-    items = collections.defaultdict(list)
-
-    # Fetch every equipable item with an item slot value
-    for item in all_db_items:
-        if item.equipable_by_player:
-            items[item.equipment.slot].append(item)
+    # Fetch every equipable item, grouped by item slot value, using the slot index
+    items = all_db_items.index("slot")
 
     # Process each item found, and add to an individual file for each equipment slot
     for slot in items:
         json_out = {}
-        for item in items[slot]:
+        for item_id in items[slot]:
+            item = all_db_items[item_id]
             json_out_temp = item.construct_json()
             json_out[item.id] = json_out_temp
         out_fi = Path(config.DOCS_PATH / "items-json-slot" / f"items-{slot}.json")
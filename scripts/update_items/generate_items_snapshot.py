@@ -0,0 +1,54 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Simple script to generate the items-complete.snapshot file from the items-json
+folder containing all the single JSON files in the osrsbox-db items
+database. The snapshot is a compact binary version of the items-complete.json
+file that can be memory-mapped by the items API.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+from pathlib import Path
+
+import config
+from osrsbox import items_api
+from osrsbox.items_api import item_snapshot
+
+
+def main():
+    """The main function for generating the `docs/items-complete.snapshot` file"""
+    # Read in the item database content
+    path_to_items_json = Path(config.DOCS_PATH / "items-json")
+    all_db_items = items_api.all_items.AllItems(path_to_items_json)
+
+    items = [item.construct_json() for item in all_db_items]
+
+    # Save all items to docs/items-complete.snapshot
+    out_fi = Path(config.DOCS_PATH / "items-complete.snapshot")
+    item_snapshot.write_snapshot(items, out_fi)
+
+    # Save all items to osrsbox/docs/items-complete.snapshot
+    out_fi = Path(config.PACKAGE_ROOT_PATH / "docs" / "items-complete.snapshot")
+    item_snapshot.write_snapshot(items, out_fi)
+
+
+if __name__ == "__main__":
+    print("Generating items-complete.snapshot file...")
+    main()
@@ -24,6 +24,7 @@ from pathlib import Path
 import config
 from extraction_tools_cache import osrs_cache_constants
 from extraction_tools_cache import osrs_cache_data
+from extraction_tools_cache import cache_pipeline
 from extraction_tools_cache import extract_summary_cache_data
 from extraction_tools_cache import extract_summary_model_ids
 from extraction_tools_cache import extract_attackable_npcs
@@ -36,30 +37,20 @@ if __name__ == '__main__':
     print(">>> CACHE COMPRESSION: Compressing OSRS Cache data for items, npcs and objects...")
     osrs_cache_data.main(config.EXTRACTION_CACHE_PATH, True)
 
-    # STAGE TWO: Generate all the summary JSON files
+    # STAGE TWO: Generate all the summary and additional cache-related JSON files
 
-    print(">>> SUMMARY FILES: Extracting summary files for items, npcs and objects...")
-    # Loop the three cache types (items, npcs and objects), and extract summary JSON file
-    for cache_type_name in osrs_cache_constants.CACHE_DUMP_TYPES:
-        # Set path to compressed cache file, then extract file
-        compressed_cache_file_name = cache_type_name + ".json"
-        compressed_cache_file = Path(config.EXTRACTION_CACHE_PATH) / compressed_cache_file_name
-        extract_summary_cache_data.extract_summary_file(compressed_cache_file, cache_type_name)
+    print(">>> CACHE EXTRACTION: Extracting summary files, model IDs, attackable NPCs and item metadata...")
+    # Register every extractor, so each compressed cache file is decompressed once
+    pipeline = cache_pipeline.CachePipeline()
+    # The items-summary.json is instead generated by the items cache data extractor
+    pipeline.register(extract_summary_cache_data.SummaryExtractor("npcs"))
+    pipeline.register(extract_summary_cache_data.SummaryExtractor("objects"))
+    pipeline.register(extract_summary_model_ids.ModelIdsExtractor())
+    pipeline.register(extract_attackable_npcs.AttackableNpcsExtractor())
+    pipeline.register(extract_items_cache_data.ItemsCacheDataExtractor())
+    pipeline.run(cache_pipeline.cache_files(config.EXTRACTION_CACHE_PATH))
 
-    # STAGE THREE: Generate additional cache-related JSON files
-
-    print(">>> MODEL IDS: Extracting OSRS model ID numbers from cache definition files...")
-    extract_summary_model_ids.main(config.EXTRACTION_CACHE_PATH)
-
-    print(">>> ATTACKABLE NPCS: Extracting and merging OSRS attackable NPC definition files...")
-    compressed_cache_file_npcs = Path(config.EXTRACTION_CACHE_PATH / "npcs.json")
-    extract_attackable_npcs.extract_attackable_npcs(compressed_cache_file_npcs)
-
-    print(">>> ITEMS CACHE DATA: Extracting detailed item metadata...")
-    compressed_cache_file_items = Path(config.EXTRACTION_CACHE_PATH / "items.json")
-    extract_items_cache_data.extract_items_cache_data(compressed_cache_file_items)
-
-    # STAGE FOUR: Determine, then print any manual updates required (usually for tests)
+    # STAGE THREE: Determine, then print any manual updates required (usually for tests)
 
     print(">>> Manual updates required:")
     # Check cache definition length for test.test_osrs_cache_data module
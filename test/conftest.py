@@ -19,9 +19,14 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
 
+import json
 import pytest
 from pathlib import Path
 
+from osrsbox.items_api import all_items
+from osrsbox.items_api import item_snapshot
+from osrsbox.items_api import offset_index
+
 
 PATH_TO_TEST_DIR = Path(__file__).absolute().parent
 
@@ -34,3 +39,43 @@ def path_to_docs_dir() -> Path:
 @pytest.fixture(scope="session")
 def path_to_cache_dir() -> Path:
     return PATH_TO_TEST_DIR / ".." / "extraction_tools_cache"
+
+
+@pytest.fixture(scope="session")
+def read_test_items(path_to_docs_dir: Path):
+    """Return a function that reads the JSON of items from the docs/items-json directory."""
+    def read(id_numbers) -> list:
+        items = list()
+        for id_number in id_numbers:
+            with open(path_to_docs_dir / "items-json" / f"{id_number}.json") as f:
+                items.append(json.load(f))
+        return items
+    return read
+
+
+@pytest.fixture(scope="session")
+def load_test_items(read_test_items, tmp_path_factory):
+    """Return a function that loads items from the docs/items-json directory into an AllItems object.
+
+    The items are written to a temporary directory of JSON files (`json`), an
+    `items-complete.json` file (`items-complete`) or a snapshot file (`snapshot`).
+    Any other keyword arguments are passed to AllItems.
+    """
+    def load(id_numbers, data_format: str = "json", **kwargs) -> all_items.AllItems:
+        items = read_test_items(id_numbers)
+        path_to_data = tmp_path_factory.mktemp("items")
+        if data_format == "json":
+            path_to_data = path_to_data / "items-json"
+            path_to_data.mkdir()
+            for item in items:
+                (path_to_data / f"{item['id']}.json").write_text(json.dumps(item))
+        elif data_format == "items-complete":
+            path_to_data = path_to_data / "items-complete.json"
+            offset_index.dump_items_complete({str(item["id"]): item for item in items}, path_to_data)
+        elif data_format == "snapshot":
+            path_to_data = path_to_data / "items-complete.snapshot"
+            item_snapshot.write_snapshot(items, path_to_data)
+        else:
+            raise ValueError(f"Error: Unknown item data format: {data_format}. Exiting.")
+        return all_items.AllItems(path_to_data, **kwargs)
+    return load
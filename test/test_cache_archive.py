@@ -0,0 +1,88 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from extraction_tools_cache import cache_archive
+from extraction_tools_cache import content_hash
+from extraction_tools_cache import osrs_cache_data
+
+
+@pytest.fixture(scope="module")
+def npc_definitions(path_to_cache_dir: Path) -> osrs_cache_data.CacheDefinitionFiles:
+    definitions = osrs_cache_data.CacheDefinitionFiles(path_to_cache_dir / "npcs.json")
+    definitions.decompress_cache_file()
+    return definitions
+
+
+@pytest.mark.parametrize("codec,use_dictionary", [
+    ("zlib", False),
+    ("zlib", True),
+    ("zstd", True)
+])
+def test_cache_archive(npc_definitions, tmp_path: Path, codec, use_dictionary):
+    if codec == "zstd":
+        pytest.importorskip("zstandard")
+
+    id_numbers = list(npc_definitions)[:500]
+    records = [(int(id_number), json.dumps(npc_definitions[id_number]).encode("utf-8")) for id_number in reversed(id_numbers)]
+    path_to_archive = tmp_path / f"npcs{cache_archive.ARCHIVE_SUFFIX}"
+    cache_archive.write_cache_archive(records, path_to_archive, codec, use_dictionary)
+    assert cache_archive.is_cache_archive(path_to_archive)
+
+    # The archive is read with the same interface as the compressed JSON file, in ID number order
+    definitions = osrs_cache_data.CacheDefinitionFiles(path_to_archive)
+    definitions.decompress_cache_file()
+    assert len(definitions) == 500
+    assert list(definitions) == id_numbers
+    assert definitions["258"] == npc_definitions["258"]
+    assert definitions.misses == 1
+    assert all(definitions[id_number] == npc_definitions[id_number] for id_number in id_numbers)
+
+    streamed = dict(definitions.iter_definitions(fields=["name"]))
+    assert streamed["258"] == {"name": npc_definitions["258"]["name"]}
+
+    # The content hashes are stored in the archive index
+    content_hashes = definitions.content_hashes()
+    assert list(content_hashes) == id_numbers
+    assert content_hashes["258"] == content_hash.content_hash(npc_definitions["258"])
+
+
+def test_compress_cache_archive(npc_definitions, tmp_path: Path):
+    for id_number in list(npc_definitions)[:100]:
+        with open(tmp_path / f"{id_number}.json", "w") as f:
+            json.dump(npc_definitions[id_number], f, indent=4)
+
+    path_to_archive = tmp_path / f"npcs{cache_archive.ARCHIVE_SUFFIX}"
+    osrs_cache_data.compress_single_cache_type(tmp_path, path_to_archive, archive_codec="zlib")
+    archive = cache_archive.CacheArchive(path_to_archive)
+    assert json.loads(archive.read("1")) == npc_definitions["1"]
+    assert "100" not in archive
+    archive.close()
+
+
+def test_cache_archive_not_an_archive(path_to_cache_dir: Path):
+    assert not cache_archive.is_cache_archive(path_to_cache_dir / "npcs.json")
+    with pytest.raises(ValueError):
+        cache_archive.CacheArchive(path_to_cache_dir / "npcs.json")
@@ -0,0 +1,102 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+from pathlib import Path
+
+import config
+from extraction_tools_cache import osrs_cache_data
+from extraction_tools_cache import extract_attackable_npcs
+from extraction_tools_cache import extract_items_cache_data
+from extraction_tools_cache import extract_summary_cache_data
+from extraction_tools_cache.cache_pipeline import CacheExtractor
+from extraction_tools_cache.cache_pipeline import CachePipeline
+
+ITEM_DEFINITION = {"name": "null", "isTradeable": True, "members": True, "notedID": -1, "notedTemplate": -1,
+                   "stackable": 0, "interfaceOptions": [], "cost": 1, "placeholderId": -1, "placeholderTemplateId": -1,
+                   "boughtId": -1, "boughtTemplateId": -1, "inventoryModel": 1}
+
+
+class CountingExtractor(CacheExtractor):
+    cache_types = ("npcs",)
+    fields = ("id",)
+
+    def __init__(self):
+        self.count = 0
+
+    def visit(self, cache_type, id_number, definition):
+        assert cache_type == "npcs"
+        self.count += 1
+
+
+def test_cache_pipeline_single_pass(path_to_cache_dir: Path, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(config, "DOCS_PATH", tmp_path)
+    monkeypatch.setattr(config, "DATA_PATH", tmp_path)
+    path_to_npcs = path_to_cache_dir / "npcs.json"
+
+    passes = list()
+    iter_definitions = osrs_cache_data.CacheDefinitionFiles.iter_definitions
+
+    def counting_iter_definitions(self, fields=None, **kwargs):
+        passes.append(fields)
+        return iter_definitions(self, fields, **kwargs)
+
+    monkeypatch.setattr(osrs_cache_data.CacheDefinitionFiles, "iter_definitions", counting_iter_definitions)
+
+    counter = CountingExtractor()
+    pipeline = CachePipeline([counter, extract_summary_cache_data.SummaryExtractor("npcs")])
+    attackable_npcs = pipeline.register(extract_attackable_npcs.AttackableNpcsExtractor())
+    pipeline.run({"npcs": path_to_npcs, "objects": path_to_cache_dir / "objects-missing.json"})
+
+    # A single pass over npcs, with all properties for the attackable NPCs, and no pass over objects
+    assert passes == [None]
+    assert counter.count == 8721
+
+    definitions = osrs_cache_data.CacheDefinitionFiles(path_to_npcs)
+    definitions.decompress_cache_file()
+    with open(tmp_path / "attackable-npcs.json") as f:
+        assert json.load(f) == attackable_npcs.attackable_npcs
+    assert attackable_npcs.attackable_npcs["3127"] == definitions["3127"]
+    with open(tmp_path / "npcs-summary.json") as f:
+        assert json.load(f)["3127"] == {"id": 3127, "name": definitions["3127"]["name"]}
+
+
+def test_cache_pipeline_items_cache_data(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(config, "DOCS_PATH", tmp_path)
+    monkeypatch.setattr(config, "EXTRACTION_CACHE_PATH", tmp_path)
+
+    # An item, the noted item, and the placeholder item
+    item_definitions = [dict(ITEM_DEFINITION, id=1, name="Abyssal whip", notedID=2, cost=120001, interfaceOptions=["Wield"]),
+                        dict(ITEM_DEFINITION, id=2, notedID=1, notedTemplate=799),
+                        dict(ITEM_DEFINITION, id=3, placeholderId=1, placeholderTemplateId=14401)]
+    with open(tmp_path / "items.json", "w") as f:
+        json.dump(dict(osrs_cache_data.compress_definition_file(item) for item in item_definitions), f)
+
+    extract_items_cache_data.extract_items_cache_data(tmp_path / "items.json")
+    with open(tmp_path / "items-cache-data.json") as f:
+        items_cache_data = json.load(f)
+
+    assert items_cache_data["1"]["equipable"] is True
+    assert items_cache_data["1"]["noteable"] is True
+    assert items_cache_data["2"]["name"] == "Abyssal whip"
+    assert items_cache_data["2"]["highalch"] == 72000
+    assert items_cache_data["3"]["name"] == "Abyssal whip"
+    assert items_cache_data["3"]["placeholder"] is True
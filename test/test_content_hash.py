@@ -0,0 +1,56 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+from extraction_tools_cache.content_hash import content_hash
+from scripts.update_items.determine_new_items import DetermineNewItems
+
+
+def test_content_hash():
+    item = {"id": 4151, "name": "Abyssal whip", "members": True, "cost": 120001}
+    reordered = {"cost": 120001, "members": True, "name": "Abyssal whip", "id": 4151}
+
+    # The hash is stable, independent of key order, and excludes the hash property
+    assert content_hash(item) == "a152568d09e49ef4d1f2267a4a0c8b4e"
+    assert content_hash(item) == content_hash(reordered)
+    assert content_hash(item) == content_hash(dict(item, content_hash="0" * 32))
+    assert content_hash(item) != content_hash(dict(item, cost=120002))
+
+
+def test_determine_new_items_content_hash():
+    past = {
+        "1277": {"id": 1277, "name": "Bronze sword"},
+        "4151": {"id": 4151, "name": "Abyssal whip"},
+        "995": {"id": 995, "name": "Coins"}
+    }
+    current = {
+        "1277": {"id": 1277, "name": "Bronze sword"},
+        "4151": {"id": 4151, "name": "Abyssal whip (or)"},
+        "2": {"id": 2, "name": "Cannonball"}
+    }
+    for item in current.values():
+        item["content_hash"] = content_hash(item)
+
+    # Items with a content hash are compared with items without one
+    dd = DetermineNewItems(current, past)
+    assert dd.added() == ["2"]
+    assert dd.removed() == ["995"]
+    assert dd.changed() == ["4151"]
+    assert dd.unchanged() == ["1277"]
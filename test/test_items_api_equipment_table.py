@@ -0,0 +1,86 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: osrsbox.items_api.equipment_table
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from osrsbox.items_api import all_items
+from osrsbox.items_api import equipment_table
+from osrsbox.items_api import item_snapshot
+
+# Abyssal whip, Dragon scimitar, Bronze sword, Rune full helm, Holy symbol, Coins
+TEST_ITEM_IDS = [4151, 4587, 1277, 1163, 1718, 995]
+
+
+@pytest.fixture(params=["numpy", "array"])
+def use_backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(equipment_table, "numpy", None)
+
+
+@pytest.fixture(params=["json", "snapshot"])
+def test_items(request, load_test_items) -> all_items.AllItems:
+    return load_test_items(TEST_ITEM_IDS, request.param, lazy=request.param == "snapshot")
+
+
+def test_equipment_table_columns(use_backend, test_items: all_items.AllItems):
+    table = test_items.equipment_table()
+    assert list(table.ids) == [1163, 1277, 1718, 4151, 4587]
+    assert list(table["attack_slash"]) == [0, 3, 0, 82, 67]
+    assert list(table["attack_speed"]) == [equipment_table.NO_ATTACK_SPEED, 4, equipment_table.NO_ATTACK_SPEED, 4, 4]
+    assert [table.slots[code] for code in table.slot_codes] == ["head", "weapon", "neck", "weapon", "weapon"]
+
+
+def test_equipment_table_queries(use_backend, test_items: all_items.AllItems):
+    table = test_items.equipment_table()
+    assert table.top_k("attack_slash", 2, slot="weapon") == [(4151, 82), (4587, 67)]
+    assert table.top_k("attack_speed", 2) == [(1277, 4), (4151, 4)]
+    assert table.argmax("prayer") == 1718
+    assert table.argmax("prayer", slot="ring") is None
+    assert table.filter(slot="weapon", attack_slash=60, melee_strength=70) == [4151]
+
+
+@pytest.mark.parametrize("data_format", ["json", "snapshot"])
+def test_equipment_table_missing_stats(use_backend, data_format: str, read_test_items, tmp_path: Path):
+    item = read_test_items([4151])[0]
+    item["equipment"]["prayer"] = None
+    item["weapon"]["attack_speed"] = None
+
+    if data_format == "snapshot":
+        path_to_items = tmp_path / "items-complete.snapshot"
+        item_snapshot.write_snapshot([item], path_to_items)
+    else:
+        path_to_items = tmp_path / "items-json"
+        path_to_items.mkdir()
+        (path_to_items / "4151.json").write_text(json.dumps(item))
+
+    table = all_items.AllItems(path_to_items).equipment_table()
+    assert list(table.ids) == [4151]
+    assert list(table["prayer"]) == [equipment_table.NO_BONUS]
+    assert list(table["attack_speed"]) == [equipment_table.NO_ATTACK_SPEED]
+    assert list(table["attack_slash"]) == [82]
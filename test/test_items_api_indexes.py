@@ -0,0 +1,54 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: osrsbox.items_api.all_items (secondary indexes)
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import pytest
+
+from osrsbox.items_api import all_items
+from osrsbox.items_api import item_snapshot
+
+# Abyssal whip (and noted), Bronze sword (and noted), Rune full helm, Coins
+TEST_ITEM_IDS = [4151, 4152, 1277, 1278, 1163, 995]
+
+
+@pytest.fixture(params=["json", "snapshot"])
+def test_items(request, load_test_items) -> all_items.AllItems:
+    return load_test_items(TEST_ITEM_IDS, request.param, lazy=True)
+
+
+def test_all_items_indexes(test_items: all_items.AllItems):
+    assert test_items.ids_by_name("ABYSSAL whip") == (4151, 4152)
+    assert test_items.ids_by_name("Dragon scimitar") == ()
+    assert test_items.ids_by_slot("weapon") == (1277, 4151)
+    assert test_items.ids_by_members(False) == (995, 1163, 1277, 1278)
+    assert test_items.ids_by_tradeable_on_ge(True) == (1163, 1277, 4151)
+    assert test_items.ids_by_linked_id(4151) == (4152,)
+
+    # Indexes are built from the snapshot columns, without decoding the items
+    if isinstance(test_items.item_index, item_snapshot.SnapshotReader):
+        assert not test_items.all_items_dict
+
+
+def test_all_items_index_unknown_field(test_items: all_items.AllItems):
+    with pytest.raises(ValueError):
+        test_items.index("examine")
@@ -0,0 +1,69 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import copy
+import pickle
+
+import pytest
+
+# Dragon scimitar and Dragon longsword (same stances and requirements), Abyssal whip (and noted)
+TEST_ITEM_IDS = [4587, 1305, 4151, 4152]
+
+
+def test_item_interner(load_test_items):
+    interned = load_test_items(TEST_ITEM_IDS, intern=True)
+    plain = load_test_items(TEST_ITEM_IDS)
+
+    # Interning does not change the items, or the item JSON
+    assert interned.to_json_bytes() == plain.to_json_bytes()
+    assert [item for item in interned] == [item for item in plain]
+
+    # Repeated values are shared between items
+    dragon_scimitar, dragon_longsword = interned[4587], interned[1305]
+    assert dragon_scimitar.weapon.stances is dragon_longsword.weapon.stances
+    assert dragon_scimitar.equipment.requirements is dragon_longsword.equipment.requirements
+    assert dragon_scimitar.equipment.slot is interned[4151].equipment.slot
+    assert interned[4151].url is interned[4152].url
+    assert plain[4587].equipment.requirements is not plain[1305].equipment.requirements
+    assert isinstance(dragon_scimitar.weapon.stances, list)
+
+    # The shared values are read-only, so one item can not change another
+    with pytest.raises(TypeError):
+        dragon_scimitar.equipment.requirements["attack"] = 1
+    with pytest.raises(TypeError):
+        dragon_scimitar.weapon.stances[0]["combat_style"] = "hack"
+    with pytest.raises(TypeError):
+        dragon_scimitar.weapon.stances.append(dict())
+    assert dragon_longsword.equipment.requirements["attack"] == 60
+    assert dragon_longsword == plain[1305]
+
+    # Copies of an interned item are equal, and can be modified
+    for copied in (copy.deepcopy(dragon_scimitar), pickle.loads(pickle.dumps(dragon_scimitar))):
+        assert copied == dragon_scimitar
+        copied.equipment.requirements = dict(copied.equipment.requirements, attack=1)
+        assert dragon_scimitar.equipment.requirements["attack"] == 60
+
+
+def test_item_interner_disabled(load_test_items):
+    plain = load_test_items(TEST_ITEM_IDS)
+    assert plain.interner is None
+    plain[4587].equipment.requirements["attack"] = 1
+    assert plain[1305].equipment.requirements["attack"] == 60
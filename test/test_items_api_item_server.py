@@ -0,0 +1,93 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import gzip
+import json
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from osrsbox.items_api.item_server import ItemServer
+
+# Abyssal whip (weapon), Bronze full helm (equipment), Coins (stackable), noted Abyssal whip
+TEST_ITEM_IDS = [4151, 1155, 995, 4152]
+
+
+@pytest.fixture(scope="module")
+def item_server(load_test_items) -> ItemServer:
+    with ItemServer(load_test_items(TEST_ITEM_IDS)) as server:
+        yield server
+
+
+def _get(url: str, headers: dict = None):
+    request = urllib.request.Request(url, headers=headers or dict())
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_item_server_item(item_server: ItemServer, path_to_docs_dir: Path):
+    with open(path_to_docs_dir / "items-json" / "4151.json") as f:
+        expected = json.load(f)
+
+    status, headers, body = _get(f"{item_server.url}/items/4151")
+    assert status == 200
+    assert json.loads(body) == expected
+    etag = headers["ETag"]
+
+    # The gzip response has its own strong ETag, and either ETag is not modified
+    status, headers, body = _get(f"{item_server.url}/items/4151", {"Accept-Encoding": "gzip"})
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["ETag"] != etag
+    assert json.loads(gzip.decompress(body)) == expected
+    gzip_etag = headers["ETag"]
+    for request_headers, matched_etag in [({"If-None-Match": etag}, etag),
+                                          ({"If-None-Match": gzip_etag, "Accept-Encoding": "gzip"}, gzip_etag),
+                                          ({"If-None-Match": "*", "Accept-Encoding": "gzip"}, gzip_etag),
+                                          ({"If-None-Match": "*"}, etag)]:
+        status, headers, _ = _get(f"{item_server.url}/items/4151", request_headers)
+        assert status == 304
+        assert headers["ETag"] == matched_etag
+
+    assert _get(f"{item_server.url}/items/1")[0] == 404
+    assert _get(f"{item_server.url}/unknown")[0] == 404
+    assert _get(f"{item_server.url}/items/1", {"If-None-Match": etag})[0] == 404
+    assert _get(f"{item_server.url}/unknown", {"If-None-Match": "*"})[0] == 404
+
+
+def test_item_server_queries(item_server: ItemServer):
+    status, _, body = _get(f"{item_server.url}/items?ids=995,4151,1")
+    assert status == 200
+    assert list(json.loads(body)) == ["995", "4151"]
+
+    assert list(json.loads(_get(f"{item_server.url}/items/slot/head")[2])) == ["1155"]
+    assert list(json.loads(_get(f"{item_server.url}/items/search?name=WHIP")[2])) == ["4151", "4152"]
+    assert list(json.loads(_get(f"{item_server.url}/items/search?name=whip&limit=1")[2])) == ["4151"]
+
+    status, _, body = _get(f"{item_server.url}/items?ids=abc")
+    assert status == 400
+    assert "error" in json.loads(body)
+    assert _get(f"{item_server.url}/items/search")[0] == 400
+    assert _get(f"{item_server.url}/items/search?name=")[0] == 400
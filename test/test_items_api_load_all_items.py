@@ -23,9 +23,17 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import os
+import sys
+import json
+import subprocess
+import dataclasses
 from pathlib import Path
 
+import pytest
+
+from osrsbox import items_api
 from osrsbox.items_api import all_items
+from osrsbox.items_api import offset_index
 
 NUMBER_OF_ITEMS = 21905  # The current number of items being loaded from the db
 
@@ -44,3 +52,89 @@ def test_all_items_load_items_complete(path_to_docs_dir: Path):
 
     all_db_items = all_items.AllItems(str(path_to_items_complete))
     assert len(all_db_items.all_items) == NUMBER_OF_ITEMS
+
+
+def _write_items_complete(path_to_docs_dir: Path, out_fi: Path, id_numbers) -> dict:
+    items = dict()
+    for id_number in id_numbers:
+        with open(path_to_docs_dir / "items-json" / f"{id_number}.json") as f:
+            items[id_number] = json.load(f)
+    offset_index.dump_items_complete(items, out_fi)
+    return items
+
+
+def test_all_items_dump_items_complete(path_to_docs_dir: Path, tmp_path: Path):
+    out_fi = tmp_path / "items-complete.json"
+    items = _write_items_complete(path_to_docs_dir, out_fi, [2, 4151, 11802])
+
+    assert out_fi.read_text() == json.dumps(items)
+    assert offset_index.scan_offsets(out_fi.read_bytes()) == {
+        int(id_number): tuple(offset)
+        for id_number, offset in json.loads(offset_index.index_file_path(out_fi).read_text())["offsets"].items()
+    }
+
+
+@pytest.mark.parametrize("prebuilt_index", [True, False])
+def test_all_items_load_items_complete_lazy(path_to_docs_dir: Path, tmp_path: Path, prebuilt_index: bool):
+    out_fi = tmp_path / "items-complete.json"
+    items = _write_items_complete(path_to_docs_dir, out_fi, [2, 4151, 11802])
+    if not prebuilt_index:
+        offset_index.index_file_path(out_fi).unlink()
+
+    all_db_items = all_items.AllItems(out_fi, lazy=True)
+    assert len(all_db_items) == 3
+    assert not all_db_items.all_items_dict
+
+    assert all_db_items[4151].name == "Abyssal whip"
+    assert list(all_db_items.all_items_dict) == [4151]
+
+    assert [item.construct_json() for item in all_db_items] == list(items.values())
+    with pytest.raises(KeyError):
+        all_db_items[1]
+
+
+def test_all_items_load_items_json_lazy(path_to_docs_dir: Path):
+    all_db_items = all_items.AllItems(path_to_docs_dir / "items-json", lazy=True)
+    assert len(all_db_items) == NUMBER_OF_ITEMS
+    assert all_db_items[4151].name == "Abyssal whip"
+    assert len(all_db_items.all_items_dict) == 1
+
+
+def test_all_items_to_json_bytes(load_test_items, tmp_path: Path):
+    # Cannonball, Coins, Bronze full helm, Abyssal whip (and noted), Dragon scimitar, Armadyl godsword
+    all_db_items = load_test_items([2, 995, 1155, 4151, 4152, 4587, 11802], "items-complete")
+
+    # The fast serializer output is identical to dataclasses.asdict, including key order
+    items = {item.id: dataclasses.asdict(item) for item in all_db_items}
+    for item in all_db_items:
+        assert json.dumps(item.construct_json()) == json.dumps(items[item.id])
+    assert all_db_items[4151].construct_json()["weapon"]["stances"] is not all_db_items[4151].weapon.stances
+
+    assert all_db_items.to_json_bytes() == json.dumps(items).encode("utf-8")
+
+    out_fi = tmp_path / "items-complete.json"
+    all_db_items.write_items_complete(out_fi)
+    assert out_fi.read_bytes() == all_db_items.to_json_bytes()
+    assert all_items.AllItems(out_fi, lazy=True)[4151] == all_db_items[4151]
+
+
+def test_all_items_resolve_items_path(path_to_docs_dir: Path, tmp_path: Path, monkeypatch):
+    # Importing the package does not touch the item database, or import NumPy
+    code = "import sys, osrsbox.items_api; assert 'numpy' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True, env=dict(os.environ, OSRSBOX_ITEMS_PATH=str(tmp_path / "missing")),
+                   cwd=str(Path(all_items.__file__).parents[2]))
+
+    out_fi = tmp_path / "items-complete.json"
+    _write_items_complete(path_to_docs_dir, out_fi, [2, 4151])
+
+    # The path is resolved when loading: an argument, then the environment variable, then the defaults
+    monkeypatch.setenv(all_items.ITEMS_PATH_ENVIRONMENT_VARIABLE, str(out_fi))
+    assert all_items.resolve_items_path() == out_fi
+    assert items_api.load().id_numbers() == [2, 4151]
+    assert all_items.resolve_items_path(path_to_docs_dir) == path_to_docs_dir
+
+    monkeypatch.delenv(all_items.ITEMS_PATH_ENVIRONMENT_VARIABLE)
+    monkeypatch.setattr(all_items, "DEFAULT_ITEMS_COMPLETE_PATHS", (tmp_path / "missing.json",))
+    with pytest.raises(ValueError):
+        all_items.AllItems()
+    assert len(items_api.load(lazy=True, path=out_fi)) == 2
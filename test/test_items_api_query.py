@@ -0,0 +1,117 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+from pathlib import Path
+
+import pytest
+
+from osrsbox.items_api import all_items
+from osrsbox.items_api import item_snapshot
+from osrsbox.items_api import offset_index
+from osrsbox.items_api.item_query import field_value
+
+# Abyssal whip (and noted), Bronze sword (and noted), Rune full helm, Coins
+TEST_ITEM_IDS = [4151, 4152, 1277, 1278, 1163, 995]
+
+
+@pytest.fixture(params=["items-complete", "snapshot"])
+def test_items(request, load_test_items) -> all_items.AllItems:
+    return load_test_items(TEST_ITEM_IDS, request.param, lazy=request.param == "snapshot")
+
+
+def test_item_query_where(test_items: all_items.AllItems):
+    assert test_items.query().ids() == sorted(TEST_ITEM_IDS)
+    assert test_items.query().where(slot=("weapon", "head"), members=False).ids() == [1163, 1277]
+    assert test_items.query().where(name="Abyssal whip", noted=True).ids() == [4152]
+    assert test_items.query().where(name="abyssal whip").ids() == []
+    assert test_items.query().where(attack_slash=82).ids() == [4151]
+    assert test_items.query().where(attack_speed=4).ids() == [1277, 4151]
+    assert test_items.query().where(weapon_type=("whips", "slash_swords")).ids() == [4151]
+
+
+def test_item_query_where_none(test_items: all_items.AllItems):
+    assert test_items.query().where(linked_id=None).ids() == [995]
+    assert test_items.query().where(slot=None).ids() == [995, 1278, 4152]
+    assert test_items.query().where(slot=("weapon", None)).ids() == [995, 1277, 1278, 4151, 4152]
+    assert test_items.query().where(attack_speed=None).ids() == [995, 1163, 1278, 4152]
+    assert test_items.query().where(prayer=None).ids() == [995, 1278, 4152]
+    assert test_items.query().where(name=None).ids() == []
+    assert test_items.query().where(name=("Coins", 995)).ids() == [995]
+    assert "filtered scan: linked_id in (None,)" in test_items.query().where(linked_id=None).explain()
+
+
+@pytest.mark.parametrize("data_format", ["items-complete", "snapshot"])
+def test_item_query_missing_stats(data_format: str, read_test_items, tmp_path: Path):
+    items = read_test_items(TEST_ITEM_IDS)
+    for item in items:
+        if item["id"] == 4151:
+            item["equipment"]["prayer"] = None
+        if item["id"] == 1163:
+            item["equipment"]["attack_stab"] = None
+    if data_format == "snapshot":
+        path_to_items = tmp_path / "items-complete.snapshot"
+        item_snapshot.write_snapshot(items, path_to_items)
+    else:
+        path_to_items = tmp_path / "items-complete.json"
+        offset_index.dump_items_complete({str(item["id"]): item for item in items}, path_to_items)
+    test_items = all_items.AllItems(path_to_items)
+
+    # The columnar equipment table scan and the decoded item scan agree on missing (None) bonuses
+    for stat in ("prayer", "attack_stab"):
+        values = {item.id: field_value(item, stat) for item in test_items}
+        assert values[4151 if stat == "prayer" else 1163] == 0
+        assert test_items.query().where(**{stat: 0}).ids() == [id_number for id_number, value in values.items() if value == 0]
+        assert test_items.query().where(**{stat: None}).ids() == [id_number for id_number, value in values.items() if value is None]
+        ordered = sorted((id_number for id_number, value in values.items() if value is not None), key=values.__getitem__)
+        ordered += [id_number for id_number, value in values.items() if value is None]
+        assert test_items.query().order_by(stat).ids() == ordered
+
+
+def test_item_query_order_by_and_limit(test_items: all_items.AllItems):
+    query = test_items.query().where(members=False)
+    assert query.order_by("attack_slash", descending=True).ids() == [1277, 1163, 995, 1278]
+    assert query.order_by("cost").limit(2).ids() == [995, 1277]
+    assert test_items.query().order_by("attack_slash", descending=True).first().id == 4151
+
+
+def test_item_query_decodes_returned_items_only(test_items: all_items.AllItems):
+    assert test_items.query().order_by("attack_slash", descending=True).limit(1).ids() == [4151]
+    if isinstance(test_items.item_index, item_snapshot.SnapshotReader):
+        assert list(test_items.all_items_dict) == [4151]
+
+
+def test_item_query_filter(test_items: all_items.AllItems):
+    query = test_items.query().where(members=False).filter(lambda item: item.stackable)
+    assert query.ids() == [995, 1278]
+
+
+def test_item_query_explain(test_items: all_items.AllItems):
+    plan = test_items.query().where(slot="weapon", noted=False).order_by("attack_slash").limit(10).explain()
+    assert "index lookup: slot" in plan
+    assert "filtered scan: noted" in plan
+    assert "order by: attack_slash ascending (equipment table)" in plan
+    assert "full scan" in test_items.query().filter(lambda item: item.members).explain()
+    assert "columnar scan: prayer" in test_items.query().where(prayer=0).explain()
+
+
+def test_item_query_unknown_field(test_items: all_items.AllItems):
+    with pytest.raises(ValueError):
+        test_items.query().where(colour="red")
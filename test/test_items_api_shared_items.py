@@ -0,0 +1,79 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from osrsbox.items_api import all_items
+from osrsbox.items_api import shared_items
+
+TEST_ITEM_IDS = [4151, 1155, 995, 4152]
+
+
+def _item_name(all_db_items: all_items.AllItems, id_number: int) -> str:
+    return all_db_items[id_number].name
+
+
+@pytest.fixture
+def test_items(load_test_items) -> all_items.AllItems:
+    return load_test_items(TEST_ITEM_IDS)
+
+
+def test_shared_items(test_items: all_items.AllItems, tmp_path: Path):
+    with shared_items.SharedItems(test_items, tmp_path / "items.snapshot") as shared:
+        # The shared view has the same items, decoded on first access
+        assert shared.items.lazy
+        assert shared.items.id_numbers() == sorted(TEST_ITEM_IDS)
+        assert [item.construct_json() for item in shared.items] == [item.construct_json() for item in test_items]
+
+        attached = shared_items.attach(shared.path)
+        assert attached[4151] == test_items[4151]
+
+        # The shared view is pickled as the snapshot path, without any items
+        data = pickle.dumps(shared.items)
+        assert len(data) < 500
+        assert pickle.loads(data)[995].name == "Coins"
+        assert json.dumps(pickle.loads(data)[4151].construct_json()) == json.dumps(test_items[4151].construct_json())
+
+        with ProcessPoolExecutor(2) as executor:
+            names = list(executor.map(_item_name, [shared.items] * len(TEST_ITEM_IDS), TEST_ITEM_IDS))
+        assert names == [test_items[id_number].name for id_number in TEST_ITEM_IDS]
+
+        # Publishing an item database loaded from a snapshot reuses the snapshot file
+        assert shared_items.SharedItems(shared.items).path == shared.path
+
+    assert not (tmp_path / "items.snapshot").exists()
+    with pytest.raises(ValueError):
+        shared_items.attach(tmp_path / "items.snapshot")
+
+
+@pytest.mark.parametrize("intern", [True, False])
+def test_shared_items_pickle_intern(load_test_items, intern: bool):
+    snapshot_items = load_test_items(TEST_ITEM_IDS, "snapshot", intern=intern)
+    unpickled = pickle.loads(pickle.dumps(snapshot_items))
+    assert unpickled.lazy
+    assert unpickled.intern == intern
+    assert (unpickled.interner is not None) == intern
+    assert unpickled[4151] == snapshot_items[4151]
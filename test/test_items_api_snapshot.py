@@ -0,0 +1,68 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: osrsbox.items_api.item_snapshot
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+from pathlib import Path
+
+import pytest
+
+from osrsbox.items_api import all_items
+from osrsbox.items_api import item_snapshot
+
+# Abyssal whip (weapon), Bronze full helm (equipment), Coins (stackable), noted Abyssal whip
+TEST_ITEM_IDS = [4151, 1155, 995, 4152]
+
+
+@pytest.fixture(scope="module")
+def test_items(read_test_items) -> list:
+    return read_test_items(TEST_ITEM_IDS)
+
+
+def test_item_snapshot_round_trip(test_items: list, tmp_path: Path):
+    path_to_snapshot = tmp_path / "items-complete.snapshot"
+    item_snapshot.write_snapshot(test_items, path_to_snapshot)
+
+    assert item_snapshot.is_snapshot_file(path_to_snapshot)
+    snapshot = item_snapshot.SnapshotReader(path_to_snapshot)
+    assert list(snapshot) == sorted(TEST_ITEM_IDS)
+    for item in test_items:
+        assert snapshot.read(item["id"]) == item
+    assert 1 not in snapshot
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_item_snapshot_load_all_items(test_items: list, tmp_path: Path, lazy: bool):
+    path_to_snapshot = tmp_path / "items-complete.snapshot"
+    item_snapshot.write_snapshot(test_items, path_to_snapshot)
+
+    all_db_items = all_items.AllItems(path_to_snapshot, lazy=lazy)
+    assert len(all_db_items) == len(TEST_ITEM_IDS)
+    assert all_db_items[4151].weapon.weapon_type == "whips"
+    assert [item.construct_json() for item in all_db_items] == sorted(test_items, key=lambda x: x["id"])
+
+
+def test_item_snapshot_invalid_file(tmp_path: Path):
+    path_to_file = tmp_path / "items-complete.snapshot"
+    path_to_file.write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError):
+        item_snapshot.SnapshotReader(path_to_file)
@@ -0,0 +1,73 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import copy
+import json
+from pathlib import Path
+
+from items_builder.item_diff import ItemChangelog
+from items_builder.item_diff import diff_items
+from items_builder.item_diff import item_change_record
+
+
+def test_diff_items(path_to_docs_dir: Path):
+    with open(path_to_docs_dir / "items-json" / "4151.json") as f:
+        old = json.load(f)
+    new = copy.deepcopy(old)
+    assert diff_items(old, new) == []
+
+    # Reordered stances are not a change
+    new["weapon"]["stances"].reverse()
+    assert diff_items(old, new) == []
+
+    new["cost"] += 1
+    new["equipment"]["attack_slash"] = 83
+    new["equipment"]["requirements"] = {"attack": 75, "slayer": 10}
+    new["weapon"]["stances"][0]["boosts"] = "accuracy"
+    assert diff_items(old, new) == [
+        {"path": "cost", "old": old["cost"], "new": old["cost"] + 1},
+        {"path": "equipment.attack_slash", "old": 82, "new": 83},
+        {"path": "equipment.requirements.attack", "old": 70, "new": 75},
+        {"path": "equipment.requirements.slayer", "old": None, "new": 10},
+        {"path": "weapon.stances[deflect].boosts", "old": None, "new": "accuracy"}
+    ]
+
+    del new["weapon"]["stances"][1]
+    assert {"path": "weapon.stances[lash]", "old": old["weapon"]["stances"][1], "new": None} in diff_items(old, new)
+
+
+def test_item_changelog(path_to_docs_dir: Path, tmp_path: Path):
+    with open(path_to_docs_dir / "items-json" / "4151.json") as f:
+        old = json.load(f)
+    new = dict(old, weight=0.5)
+
+    changelog = ItemChangelog()
+    changelog.add(item_change_record(old, old))
+    changelog.add(item_change_record(None, old))
+    changelog.add(item_change_record(old, new))
+    changelog.save(tmp_path / "build-changelog.json", "2019-07-01T05:00:00Z")
+
+    with open(tmp_path / "build-changelog.json") as f:
+        saved = json.load(f)
+    assert saved["new"] == 1
+    assert saved["changed"] == 1
+    assert saved["items"][1] == {"id": 4151, "name": "Abyssal whip", "status": "changed",
+                                 "changes": [{"path": "weight", "old": old["weight"], "new": 0.5}]}
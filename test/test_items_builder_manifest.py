@@ -0,0 +1,71 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+from pathlib import Path
+
+from items_builder.build_manifest import BuildManifest
+from items_builder.build_manifest import item_digest
+from items_builder.build_manifest import item_inputs
+
+CACHE_ITEMS = {
+    "1277": {"id": 1277, "name": "Bronze sword"},
+    "4151": {"id": 4151, "name": "Abyssal whip"}
+}
+
+
+def _digests(cache_items, wiki_timestamps, buy_limits) -> dict:
+    return {item_id: item_digest(item_inputs(item_id, cache_item, {}, buy_limits, {}, {}, {}, wiki_timestamps))
+            for item_id, cache_item in cache_items.items()}
+
+
+def test_build_manifest_dirty_items(tmp_path: Path):
+    path_to_items_json = tmp_path / "items-json"
+    path_to_items_json.mkdir()
+    for item_id in CACHE_ITEMS:
+        (path_to_items_json / f"{item_id}.json").write_text("{}")
+
+    wiki_timestamps = {"Bronze sword": "2019-06-22T05:00:00Z", "Abyssal whip": "2019-06-22T05:00:00Z"}
+    buy_limits = {"Abyssal whip": 70}
+    digests = _digests(CACHE_ITEMS, wiki_timestamps, buy_limits)
+
+    # Every item is dirty before the first build
+    manifest = BuildManifest(tmp_path / "build-manifest.json")
+    assert manifest.dirty_items(digests, path_to_items_json) == ["1277", "4151"]
+    manifest.update(digests, digests)
+    manifest.save()
+
+    manifest = BuildManifest(tmp_path / "build-manifest.json")
+    assert manifest.last_build is not None
+    assert manifest.dirty_items(digests, path_to_items_json) == []
+
+    # A changed wiki page revision, buy limit, cache record, new item or missing output makes an item dirty
+    wiki_timestamps["Bronze sword"] = "2019-07-01T05:00:00Z"
+    assert manifest.dirty_items(_digests(CACHE_ITEMS, wiki_timestamps, buy_limits), path_to_items_json) == ["1277"]
+    assert manifest.dirty_items(_digests(CACHE_ITEMS, {}, {}), path_to_items_json) == ["1277", "4151"]
+
+    cache_items = json.loads(json.dumps(CACHE_ITEMS))
+    cache_items["4151"]["name"] = "Abyssal whip (or)"
+    cache_items["995"] = {"id": 995, "name": "Coins"}
+    assert manifest.dirty_items(_digests(cache_items, {}, {}), path_to_items_json) == ["1277", "4151", "995"]
+
+    (path_to_items_json / "4151.json").unlink()
+    assert manifest.dirty_items(digests, path_to_items_json) == ["4151"]
@@ -0,0 +1,116 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from items_builder import builder
+from items_builder.item_diff import ItemChangelog
+from items_builder.wiki_template_cache import WikiTemplateCache
+
+# Coins, Abyssal whip, Dragon scimitar (fails to build, without a weapon type)
+TEST_ITEM_IDS = ["995", "4151", "4587"]
+
+WIKI_TEXT = {
+    "Coins": "{{Infobox Item\n|name = Coins\n|release = 27 February 2002\n|tradeable = Yes\n|weight = 0\n|examine = Lovely money!\n}}",
+    "Abyssal whip": "{{Infobox Item\n|name = Abyssal whip\n|release = 26 January 2005\n|tradeable = Yes\n|weight = 0.453\n"
+                    "|examine = A weapon from the abyss.\n}}\n"
+                    "{{Infobox Bonuses\n|aslash = +82\n|str = +82\n|slot = weapon\n|aspeed = 4\n}}",
+    "Dragon scimitar": "{{Infobox Item\n|name = Dragon scimitar\n|tradeable = Yes\n|examine = A vicious, curved sword.\n}}\n"
+                       "{{Infobox Bonuses\n|aslash = +67\n|slot = weapon\n|aspeed = 4\n}}"
+}
+
+CACHE_PROPERTIES = ["id", "name", "members", "tradeable_on_ge", "stackable", "noted", "noteable", "linked_id", "placeholder",
+                    "equipable", "cost", "lowalch", "highalch"]
+
+
+@pytest.fixture
+def build_inputs(path_to_docs_dir: Path) -> dict:
+    current_db = dict()
+    for item_id in TEST_ITEM_IDS:
+        with open(path_to_docs_dir / "items-json" / f"{item_id}.json") as f:
+            current_db[item_id] = json.load(f)
+    cache_items = {item_id: {name: current_db[item_id][name] for name in CACHE_PROPERTIES} for item_id in TEST_ITEM_IDS}
+
+    # Coins is changed, and the Abyssal whip is new
+    current_db["995"]["examine"] = "Money!"
+    del current_db["4151"]
+
+    return {
+        "cache_items": cache_items,
+        "current_db": current_db,
+        "wiki_text": WIKI_TEXT,
+        "template_cache": WikiTemplateCache(WIKI_TEXT),
+        "normalized_names": dict(),
+        "buy_limits": {"Abyssal whip": 70},
+        "skill_requirements": {"4151": {"attack": 70}},
+        "weapon_types": {"4151": {"weapon_type": "whips"}},
+        "weapon_stances": {"whips": [{"combat_style": "flick", "attack_type": "slash", "attack_style": "accurate",
+                                      "experience": "attack", "boosts": None}]}
+    }
+
+
+def _build(item_ids, inputs, workers, path_to_build_dir: Path, monkeypatch):
+    # Items are exported to ../docs/items-json, relative to the working directory
+    path_to_items_json = path_to_build_dir / "docs" / "items-json"
+    path_to_items_json.mkdir(parents=True)
+    (path_to_build_dir / "items_builder").mkdir()
+    monkeypatch.chdir(path_to_build_dir / "items_builder")
+
+    changelog = ItemChangelog()
+    if workers > 1:
+        built_item_ids = builder.build_items_parallel(item_ids, inputs, workers, 1, changelog)
+    else:
+        built_item_ids = builder.build_items_serial(item_ids, inputs, changelog)
+    output = {path.name: path.read_text() for path in path_to_items_json.iterdir()}
+    return built_item_ids, changelog.entries, output
+
+
+def test_build_items_parallel(build_inputs: dict, tmp_path: Path, monkeypatch, capsys):
+    item_ids = ["995", "4151"]
+    serial = _build(item_ids, build_inputs, 1, tmp_path / "serial", monkeypatch)
+    serial_printed = capsys.readouterr().out
+    parallel = _build(item_ids, build_inputs, 2, tmp_path / "parallel", monkeypatch)
+    parallel_printed = capsys.readouterr().out
+
+    # The serial and parallel builds have the same output and changelog
+    assert serial == parallel
+    assert serial_printed == parallel_printed
+    built_item_ids, changelog_entries, output = serial
+    assert built_item_ids == item_ids
+    assert [(entry["id"], entry["status"]) for entry in changelog_entries] == [(995, "changed"), (4151, "new")]
+    assert sorted(output) == ["4151.json", "995.json"]
+    assert json.loads(output["4151.json"])["weapon"]["weapon_type"] == "whips"
+
+
+def test_build_items_failure(build_inputs: dict, tmp_path: Path, monkeypatch, capsys):
+    # A serial build stops at the first item that fails to build
+    with pytest.raises(SystemExit):
+        _build(TEST_ITEM_IDS, build_inputs, 1, tmp_path / "serial", monkeypatch)
+
+    # A parallel build reports the failed items after the build
+    built_item_ids, changelog_entries, output = _build(TEST_ITEM_IDS, build_inputs, 2, tmp_path / "parallel", monkeypatch)
+    assert built_item_ids == ["995", "4151"]
+    assert len(changelog_entries) == 2
+    assert sorted(output) == ["4151.json", "995.json"]
+    assert ">>> Failed to build item: 4587: build stopped, see builder.log" in capsys.readouterr().out
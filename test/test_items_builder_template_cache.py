@@ -0,0 +1,53 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+from items_builder.wiki_template_cache import WikiTemplateCache
+
+WIKI_TEXT = {
+    "Abyssal whip": "{{Infobox Item\n|name = Abyssal whip\n|weight = 0.453\n|weight = 0.5\n}}\n"
+                    "{{Infobox Bonuses\n| aslash = +82 \n|slot = weapon\n}}",
+    "Coins": "{{Infobox Item\n|name = Coins\n}}",
+    "Oak chair": "{{Infobox Construction\n|name = Oak chair\n}}"
+}
+
+
+def test_wiki_template_cache_templates():
+    template_cache = WikiTemplateCache(WIKI_TEXT)
+
+    page = template_cache["Abyssal whip"]
+    assert page.primary.params == {"name": "Abyssal whip", "weight": "0.5"}
+    assert page.bonuses.params == {"aslash": "+82", "slot": "weapon"}
+    assert page.has_bonuses
+
+    page = template_cache["Oak chair"]
+    assert page.primary.params == {"name": "Oak chair"}
+    assert page.bonuses is None
+    assert not page.has_bonuses
+
+
+def test_wiki_template_cache_eviction():
+    template_cache = WikiTemplateCache(WIKI_TEXT, max_size=2)
+    template_cache["Abyssal whip"]
+    template_cache["Coins"]
+    template_cache["Abyssal whip"]
+    template_cache["Oak chair"]
+    assert list(template_cache.pages) == ["Abyssal whip", "Oak chair"]
+    assert (template_cache.hits, template_cache.misses) == (1, 3)
@@ -22,10 +22,13 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
 
+import json
 import pytest
 from pathlib import Path
 
+from extraction_tools_cache import content_hash
 from extraction_tools_cache import osrs_cache_data
+from extraction_tools_cache import osrs_cache_constants
 
 
 @pytest.mark.parametrize("test_data,expected", [
@@ -47,3 +50,65 @@ def test_osrs_cache_data_decompression(path_to_cache_dir: Path, cache_type, expe
     definitions = osrs_cache_data.CacheDefinitionFiles(path_to_cache_file)
     definitions.decompress_cache_file()
     assert len(definitions) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [osrs_cache_data.STREAM_CHUNK_SIZE, 1000])
+def test_osrs_cache_data_streaming(path_to_cache_dir: Path, chunk_size):
+    path_to_cache_file = path_to_cache_dir / "npcs.json"
+    definitions = osrs_cache_data.CacheDefinitionFiles(path_to_cache_file)
+    definitions.decompress_cache_file()
+
+    streamed_definitions = osrs_cache_data.CacheDefinitionFiles(path_to_cache_file)
+    streamed = dict(streamed_definitions.iter_definitions(chunk_size=chunk_size))
+    assert list(streamed) == list(definitions)
+    assert streamed == {id_number: definitions[id_number] for id_number in definitions}
+
+    projected = dict(streamed_definitions.iter_definitions(fields=["name", "models"]))
+    assert projected["258"] == {"name": definitions["258"]["name"], "models": definitions["258"]["models"]}
+
+
+def test_osrs_cache_data_lazy_decompression(path_to_cache_dir: Path):
+    path_to_cache_file = path_to_cache_dir / "npcs.json"
+    definitions = osrs_cache_data.CacheDefinitionFiles(path_to_cache_file, cache_size=2)
+    definitions.decompress_cache_file()
+
+    # A point lookup decompresses a single definition
+    assert definitions["258"]["id"] == 258
+    assert definitions["258"]["id"] == 258
+    assert (definitions.misses, definitions.hits) == (1, 1)
+
+    # The least recently used definitions are evicted
+    for id_number in ["1", "2", "3"]:
+        assert definitions[id_number]["id"] == int(id_number)
+    assert list(definitions.definitions) == ["2", "3"]
+    assert len(definitions) == 8721
+
+
+def test_osrs_cache_data_parallel_compression(path_to_cache_dir: Path, tmp_path: Path):
+    with open(path_to_cache_dir / "npcs.json") as f:
+        compressed_npcs = json.load(f)
+    expected = {id_number: compressed_npcs[id_number] for id_number in list(compressed_npcs)[:600]}
+
+    # Write a cache dump of definition files, from the compressed npcs.json file
+    for cache_type in osrs_cache_constants.CACHE_DUMP_TYPES:
+        (tmp_path / cache_type).mkdir()
+    definitions = osrs_cache_data.CacheDefinitionFiles(path_to_cache_dir / "npcs.json")
+    definitions.decompress_cache_file()
+    for id_number in expected:
+        with open(tmp_path / "npcs" / f"{id_number}.json", "w") as f:
+            json.dump(definitions[id_number], f, indent=4)
+
+    osrs_cache_data.compress_single_cache_type(tmp_path / "npcs", tmp_path / "npcs-single.json", workers=1)
+    osrs_cache_data.compress_all_cache_types(tmp_path, workers=2)
+
+    # The parallel output is byte-identical to the single process output, and to the original file
+    assert (tmp_path / "npcs.json").read_bytes() == (tmp_path / "npcs-single.json").read_bytes()
+    assert json.loads((tmp_path / "npcs.json").read_text()) == expected
+    assert json.loads((tmp_path / "items.json").read_text()) == {}
+    assert (tmp_path / "npcs.hashes.json").read_bytes() == (tmp_path / "npcs-single.hashes.json").read_bytes()
+
+    # The content hashes are read from the hashes file, and match the definitions
+    parallel_definitions = osrs_cache_data.CacheDefinitionFiles(tmp_path / "npcs.json")
+    content_hashes = parallel_definitions.content_hashes()
+    assert list(content_hashes) == list(expected)
+    assert content_hashes["1"] == content_hash.content_hash(definitions["1"])
@@ -0,0 +1,128 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import time
+import asyncio
+import urllib.parse
+from pathlib import Path
+
+import pytest
+
+import config
+from extraction_tools_wiki import extract_wiki_data
+from extraction_tools_wiki.wiki_extraction_engine import TokenBucket
+from extraction_tools_wiki.wiki_extraction_engine import WikiExtractionEngine
+from extraction_tools_wiki.wiki_text_store import WikiTextStore
+from extraction_tools_wiki.wiki_stand_in_server import WikiStandInServer
+
+PAGE_TITLES = [f"Test item {i}" for i in range(120)]
+
+
+@pytest.fixture
+def stand_in_server(tmp_path: Path) -> WikiStandInServer:
+    path_to_fixtures = tmp_path / "fixtures"
+    path_to_fixtures.mkdir()
+    for page_title in PAGE_TITLES:
+        page_file_name = urllib.parse.quote(page_title, safe="") + ".wiki"
+        (path_to_fixtures / page_file_name).write_text(f"{{{{Infobox Item\n|name = {page_title}\n}}}}")
+    (path_to_fixtures / "categories.json").write_text('{"Items": ["Test item 1", "Test item 2", "Test item 3"]}')
+
+    with WikiStandInServer(path_to_fixtures, latency=0.01) as server:
+        yield server
+
+
+def make_engine(server: WikiStandInServer, **kwargs) -> WikiExtractionEngine:
+    kwargs.setdefault("requests_per_second", 1000.0)
+    return WikiExtractionEngine(server.url, "osrsbox-test", "test@osrsbox.com", backoff_base=0.01, **kwargs)
+
+
+def test_extract_pages_wiki_text(stand_in_server: WikiStandInServer, tmp_path: Path):
+    store = WikiTextStore(tmp_path / "store.jsonl")
+    engine = make_engine(stand_in_server)
+    failed_page_titles = engine.extract_pages_wiki_text(PAGE_TITLES + ["Dragon scimitar"], store)
+
+    assert failed_page_titles == []
+    assert engine.request_count == 3
+    assert sorted(store) == sorted(PAGE_TITLES)
+    assert store["Test item 7"] == "{{Infobox Item\n|name = Test item 7\n}}"
+    assert store.timestamp("Test item 7") is not None
+    assert "Dragon scimitar" not in store
+
+
+def test_extract_pages_wiki_text_retries(stand_in_server: WikiStandInServer, tmp_path: Path):
+    stand_in_server.failures = 4
+    store = WikiTextStore(tmp_path / "store.jsonl")
+    engine = make_engine(stand_in_server)
+
+    assert engine.extract_pages_wiki_text(PAGE_TITLES, store) == []
+    assert engine.retry_count == 4
+    assert len(store) == len(PAGE_TITLES)
+
+
+def test_extract_pages_wiki_text_failure(stand_in_server: WikiStandInServer, tmp_path: Path):
+    stand_in_server.failures = 100
+    store = WikiTextStore(tmp_path / "store.jsonl")
+    engine = make_engine(stand_in_server, max_retries=2)
+
+    # Every batch fails, and no pages are saved
+    assert sorted(engine.extract_pages_wiki_text(PAGE_TITLES, store)) == sorted(PAGE_TITLES)
+    assert engine.request_count == 9
+    assert len(store) == 0
+
+
+def test_token_bucket():
+    async def acquire_tokens():
+        bucket = TokenBucket(rate=50.0)
+        start = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    loop = asyncio.new_event_loop()
+    try:
+        elapsed = loop.run_until_complete(acquire_tokens())
+    finally:
+        loop.close()
+
+    # The first token is available immediately, then one token every 20 ms
+    assert elapsed >= 0.09
+
+
+def test_extract_wiki_data_resume(stand_in_server: WikiStandInServer, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(config, "EXTRACTION_WIKI_PATH", tmp_path)
+
+    # An interrupted run, that saved only one page
+    store = WikiTextStore(tmp_path / "extract_page_text_items.jsonl")
+    make_engine(stand_in_server).extract_pages_wiki_text(["Test item 1"], store)
+
+    # The saved page is not extracted again
+    request_count = stand_in_server.request_count
+    extract_wiki_data.extract_wiki_data(["Items"], "2019-06-14T00:00:00Z", stand_in_server.url)
+    store = WikiTextStore(tmp_path / "extract_page_text_items.jsonl")
+    assert sorted(store) == ["Test item 1", "Test item 2", "Test item 3"]
+
+    # Two requests for the page titles and revisions, and one for the wiki text
+    assert stand_in_server.request_count - request_count == 3
+
+    # A finished run extracts nothing
+    request_count = stand_in_server.request_count
+    extract_wiki_data.extract_wiki_data(["Items"], "2019-06-14T00:00:00Z", stand_in_server.url)
+    assert stand_in_server.request_count - request_count == 2
@@ -0,0 +1,87 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import urllib.parse
+from pathlib import Path
+
+import pytest
+
+import config
+from extraction_tools_wiki import extract_wiki_data
+from extraction_tools_wiki.wiki_page_text import WikiPageText
+from extraction_tools_wiki.wiki_page_text import WikiPageTextBatch
+from extraction_tools_wiki.wiki_text_store import WikiTextStore
+from extraction_tools_wiki.wiki_stand_in_server import WikiStandInServer
+
+PAGE_TITLES = [f"Test item {i}" for i in range(60)] + ["Abyssal whip", "Weapon/Types"]
+
+
+@pytest.fixture
+def stand_in_server(tmp_path: Path) -> WikiStandInServer:
+    path_to_fixtures = tmp_path / "fixtures"
+    path_to_fixtures.mkdir()
+    for page_title in PAGE_TITLES:
+        page_file_name = urllib.parse.quote(page_title, safe="") + ".wiki"
+        (path_to_fixtures / page_file_name).write_text(f"{{{{Infobox Item\n|name = {page_title}\n}}}}")
+    (path_to_fixtures / "categories.json").write_text('{"Items": ["Abyssal whip", "Test item 1"]}')
+
+    with WikiStandInServer(path_to_fixtures) as server:
+        yield server
+
+
+def test_wiki_page_text_batch(stand_in_server: WikiStandInServer):
+    page_titles = PAGE_TITLES + ["abyssal_whip", "Dragon scimitar"]
+    wiki_page_text = WikiPageTextBatch(stand_in_server.url, page_titles, "osrsbox-test", "test@osrsbox.com")
+    wiki_page_text.extract_pages_wiki_text()
+
+    # Two requests of 50 pages, and one request for the remaining pages
+    assert stand_in_server.request_count == 2
+
+    # The batched wiki text is the same as the wiki text extracted one page at a time
+    for page_title in page_titles:
+        single_page_text = WikiPageText(stand_in_server.url, page_title, "osrsbox-test", "test@osrsbox.com")
+        single_page_text.extract_page_wiki_text()
+        assert wiki_page_text.wiki_text[page_title] == single_page_text.wiki_text
+
+    assert wiki_page_text.wiki_text["abyssal_whip"] == "{{Infobox Item\n|name = Abyssal whip\n}}"
+    assert wiki_page_text.timestamps["abyssal_whip"] is not None
+    assert wiki_page_text.wiki_text["Dragon scimitar"] is None
+    assert wiki_page_text.timestamps["Dragon scimitar"] is None
+
+
+def test_wiki_page_text_batch_export_to_store(stand_in_server: WikiStandInServer, tmp_path: Path):
+    wiki_page_text = WikiPageTextBatch(stand_in_server.url, ["Abyssal whip", "Dragon scimitar"], "osrsbox-test", "test@osrsbox.com")
+    wiki_page_text.extract_pages_wiki_text()
+
+    # A missing page is not saved, so it is extracted again by the next run
+    store = WikiTextStore(tmp_path / "extract_page_text_items.jsonl")
+    wiki_page_text.export_wiki_text_to_store(store)
+    assert list(store) == ["Abyssal whip"]
+    assert "Dragon scimitar" not in WikiTextStore(tmp_path / "extract_page_text_items.jsonl")
+
+
+def test_extract_wiki_data(stand_in_server: WikiStandInServer, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(config, "EXTRACTION_WIKI_PATH", tmp_path)
+    extract_wiki_data.extract_wiki_data(["Items"], "2019-06-14T00:00:00Z", stand_in_server.url)
+
+    store = WikiTextStore(tmp_path / "extract_page_text_items.jsonl")
+    assert sorted(store) == ["Abyssal whip", "Test item 1"]
+    assert store["Abyssal whip"] == "{{Infobox Item\n|name = Abyssal whip\n}}"
@@ -0,0 +1,85 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import urllib.parse
+from pathlib import Path
+
+import pytest
+
+import config
+from extraction_tools_wiki import extract_wiki_data
+from extraction_tools_wiki.wiki_page_titles import WikiPageTitles
+from extraction_tools_wiki.wiki_text_store import WikiTextStore
+from extraction_tools_wiki.wiki_stand_in_server import WikiStandInServer
+
+PAGE_TITLES = [f"Test item {i}" for i in range(120)]
+
+
+@pytest.fixture
+def stand_in_server(tmp_path: Path) -> WikiStandInServer:
+    path_to_fixtures = tmp_path / "fixtures"
+    path_to_fixtures.mkdir()
+    for page_title in PAGE_TITLES:
+        page_file_name = urllib.parse.quote(page_title, safe="") + ".wiki"
+        (path_to_fixtures / page_file_name).write_text(f"{{{{Infobox Item\n|name = {page_title}\n}}}}")
+    (path_to_fixtures / "categories.json").write_text('{"Items": ["Test item 1", "Test item 2", "Dragon scimitar"]}')
+
+    with WikiStandInServer(path_to_fixtures) as server:
+        yield server
+
+
+def test_extract_page_revisions(stand_in_server: WikiStandInServer):
+    wiki_page_titles = WikiPageTitles(stand_in_server.url, ["Items"], "osrsbox-test", "test@osrsbox.com")
+    page_titles = PAGE_TITLES + ["test_item_7", "Dragon scimitar"]
+    revisions = wiki_page_titles.extract_page_revisions(page_titles)
+
+    # Two requests of 50 pages, and one request for the remaining pages
+    assert stand_in_server.request_count == 3
+    assert list(revisions) == page_titles
+
+    page = stand_in_server.fixtures.pages["Test item 7"]
+    assert revisions["Test item 7"] == (page["revid"], page["timestamp"])
+    assert revisions["test_item_7"] == revisions["Test item 7"]
+    assert revisions["Dragon scimitar"] == (None, None)
+    assert wiki_page_titles.revision_ids["Test item 7"] == page["revid"]
+    assert wiki_page_titles["Test item 7"] == page["timestamp"]
+
+
+def test_extract_last_revision_timestamp_missing_page(stand_in_server: WikiStandInServer):
+    wiki_page_titles = WikiPageTitles(stand_in_server.url, ["Items"], "osrsbox-test", "test@osrsbox.com")
+    wiki_page_titles.extract_last_revision_timestamp("Test item 1|Dragon scimitar")
+    assert list(wiki_page_titles) == ["Test item 1"]
+
+
+def test_extract_wiki_data_revision_ids(stand_in_server: WikiStandInServer, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(config, "EXTRACTION_WIKI_PATH", tmp_path)
+    path_to_store = tmp_path / "extract_page_text_items.jsonl"
+
+    # A stored page with a different revision ID is extracted again, even with the current timestamp
+    page = stand_in_server.fixtures.pages["Test item 1"]
+    WikiTextStore(path_to_store).save("Test item 1", "Outdated", page["timestamp"], page["revid"] - 1)
+
+    # The missing page in the category is skipped
+    extract_wiki_data.extract_wiki_data(["Items"], "2019-06-14T00:00:00Z", stand_in_server.url)
+    store = WikiTextStore(path_to_store)
+    assert sorted(store) == ["Test item 1", "Test item 2"]
+    assert store["Test item 1"] == "{{Infobox Item\n|name = Test item 1\n}}"
+    assert store.revision_id("Test item 1") == page["revid"]
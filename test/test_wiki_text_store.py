@@ -0,0 +1,84 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+from pathlib import Path
+
+from extraction_tools_wiki.wiki_text_store import WikiTextStore
+
+
+def test_wiki_text_store_save_and_reopen(tmp_path: Path):
+    path_to_store = tmp_path / "extract_page_text_items.jsonl"
+    store = WikiTextStore(path_to_store)
+    store.save("Abyssal whip", "{{Infobox Item|name=Abyssal whip}}", "2019-06-22T05:00:00Z")
+    store.save_many([("Coins", "{{Infobox Item|name=Coins}}", None),
+                     ("Abyssal whip", "{{Infobox Item|name=Abyssal whip|weight=0.453}}", "2019-07-01T05:00:00Z")])
+
+    # The last record for a page is the current record, also when the store is reopened
+    for store in [store, WikiTextStore(path_to_store)]:
+        assert list(store) == ["Abyssal whip", "Coins"]
+        assert store["Abyssal whip"] == "{{Infobox Item|name=Abyssal whip|weight=0.453}}"
+        assert store.timestamp("Abyssal whip") == "2019-07-01T05:00:00Z"
+        assert store.get("Dragon scimitar") is None
+        assert "Coins" in store
+
+    assert len(path_to_store.read_text().splitlines()) == 3
+    store.compact()
+    assert len(path_to_store.read_text().splitlines()) == 2
+    assert WikiTextStore(path_to_store)["Coins"] == "{{Infobox Item|name=Coins}}"
+
+
+def test_wiki_text_store_partial_line(tmp_path: Path):
+    path_to_store = tmp_path / "extract_page_text_items.jsonl"
+    WikiTextStore(path_to_store).save("Coins", "{{Infobox Item|name=Coins}}")
+    with open(path_to_store, "a") as f:
+        f.write('["Abyssal whip", null, "{{Infob')
+
+    # Opening the store does not modify the file
+    size = path_to_store.stat().st_size
+    store = WikiTextStore(path_to_store)
+    assert list(store) == ["Coins"]
+    assert path_to_store.stat().st_size == size
+    store.save("Abyssal whip", "{{Infobox Item|name=Abyssal whip}}")
+    assert WikiTextStore(path_to_store)["Abyssal whip"] == "{{Infobox Item|name=Abyssal whip}}"
+    assert len(path_to_store.read_text().splitlines()) == 2
+
+
+def test_wiki_text_store_import_json(tmp_path: Path):
+    path_to_json = tmp_path / "extract_page_text_items.json"
+    path_to_json.write_text(json.dumps({"Coins": "{{Infobox Item|name=Coins}}", "Bones": "ÿ"}, indent=4))
+
+    store = WikiTextStore(tmp_path / "extract_page_text_items.jsonl")
+    store.import_json(path_to_json)
+    assert dict((page_title, store[page_title]) for page_title in store) == {"Coins": "{{Infobox Item|name=Coins}}", "Bones": "ÿ"}
+
+
+def test_wiki_text_store_revision_ids(tmp_path: Path):
+    path_to_store = tmp_path / "extract_page_text_items.jsonl"
+    # A record saved by an older version, without a revision ID
+    path_to_store.write_text('["Coins", "2019-06-22T05:00:00Z", "{{Infobox Item|name=Coins, 5]}}"]\n')
+    WikiTextStore(path_to_store).save("Abyssal whip", "{{Infobox Item|name=Abyssal whip}}", "2019-07-01T05:00:00Z", 1234)
+
+    store = WikiTextStore(path_to_store)
+    assert store.revision_id("Coins") is None
+    assert store.timestamp("Coins") == "2019-06-22T05:00:00Z"
+    assert store.revision_id("Abyssal whip") == 1234
+    assert store["Coins"] == "{{Infobox Item|name=Coins, 5]}}"